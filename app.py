@@ -1,10 +1,30 @@
 import streamlit as st
-import json
-import asyncio
 import nest_asyncio
 import logging
+import math
+import os
+import time
+import uuid
+from concurrent.futures import CancelledError
+
+# Copy Streamlit secrets (Streamlit Cloud) into the environment before src.config reads it,
+# so the package itself never imports Streamlit
+try:
+    for _key in ("OPENAI_API_KEY", "SERPER_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+        if _key in st.secrets:
+            os.environ[_key] = str(st.secrets[_key])
+except (FileNotFoundError, RuntimeError):
+    pass  # No secrets.toml - use environment variables / .env
+
+from src.cancellation import CancellationToken, run_cancellable, run_in_background
+from src.deadline import stage_deadline
 from src.graph import create_graph
-from src.state import BidEvalState
+from src.export import export_evaluation
+from src.history import record_evaluation
+from src.ingest import Tender, load_tender
+from src.llm import cached_token_ratio
+from src.prefetch import Prefetcher, file_hash, seed_state
+from src.state import build_initial_state
 
 # Initialize logging
 try:
@@ -24,51 +44,161 @@ st.title("🏗️ Construction Bid Evaluation Agent")
 
 st.info("📋 **Upload a JSON file** containing both project description and bids. Use files from the `bids/` folder (e.g., `bids_project_1_commercial.json`).")
 
-uploaded_file = st.file_uploader("Upload project and bids (JSON)", type=["json"], help="Select a JSON file from the bids/ folder. Each JSON file contains the project description and all bid information.")
+uploaded_file = st.file_uploader("Upload project and bids (JSON or JSONL)", type=["json", "jsonl"], help="Select a JSON file from the bids/ folder. Each JSON file contains the project description and all bid information. Large tenders can be uploaded as JSONL: a {\"project\": ...} line, then one bid per line.")
+
+# Bids listed per page; large tenders are never rendered all at once
+BIDS_PER_PAGE = 50
+SCOPE_PREVIEW_CHARS = 120
+
+
+@st.cache_data(max_entries=4, show_spinner="Reading bids...")
+def read_tender(upload_key: str, _file, jsonl: bool) -> Tender:
+    """Stream-parse and validate an upload once per file (keyed by its hash)."""
+    _file.seek(0)
+    return load_tender(_file, jsonl=jsonl)
+
+
+def bid_summary(bid: dict) -> dict:
+    scope = bid.get("scope", "")
+    return {
+        "ID": bid.get("id", ""),
+        "Contractor": bid["contractor_name"],
+        "Cost": bid.get("cost"),
+        "Timeline (months)": bid.get("timeline_months"),
+        "Warranty (years)": bid.get("warranty_years"),
+        "Scope": scope if len(scope) <= SCOPE_PREVIEW_CHARS else scope[:SCOPE_PREVIEW_CHARS] + "…",
+    }
+
+
+@st.cache_resource
+def get_prefetcher() -> Prefetcher:
+    """One background prefetcher shared by all sessions."""
+    return Prefetcher()
+
+
+def cancel_evaluation(reason: str) -> None:
+    """Cancel this session's running evaluation, if any."""
+    token = st.session_state.pop("evaluation_token", None)
+    if token is not None:
+        token.cancel(reason)
+
+
+def on_cancel_clicked() -> None:
+    cancel_evaluation("cancelled by user")
+    st.session_state.evaluation_cancelled = True
+
+
+prefetcher = get_prefetcher()
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+previous_upload = st.session_state.get("prefetch_key")
+
+if st.session_state.pop("evaluation_cancelled", False):
+    st.warning("⏹️ Evaluation cancelled")
+
+if not uploaded_file and previous_upload:
+    # File removed - nobody is waiting for its prefetch or evaluation any more
+    prefetcher.release(previous_upload, st.session_state.session_id)
+    cancel_evaluation("file removed")
+    st.session_state.prefetch_key = None
 
 if uploaded_file:
     try:
-        # Reset file pointer to beginning
-        uploaded_file.seek(0)
-        data = json.load(uploaded_file)
-        project = data.get("project", {})
-        bids = data.get("bids", [])
-        
-        if not project.get("description"):
-            st.error("❌ Invalid JSON format: Missing 'project.description' field")
-            st.json(data)
-        elif not bids:
-            st.error("❌ Invalid JSON format: Missing or empty 'bids' array")
-            st.json(data)
+        upload_key = file_hash(uploaded_file.getvalue())
+        try:
+            tender = read_tender(upload_key, uploaded_file, uploaded_file.name.endswith(".jsonl"))
+        except ValueError as e:
+            st.error(f"❌ {e}")
         else:
+            project_description, bids = tender.project_description, tender.bids
+            # Extract requirements and research contractors while the reviewer reads the bids
+            if previous_upload and previous_upload != upload_key:
+                prefetcher.release(previous_upload, st.session_state.session_id)
+                cancel_evaluation("new file uploaded")
+            prefetcher.start(upload_key, project_description, bids, owner=st.session_state.session_id)
+            st.session_state.prefetch_key = upload_key
+            
             st.subheader("Project Description")
-            st.write(project.get("description", ""))
+            st.write(project_description)
             
             st.subheader(f"Bids Received: {len(bids)}")
-            for bid in bids:
-                with st.expander(f"Bid: {bid.get('contractor_name', 'Unknown')}"):
-                    st.json(bid)
+            if tender.errors:
+                with st.expander(f"⚠️ {len(tender.errors)} invalid bids skipped"):
+                    for error in tender.errors[:BIDS_PER_PAGE]:
+                        st.write(f"Bid {error.index + 1}: {error.message}")
+            pages = math.ceil(len(bids) / BIDS_PER_PAGE)
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+            page_bids = bids[(page - 1) * BIDS_PER_PAGE:page * BIDS_PER_PAGE]
+            st.dataframe([bid_summary(bid) for bid in page_bids], use_container_width=True, hide_index=True)
+            selected_bid = st.selectbox(
+                "Bid details",
+                page_bids,
+                index=None,
+                format_func=lambda bid: f"{bid.get('id', '')} - {bid['contractor_name']}",
+            )
+            if selected_bid:
+                st.json(selected_bid)
             
             st.divider()
             
             if st.button("🚀 Evaluate Bids", type="primary", use_container_width=True):
+                st.button("⏹️ Cancel evaluation", on_click=on_cancel_clicked)
                 with st.spinner("Evaluating bids..."):
                     graph = create_graph()
                     
-                    initial_state: BidEvalState = {
-                        "project_description": project.get("description", ""),
-                        "bids": bids,
-                        "requirements": None,
-                        "contractor_profiles": [],
-                        "scores": [],
-                        "red_flags": [],
-                        "final_recommendation": None,
-                    }
+                    initial_state = build_initial_state(project_description, bids)
+                    
+                    async def evaluate(state):
+                        # Requirements and profiles from the upload-time prefetch; a prefetch still running
+                        # is awaited for at most parse_and_enrich's share of the deadline, then skipped
+                        prefetch_deadline = stage_deadline(state, "parse_and_enrich")
+                        prefetched = await prefetcher.result(
+                            upload_key,
+                            timeout=None if prefetch_deadline is None else max(0.0, prefetch_deadline - time.time()),
+                        )
+                        return await graph.ainvoke(seed_state(state, prefetched))
                     
-                    result = asyncio.run(graph.ainvoke(initial_state))
+                    # Run in the background (prefetch wait included) and poll, so the script stays interruptible:
+                    # the cancel button, a new upload or a closed tab stop the script and cancel the evaluation
+                    token = CancellationToken()
+                    st.session_state.evaluation_token = token
+                    evaluation_id = uuid.uuid4().hex
+                    evaluation = run_in_background(run_cancellable(
+                        evaluate(initial_state), token, evaluation_id=evaluation_id,
+                    ))
+                    progress = st.empty()
+                    started = time.monotonic()
+                    try:
+                        while not evaluation.done():
+                            progress.caption(f"Running for {time.monotonic() - started:.0f}s")
+                            time.sleep(0.5)
+                    finally:
+                        if not evaluation.done():
+                            token.cancel("page rerun or session closed")
+                    progress.empty()
+                    try:
+                        result = evaluation.result()
+                    except CancelledError:
+                        st.warning(f"⏹️ Evaluation cancelled ({token.reason})")
+                        st.stop()
+                    st.session_state.evaluation_token = None
+                    # Keep the evaluation for market benchmarks and contractor track records
+                    record_evaluation(result)
+                    export_evaluation(result, evaluation_id)
                     
                     # Display results
                     st.success("Evaluation Complete!")
+                    if result.get("degraded"):
+                        st.warning(
+                            "⏱️ Parts of the evaluation ran out of time and were degraded:\n"
+                            + "\n".join(f"- {part}" for part in result["degraded"])
+                        )
+                    usage = result.get("llm_usage")
+                    if usage and usage.get("prompt_tokens"):
+                        st.caption(
+                            f"LLM usage: {usage['calls']} calls, {usage['prompt_tokens']:,} prompt tokens, "
+                            f"{cached_token_ratio(usage):.0%} served from the prompt cache"
+                        )
                     
                     if result.get("final_recommendation"):
                         rec = result["final_recommendation"]
@@ -98,6 +228,8 @@ if uploaded_file:
                             col3.metric("Scope", f"{score.scope_score:.2f}")
                             col4.metric("Risk", f"{score.risk_score:.2f}")
                             col5.metric("Reputation", f"{score.reputation_score:.2f}")
+                            if score.scoring_method == "heuristic":
+                                st.caption("Heuristic pre-screen score - out of contention, not scored by the LLM")
                             st.write("**Reasoning:**", score.reasoning)
                     
                     red_flags = result.get("red_flags", [])
@@ -118,8 +250,6 @@ if uploaded_file:
                     # LangSmith trace link
                     st.info("💡 Check LangSmith for detailed trace logs")
                 
-    except json.JSONDecodeError:
-        st.error("Invalid JSON file")
     except Exception as e:
         st.error(f"Error: {str(e)}")
         st.exception(e)
@@ -0,0 +1,175 @@
+"""Typed bids and the columnar bid table shared by the graph nodes.
+
+parse_and_enrich builds a BidTable from the state's bid dicts once per
+evaluation. Each Bid carries its numeric fields as floats and its scope text
+pre-lowered and pre-tokenized, so the scoring heuristics, red-flag rules and
+constraint checks never re-parse the same strings. Cost, timeline and
+warranty are also kept as NumPy columns for tender-wide statistics (NumPy
+is imported on first use, so the state module stays light for the worker).
+"""
+import itertools
+import logging
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def as_number(value) -> Optional[float]:
+    """Convert a bid field to a positive float, or None if missing/invalid."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+@dataclass(frozen=True, slots=True)
+class Bid:
+    id: str
+    contractor_name: str
+    cost: Optional[float]
+    timeline_months: Optional[float]
+    warranty_years: Optional[float]
+    scope: str
+    scope_lower: str
+    scope_words: tuple[str, ...]  # Interned tokens of scope_lower
+    data: dict  # Submitted fields with `id` set (hashing, prompts, results)
+
+    @classmethod
+    def from_dict(cls, data: dict, default_id: str = "") -> "Bid":
+        """
+        Raises:
+            ValueError: If the bid is not a dict, has no contractor_name or has a non-text scope
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"invalid bid (not a dict): {data!r:.80}")
+        contractor_name = data.get("contractor_name") or ""
+        if not isinstance(contractor_name, str) or not contractor_name.strip():
+            raise ValueError(f"bid without contractor_name: {data.get('id', 'unknown')}")
+        bid_id = data.get("id") or default_id
+        scope = data.get("scope")
+        if scope is None:
+            scope = ""
+        elif not isinstance(scope, str):
+            raise ValueError(f"bid with non-text scope: {data.get('id', 'unknown')} (scope={scope!r:.40})")
+        scope_lower = scope.lower()
+        return cls(
+            id=bid_id,
+            contractor_name=contractor_name,
+            cost=as_number(data.get("cost")),
+            timeline_months=as_number(data.get("timeline_months")),
+            warranty_years=as_number(data.get("warranty_years")),
+            scope=scope,
+            scope_lower=scope_lower,
+            scope_words=tuple(sys.intern(word) for word in scope_lower.split()),
+            data=data if data.get("id") == bid_id else {**data, "id": bid_id},
+        )
+
+    @property
+    def word_count(self) -> int:
+        return len(self.scope_words)
+
+    def mentions(self, *terms: str) -> bool:
+        """True if the scope contains any of the (lower-case) terms."""
+        return any(term in self.scope_lower for term in terms)
+
+
+def as_bid(bid: Union[Bid, dict]) -> Bid:
+    return bid if isinstance(bid, Bid) else Bid.from_dict(bid, bid.get("id", "") if isinstance(bid, dict) else "")
+
+
+class BidTable:
+    """The valid bids of a tender, with NumPy columns for the numeric fields (NaN when missing)."""
+
+    __slots__ = ("bids", "cost", "timeline_months", "warranty_years", "_positions")
+
+    def __init__(self, bids: list[Bid]):
+        import numpy as np
+
+        self.bids = bids
+        self.cost = np.array([np.nan if b.cost is None else b.cost for b in bids], dtype=float)
+        self.timeline_months = np.array([np.nan if b.timeline_months is None else b.timeline_months for b in bids], dtype=float)
+        self.warranty_years = np.array([np.nan if b.warranty_years is None else b.warranty_years for b in bids], dtype=float)
+        self._positions = {bid.id: i for i, bid in enumerate(bids)}
+
+    @classmethod
+    def from_dicts(cls, bids: Iterable[dict]) -> "BidTable":
+        """
+        Validate bid dicts, skipping invalid ones.
+
+        Missing ids are generated and repeated ids renamed, never to an id
+        another bid already uses, so every bid in the table has its own id.
+        """
+        bids = list(bids)
+        taken = {data["id"] for data in bids if isinstance(data, dict) and data.get("id")}
+        seen = set()
+        valid = []
+
+        def unused_id(candidates: Iterator[str]) -> str:
+            new_id = next(c for c in candidates if c not in taken)
+            taken.add(new_id)
+            return new_id
+
+        for data in bids:
+            bid_id = data.get("id") if isinstance(data, dict) else None
+            if bid_id in seen:
+                renamed = unused_id(f"{bid_id}_{n}" for n in itertools.count(2))
+                logger.warning("Duplicate bid id %r, renamed to %r", bid_id, renamed)
+                data = {**data, "id": renamed}
+            default_id = "" if bid_id else unused_id(f"bid_{n}" for n in itertools.count(len(valid)))
+            try:
+                bid = Bid.from_dict(data, default_id=default_id)
+            except ValueError as e:
+                logger.warning("Skipping %s", e)
+                continue
+            if not bid_id:
+                logger.warning("Bid missing 'id' field, generated ID: %s", bid.id)
+            seen.add(bid.id)
+            valid.append(bid)
+        return cls(valid)
+
+    @classmethod
+    def of(cls, bids: Union["BidTable", Iterable[Union[Bid, dict]]]) -> "BidTable":
+        """`bids` as a table (tables are returned as they are)."""
+        if isinstance(bids, cls):
+            return bids
+        bids = list(bids)
+        if all(isinstance(bid, Bid) for bid in bids):
+            return cls(bids)
+        return cls.from_dicts(bids)
+
+    def __len__(self) -> int:
+        return len(self.bids)
+
+    def __iter__(self) -> Iterator[Bid]:
+        return iter(self.bids)
+
+    def get(self, bid_id: str) -> Optional[Bid]:
+        position = self._positions.get(bid_id)
+        return None if position is None else self.bids[position]
+
+    def position(self, bid_id: str) -> Optional[int]:
+        """Index of the bid with this id in the table, if any."""
+        return self._positions.get(bid_id)
+
+    @property
+    def ids(self) -> list[str]:
+        return [bid.id for bid in self.bids]
+
+    @staticmethod
+    def _median(column: "np.ndarray") -> Optional[float]:
+        import numpy as np
+
+        values = column[~np.isnan(column)]
+        return float(np.median(values)) if values.size else None
+
+    def median_cost(self) -> Optional[float]:
+        return self._median(self.cost)
+
+    def median_timeline(self) -> Optional[float]:
+        return self._median(self.timeline_months)
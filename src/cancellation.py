@@ -0,0 +1,133 @@
+"""Cooperative cancellation of running evaluations.
+
+An evaluation runs as one asyncio task under a CancellationToken:
+
+    token = CancellationToken()
+    result = await run_cancellable(graph.ainvoke(state), token)
+    # elsewhere - another task, thread or HTTP request:
+    token.cancel("superseded by a new upload")
+
+Cancelling the token cancels the task, which aborts in-flight awaits (OpenAI
+requests through ainvoke_structured, Serper requests through httpx) so their
+connections and the worker slot are released immediately. Graph nodes also
+call check_cancelled() between steps, so CPU-bound work stops at the next
+bid. EvaluationCancelled derives from asyncio.CancelledError and passes
+through the `except Exception` fallbacks in nodes and tools.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, TypeVar
+from src.log_context import log_context
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EvaluationCancelled(asyncio.CancelledError):
+    """Raised when an evaluation's token is cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with callbacks, shared by an evaluation and whoever may abandon it."""
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the evaluation; returns False if it was already cancelled."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call `callback` on cancellation (immediately if already cancelled). Returns a remover."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise EvaluationCancelled(self.reason)
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the evaluation running in this context, if any."""
+    return _current_token.get()
+
+
+def check_cancelled() -> None:
+    """Raise EvaluationCancelled if the current evaluation was cancelled."""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+async def run_cancellable(awaitable: Awaitable[T], token: CancellationToken, evaluation_id: Optional[str] = None) -> T:
+    """
+    Await `awaitable` as a task that is cancelled when `token` is.
+
+    The token is visible to check_cancelled() in everything the task runs, and
+    `evaluation_id` is attached to its log records (see src/log_context.py).
+    Raises EvaluationCancelled if the token was cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    context_token = _current_token.set(token)
+    try:
+        with log_context(evaluation_id=evaluation_id):
+            task = asyncio.ensure_future(awaitable)  # The task copies the context holding the token
+    finally:
+        _current_token.reset(context_token)
+    remove_callback = token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if not token.cancelled:
+            raise
+        metrics.increment("evaluations_cancelled")
+        logger.info("Evaluation cancelled: %s", token.reason)
+        raise EvaluationCancelled(token.reason) from None
+    finally:
+        remove_callback()
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_in_background(awaitable: Awaitable[T]) -> "Future[T]":
+    """Run a coroutine on a shared background event loop (for callers without a loop, like Streamlit)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="evaluation-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(awaitable, _loop)
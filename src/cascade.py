@@ -0,0 +1,76 @@
+"""Model cascade routing.
+
+Bids are scored by GPT-4o-mini first. A mini score is accepted when it is
+confidently far from every decision the evaluation makes with it; otherwise
+the bid is re-scored by GPT-4o:
+
+- ranking: the bid is within `margin` of the leading bid (or leads by less
+  than `margin`), so the winner could flip
+- acceptance: the leading bid is within `margin` of one of the score
+  thresholds critique_and_finalize decides on (reject / clarify / accept)
+- conflicting signals: the mini score and the heuristic pre-screen score
+  disagree by more than `disagreement`, or a bid in contention carries a
+  high/critical red flag
+"""
+from typing import Optional
+from src.config import CASCADE_DISAGREEMENT, CASCADE_MARGIN, CASCADE_MAX_BIDS
+from src.schemas import BidScore, RedFlag
+
+# Top-score thresholds used by critique_and_finalize and its review prompt
+DECISION_THRESHOLDS = (0.55, 0.60, 0.65)
+
+SERIOUS_SEVERITIES = ("high", "critical")
+
+
+def bids_to_escalate(
+    scores: list[BidScore],
+    eligible: set[str],
+    heuristic_scores: Optional[dict[str, BidScore]] = None,
+    red_flags: Optional[list[RedFlag]] = None,
+    margin: float = CASCADE_MARGIN,
+    disagreement: float = CASCADE_DISAGREEMENT,
+    max_bids: int = CASCADE_MAX_BIDS,
+) -> dict[str, str]:
+    """
+    Pick the bids whose mini scores are too uncertain to keep.
+
+    Args:
+        scores: Scores of all bids in the tender (mini, heuristic or reused)
+        eligible: Ids of the bids scored by the mini model in this run
+        heuristic_scores: Pre-screen scores keyed by bid id
+        red_flags: Red flags detected for the mini scores
+
+    Returns:
+        Reason keyed by bid id, most uncertain first, at most `max_bids`
+    """
+    if max_bids <= 0 or not scores:
+        return {}
+    ranked = sorted(scores, key=lambda s: s.overall_score, reverse=True)
+    top = ranked[0]
+    lead = top.overall_score - ranked[1].overall_score if len(ranked) > 1 else 1.0
+    serious = {f.affected_bid for f in red_flags or [] if f.severity in SERIOUS_SEVERITIES}
+
+    candidates = []  # (distance from the boundary, bid id, reason)
+    for score in ranked:
+        if score.bid_id not in eligible:
+            continue
+        gap = lead if score is top else top.overall_score - score.overall_score
+        in_contention = gap < margin
+        reasons = []
+        if in_contention:
+            reasons.append((gap, f"within {gap:.2f} of the {'runner-up' if score is top else 'leading bid'}"))
+        if score is top:
+            threshold = min(DECISION_THRESHOLDS, key=lambda t: abs(score.overall_score - t))
+            if abs(score.overall_score - threshold) < margin:
+                reasons.append((abs(score.overall_score - threshold), f"{score.overall_score:.2f} is close to the {threshold:.2f} threshold"))
+        heuristic = (heuristic_scores or {}).get(score.bid_id)
+        if heuristic is not None and abs(score.overall_score - heuristic.overall_score) > disagreement:
+            reasons.append((0.0, f"mini score {score.overall_score:.2f} vs heuristic {heuristic.overall_score:.2f}"))
+        if (in_contention or score is top) and score.bid_id in serious:
+            reasons.append((0.0, "serious red flags on a bid in contention"))
+        if reasons:
+            distance, reason = min(reasons)
+            candidates.append((distance, score.bid_id, reason))
+
+    candidates.sort(key=lambda c: c[0])
+    return {bid_id: reason for _, bid_id, reason in candidates[:max_bids]}
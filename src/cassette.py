@@ -0,0 +1,124 @@
+"""Record/replay cassettes for LLM and Serper interactions.
+
+In record mode every structured-output LLM response and Serper JSON payload
+is appended to a cassette file, keyed by a hash of the request. In replay
+mode responses are served from the cassette with no network access, which
+makes evaluations deterministic and runnable without API keys.
+
+Activate with a context manager:
+
+    with use_cassette("tests/cassettes/clear_winner.jsonl", mode="replay"):
+        ...
+
+or process-wide with BID_EVAL_CASSETTE=<path> and
+BID_EVAL_CASSETTE_MODE=record|replay. A cassette activated with
+use_cassette() applies to the current context only (tasks started inside
+the block inherit it), so concurrent evaluations do not share it.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Literal, Optional
+from src.utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+CassetteMode = Literal["record", "replay"]
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    """A JSON-lines file of recorded responses keyed by request hash."""
+
+    def __init__(self, path, mode: CassetteMode):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode!r} (expected 'record' or 'replay')")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: dict[str, object] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def request_key(kind: str, request) -> str:
+        """Hash identifying a request of the given kind ("llm" or "serper")."""
+        return content_hash({"kind": kind, "request": request})
+
+    def lookup(self, kind: str, request):
+        """Return the recorded response for a request, or raise CassetteMiss."""
+        key = self.request_key(kind, request)
+        with self._lock:
+            if key not in self._entries:
+                raise CassetteMiss(f"No recorded {kind} response in {self.path} for request {key[:12]}")
+            return self._entries[key]
+
+    def record(self, kind: str, request, response) -> None:
+        """Store a response (no-op in replay mode or if already recorded)."""
+        if self.replaying:
+            return
+        key = self.request_key(kind, request)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = response
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "kind": kind, "response": response}, separators=(",", ":")) + "\n")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_active: ContextVar[Optional[Cassette]] = ContextVar("cassette", default=None)
+_env_cassette: Optional[Cassette] = None
+_env_checked = False
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The cassette in use in this context, if any, else the process-wide BID_EVAL_CASSETTE."""
+    global _env_cassette, _env_checked
+    cassette = _active.get()
+    if cassette is not None:
+        return cassette
+    if not _env_checked:
+        _env_checked = True
+        path = os.getenv("BID_EVAL_CASSETTE")
+        if path:
+            _env_cassette = Cassette(path, os.getenv("BID_EVAL_CASSETTE_MODE", "replay"))
+            logger.info("Using cassette %s in %s mode", path, _env_cassette.mode)
+    return _env_cassette
+
+
+def cassette_replaying() -> bool:
+    """True if responses are being served from a cassette."""
+    cassette = active_cassette()
+    return cassette is not None and cassette.replaying
+
+
+@contextmanager
+def use_cassette(path, mode: CassetteMode = "replay"):
+    """Record to or replay from a cassette file for the duration of the block."""
+    cassette = Cassette(path, mode)
+    token = _active.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _active.reset(token)
@@ -1,36 +1,123 @@
 import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from typing import Optional
+
+# Secrets come from the environment or a .env file. The Streamlit app copies
+# st.secrets into the environment at startup (see app.py), so nothing outside
+# app.py imports Streamlit. Heavy dependencies (dotenv, langchain_openai) are
+# imported on first use to keep CLI and worker startup fast.
+_dotenv_loaded = False
 
-# Load environment variables
-# Try Streamlit secrets first (for Streamlit Cloud), then .env file
 def get_secret(key: str, default: str = None):
-    """Get secret from Streamlit secrets or environment variable."""
-    try:
-        import streamlit as st
-        return st.secrets.get(key) or os.getenv(key, default)
-    except (AttributeError, FileNotFoundError, RuntimeError):
-        # Not in Streamlit context or secrets not available
+    """Get secret from the environment, loading .env on first use."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
         load_dotenv()
-        return os.getenv(key, default)
+        _dotenv_loaded = True
+    return os.getenv(key, default)
 
-# Store secrets (will be loaded when Streamlit is initialized)
+# Store secrets (resolved once, on first use - see _load_secrets)
+_secrets_loaded = False
 OPENAI_API_KEY = None
 SERPER_API_KEY = None
 LANGSMITH_API_KEY = None
 LANGSMITH_PROJECT = "bid-evaluation-agent"
 
+# Two-stage scoring: a deterministic pass ranks every bid, and only the top-K
+# (plus borderline bids within the margin) are scored by the LLM.
+# PREFILTER_TOP_K=0 scores every bid with the LLM.
+PREFILTER_TOP_K = int(os.getenv("PREFILTER_TOP_K", "10"))
+PREFILTER_BORDERLINE_MARGIN = float(os.getenv("PREFILTER_BORDERLINE_MARGIN", "0.05"))
+
+# Tenders with at least this many bids use the local requirement-coverage score
+# (src/scope_coverage.py) as scope_score instead of the LLM's judgment. 0 = never.
+LOCAL_SCOPE_SCORING_MIN_BIDS = int(os.getenv("LOCAL_SCOPE_SCORING_MIN_BIDS", "20"))
+
+# Scopes longer than SCOPE_SUMMARY_MIN_CHARS are shown to the LLM as a requirement-aligned
+# extract of at most SCOPE_SUMMARY_MAX_CHARS (src/scope_summary.py). 0 = always the full scope.
+# Score reasoning and red-flag evidence sent to the critique are clipped to CRITIQUE_TEXT_MAX_CHARS.
+SCOPE_SUMMARY_MIN_CHARS = int(os.getenv("SCOPE_SUMMARY_MIN_CHARS", "2000"))
+SCOPE_SUMMARY_MAX_CHARS = int(os.getenv("SCOPE_SUMMARY_MAX_CHARS", "800"))
+CRITIQUE_TEXT_MAX_CHARS = int(os.getenv("CRITIQUE_TEXT_MAX_CHARS", "600"))
+
+# HTTP job service (src/service.py): concurrent evaluations, queue bound, finished jobs kept in memory
+SERVICE_MAX_WORKERS = int(os.getenv("SERVICE_MAX_WORKERS", "4"))
+SERVICE_MAX_QUEUED_JOBS = int(os.getenv("SERVICE_MAX_QUEUED_JOBS", "100"))
+SERVICE_JOB_HISTORY = int(os.getenv("SERVICE_JOB_HISTORY", "500"))
+
+# Contractor searches per multi-query Serper request
+SERPER_BATCH_SIZE = int(os.getenv("SERPER_BATCH_SIZE", "20"))
+
+# Local data (requirements store, indexes); REQUIREMENTS_STORE_PATH="" disables the requirements store
+DATA_DIR = os.getenv("BID_EVAL_DATA_DIR", "data")
+REQUIREMENTS_STORE_PATH = os.getenv("REQUIREMENTS_STORE_PATH", os.path.join(DATA_DIR, "requirements.db"))
+
+# Local contractor index (src/tools/contractor_index.py): profiles older than the max age are
+# re-fetched by the background refresher every interval seconds. Empty path disables the index.
+CONTRACTOR_INDEX_PATH = os.getenv("CONTRACTOR_INDEX_PATH", os.path.join(DATA_DIR, "contractors.db"))
+CONTRACTOR_INDEX_MAX_AGE_DAYS = float(os.getenv("CONTRACTOR_INDEX_MAX_AGE_DAYS", "7"))
+CONTRACTOR_INDEX_REFRESH_INTERVAL = float(os.getenv("CONTRACTOR_INDEX_REFRESH_INTERVAL", "3600"))
+
+# Evaluation history (src/history.py). Market cost benchmarks need HISTORY_MIN_SAMPLES past bids
+# in the project category; contractors with HISTORY_MIN_EVALUATIONS past tenders are profiled from
+# their track record instead of a web search. Empty path disables the history.
+HISTORY_STORE_PATH = os.getenv("HISTORY_STORE_PATH", os.path.join(DATA_DIR, "history.db"))
+HISTORY_MIN_SAMPLES = int(os.getenv("HISTORY_MIN_SAMPLES", "5"))
+HISTORY_MIN_EVALUATIONS = int(os.getenv("HISTORY_MIN_EVALUATIONS", "3"))
+
+# Columnar export of finished evaluations (src/export.py): "parquet", "arrow" or "csv".
+# Empty directory disables the export.
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(DATA_DIR, "exports"))
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "parquet")
+
+# End-to-end time limit of an evaluation, split across the graph stages (src/deadline.py).
+# Stages that run out of time degrade instead of failing. 0 = no deadline.
+EVALUATION_DEADLINE_SECONDS = float(os.getenv("EVALUATION_DEADLINE_SECONDS", "180"))
+
+# Hedged LLM requests (src/hedging.py): a duplicate request is sent once a call has been running
+# longer than this latency percentile of recent calls to the same model/schema, for at most
+# LLM_HEDGE_BUDGET of all requests. LLM_HEDGE_PERCENTILE=0 disables hedging.
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.1"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Model cascade (src/cascade.py): bids are scored by GPT-4o-mini and only uncertain ones (within the
+# margin of a decision boundary, or whose mini and heuristic scores disagree) are re-scored by GPT-4o,
+# at most CASCADE_MAX_BIDS per tender. The critique starts on mini and escalates below the minimum
+# confidence. MODEL_CASCADE=false scores with mini only and always reviews with GPT-4o.
+MODEL_CASCADE = os.getenv("MODEL_CASCADE", "true").lower() in ("1", "true", "yes")
+CASCADE_MARGIN = float(os.getenv("CASCADE_MARGIN", "0.05"))
+CASCADE_DISAGREEMENT = float(os.getenv("CASCADE_DISAGREEMENT", "0.15"))
+CASCADE_MAX_BIDS = int(os.getenv("CASCADE_MAX_BIDS", "5"))
+CASCADE_CRITIQUE_MIN_CONFIDENCE = float(os.getenv("CASCADE_CRITIQUE_MIN_CONFIDENCE", "0.75"))
+
+# Logging (src/logging_config.py): root level, console format ("text" or "json" - the file log is
+# always JSON lines), and sampling of per-bid hot-loop messages: the first and then every Nth
+# message per call site is kept (1 = keep all).
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "10"))
+
 # Models - will be initialized lazily
 _gpt4o_mini = None
 _gpt4o = None
 
 def _load_secrets():
-    """Load secrets from Streamlit or environment variables."""
-    global OPENAI_API_KEY, SERPER_API_KEY, LANGSMITH_API_KEY, LANGSMITH_PROJECT
+    """Load secrets from environment variables once and initialize LangSmith."""
+    global OPENAI_API_KEY, SERPER_API_KEY, LANGSMITH_API_KEY, LANGSMITH_PROJECT, _secrets_loaded
+    if _secrets_loaded:
+        return
     OPENAI_API_KEY = get_secret("OPENAI_API_KEY")
     SERPER_API_KEY = get_secret("SERPER_API_KEY")
     LANGSMITH_API_KEY = get_secret("LANGSMITH_API_KEY")
     LANGSMITH_PROJECT = get_secret("LANGSMITH_PROJECT", "bid-evaluation-agent")
+    _init_langsmith()
+    _secrets_loaded = True
+
+def get_serper_api_key() -> Optional[str]:
+    """Serper API key, resolved on first use (module constants are None until secrets load)."""
+    _load_secrets()
+    return SERPER_API_KEY
 
 def _init_langsmith():
     """Initialize LangSmith if API key is available."""
@@ -46,9 +133,7 @@ def get_gpt4o_mini():
     """Get GPT-4o-mini model instance, loading secrets if needed."""
     global _gpt4o_mini, OPENAI_API_KEY
     if _gpt4o_mini is None:
-        if OPENAI_API_KEY is None:
-            _load_secrets()
-            _init_langsmith()  # Initialize LangSmith when we first load secrets
+        _load_secrets()
         if not OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY not found!\n\n"
@@ -59,6 +144,7 @@ def get_gpt4o_mini():
                 "   OPENAI_API_KEY = 'your_key_here'\n"
                 "   SERPER_API_KEY = 'your_key_here'\n"
             )
+        from langchain_openai import ChatOpenAI
         _gpt4o_mini = ChatOpenAI(
             model="gpt-4o-mini",
             temperature=0.3,
@@ -70,9 +156,7 @@ def get_gpt4o():
     """Get GPT-4o model instance, loading secrets if needed."""
     global _gpt4o, OPENAI_API_KEY
     if _gpt4o is None:
-        if OPENAI_API_KEY is None:
-            _load_secrets()
-            _init_langsmith()  # Initialize LangSmith when we first load secrets
+        _load_secrets()
         if not OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY not found!\n\n"
@@ -83,6 +167,7 @@ def get_gpt4o():
                 "   OPENAI_API_KEY = 'your_key_here'\n"
                 "   SERPER_API_KEY = 'your_key_here'\n"
             )
+        from langchain_openai import ChatOpenAI
         _gpt4o = ChatOpenAI(
             model="gpt-4o",
             temperature=0.2,
@@ -90,31 +175,6 @@ def get_gpt4o():
         )
     return _gpt4o
 
-# Lazy model accessors - work like variables but initialize on first access
-class _LazyModel:
-    """Lazy model wrapper that initializes on first access."""
-    def __init__(self, getter_func):
-        self._getter = getter_func
-        self._instance = None
-    
-    def _ensure_initialized(self):
-        """Ensure model is initialized."""
-        if self._instance is None:
-            self._instance = self._getter()
-        return self._instance
-    
-    def __getattr__(self, name):
-        # Delegate all attribute access to the actual model
-        return getattr(self._ensure_initialized(), name)
-    
-    def __call__(self, *args, **kwargs):
-        # Allow calling the model directly
-        return self._ensure_initialized()(*args, **kwargs)
-
-# Create lazy model instances that work transparently
-gpt4o_mini = _LazyModel(get_gpt4o_mini)
-gpt4o = _LazyModel(get_gpt4o)
-
 # LangSmith will be initialized lazily when secrets are loaded
-# (handled in _init_langsmith() called from get_gpt4o_mini/get_gpt4o)
+# (handled in _init_langsmith() called from _load_secrets)
 
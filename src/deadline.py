@@ -0,0 +1,53 @@
+"""Per-evaluation deadline budgets.
+
+An evaluation's deadline (absolute time, in the state as "deadline") is split
+across the graph stages by STAGE_SHARES. Each stage gets its share of the
+time still left, so time saved by an early stage carries over to later ones.
+A stage that runs out of its budget degrades instead of failing:
+
+- parse_and_enrich: rule-based requirements only, cached or default contractor profiles
+- score_and_flag: heuristic scores for bids the LLM has not scored yet
+- critique_and_finalize: rule-based recommendation instead of the GPT-4o review
+
+and records what was degraded in the state's "degraded" list.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Optional, TypeVar
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STAGE_SHARES = {
+    "parse_and_enrich": 0.30,
+    "score_and_flag": 0.50,
+    "critique_and_finalize": 0.20,
+}
+
+
+def stage_deadline(state: dict, stage: str) -> Optional[float]:
+    """Absolute time by which `stage` should finish, or None if the evaluation has no deadline."""
+    deadline = state.get("deadline")
+    if deadline is None:
+        return None
+    stages = list(STAGE_SHARES)
+    remaining_shares = sum(STAGE_SHARES[s] for s in stages[stages.index(stage):])
+    now = time.time()
+    return now + max(0.0, deadline - now) * STAGE_SHARES[stage] / remaining_shares
+
+
+async def run_until(awaitable: Awaitable[T], deadline: Optional[float]) -> T:
+    """Await with a timeout at `deadline` (no limit if None); raises asyncio.TimeoutError."""
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=max(0.0, deadline - time.time()))
+
+
+def mark_degraded(degraded: list[str], stage: str, detail: str) -> None:
+    """Record (in place) that part of `stage` was degraded."""
+    logger.warning("%s out of time: %s", stage, detail)
+    metrics.increment(f"degraded_{stage}")
+    degraded.append(f"{stage}: {detail}")
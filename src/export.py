@@ -0,0 +1,281 @@
+"""Columnar export of evaluation results for portfolio analysis.
+
+Every finished evaluation is flattened into three tables:
+
+- scores: one row per bid and scoring dimension (cost, timeline, scope, risk, reputation, overall)
+- red_flags: one row per red flag
+- recommendations: one row per evaluation
+
+and appended under EXPORT_DIR/<table>/ as Parquet (default) or Arrow IPC
+files, hive-partitioned by project category, or to EXPORT_DIR/<table>.csv.
+Parquet and Arrow appends write new files instead of rewriting old ones, so
+an append costs the same after thousands of tenders, and a portfolio query
+reads only the columns (and categories) it needs:
+
+    import pyarrow.dataset as ds
+    scores = ds.dataset("data/exports/scores", format="parquet", partitioning="hive")
+    scores.to_table(columns=["contractor_name", "score"], filter=ds.field("dimension") == "overall")
+
+    python -m src.export show scores --category office --limit 20
+
+pyarrow is imported on first use.
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+from src.config import EXPORT_DIR, EXPORT_FORMAT
+from src.history import project_category
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("parquet", "arrow", "csv")
+TABLES = ("scores", "red_flags", "recommendations")
+DIMENSIONS = ("cost", "timeline", "scope", "risk", "reputation", "overall")
+
+# CSV appends go to a single file per table
+_csv_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def table_schemas() -> dict:
+    """Arrow schemas of the exported tables (fixed, so appended files stay compatible)."""
+    import pyarrow as pa
+
+    evaluation = [
+        ("evaluation_id", pa.string()),
+        ("project_hash", pa.string()),
+        ("category", pa.string()),
+        ("exported_at", pa.timestamp("s", tz="UTC")),
+    ]
+    return {
+        "scores": pa.schema(evaluation + [
+            ("bid_id", pa.string()),
+            ("contractor_name", pa.string()),
+            ("scoring_method", pa.string()),
+            ("rank", pa.int32()),
+            ("selected", pa.bool_()),
+            ("dimension", pa.string()),
+            ("score", pa.float64()),
+        ]),
+        "red_flags": pa.schema(evaluation + [
+            ("bid_id", pa.string()),
+            ("type", pa.string()),
+            ("severity", pa.string()),
+            ("evidence", pa.string()),
+        ]),
+        "recommendations": pa.schema(evaluation + [
+            ("recommendation_type", pa.string()),
+            ("confidence", pa.float64()),
+            ("selected_bid", pa.string()),
+            ("ranked_bids", pa.string()),  # Comma-separated, so the CSV export has the same columns
+            ("bid_count", pa.int32()),
+            ("red_flag_count", pa.int32()),
+            ("rationale", pa.string()),
+            ("trade_offs", pa.string()),  # One per line
+            ("degraded", pa.string()),  # One per line
+        ]),
+    }
+
+
+def evaluation_rows(state: dict, evaluation_id: str, exported_at: Optional[float] = None) -> dict[str, list[dict]]:
+    """Rows of each exported table for a final graph state."""
+    exported_at = int(exported_at or time.time())
+    evaluation = {
+        "evaluation_id": evaluation_id,
+        "project_hash": state.get("project_hash", ""),
+        "category": state.get("project_category") or project_category(state.get("project_description", "")),
+        "exported_at": exported_at,
+    }
+    recommendation = state.get("final_recommendation")
+    selected_bid = None
+    if recommendation and recommendation.recommendation_type.value == "ACCEPT" and recommendation.ranked_bids:
+        selected_bid = recommendation.ranked_bids[0]
+
+    scores = state.get("scores", [])
+    red_flags = state.get("red_flags", [])
+    rows = {
+        "scores": [
+            {
+                **evaluation,
+                "bid_id": score.bid_id,
+                "contractor_name": score.contractor_name,
+                "scoring_method": score.scoring_method,
+                "rank": rank,
+                "selected": score.bid_id == selected_bid,
+                "dimension": dimension,
+                "score": getattr(score, f"{dimension}_score"),
+            }
+            for rank, score in enumerate(scores, start=1)
+            for dimension in DIMENSIONS
+        ],
+        "red_flags": [
+            {
+                **evaluation,
+                "bid_id": flag.affected_bid,
+                "type": flag.type.value,
+                "severity": flag.severity,
+                "evidence": flag.evidence,
+            }
+            for flag in red_flags
+        ],
+        "recommendations": [],
+    }
+    if recommendation:
+        rows["recommendations"].append({
+            **evaluation,
+            "recommendation_type": recommendation.recommendation_type.value,
+            "confidence": recommendation.confidence,
+            "selected_bid": selected_bid,
+            "ranked_bids": ",".join(recommendation.ranked_bids),
+            "bid_count": len(scores),
+            "red_flag_count": len(red_flags),
+            "rationale": recommendation.rationale,
+            "trade_offs": "\n".join(recommendation.trade_offs),
+            "degraded": "\n".join(state.get("degraded", [])),
+        })
+    return rows
+
+
+class EvaluationExport:
+    """Append-only columnar export of evaluations under one directory."""
+
+    def __init__(self, root, fmt: str = "parquet"):
+        """
+        Args:
+            root: Export directory (created if missing)
+            fmt: "parquet", "arrow" (IPC files) or "csv"
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        self.root = Path(root)
+        self.fmt = fmt
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def append(self, evaluations: Iterable[tuple[str, dict]]) -> dict[str, int]:
+        """
+        Append (evaluation_id, final state) pairs; one file per table per call for Parquet/Arrow.
+
+        Returns:
+            Rows written per table
+        """
+        import pyarrow as pa
+
+        rows: dict[str, list[dict]] = {name: [] for name in TABLES}
+        now = time.time()
+        for evaluation_id, state in evaluations:
+            for name, table_rows in evaluation_rows(state, evaluation_id, now).items():
+                rows[name].extend(table_rows)
+
+        schemas = table_schemas()
+        written = {}
+        for name, table_rows in rows.items():
+            if table_rows:
+                self._write(name, pa.Table.from_pylist(table_rows, schema=schemas[name]))
+            written[name] = len(table_rows)
+        return written
+
+    def _write(self, name: str, table) -> None:
+        if self.fmt == "csv":
+            import pyarrow.csv as pacsv
+
+            path = self.root / f"{name}.csv"
+            with _csv_lock, open(path, "ab") as f:
+                pacsv.write_csv(table, f, pacsv.WriteOptions(include_header=f.tell() == 0))
+            return
+
+        import pyarrow.dataset as ds
+
+        extension = "parquet" if self.fmt == "parquet" else "arrow"
+        ds.write_dataset(
+            table,
+            self.root / name,
+            format="parquet" if self.fmt == "parquet" else "ipc",
+            partitioning=["category"],
+            partitioning_flavor="hive",
+            # Unique per append, so existing files are never touched
+            basename_template=f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}-{{i}}.{extension}",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def _path(self, name: str) -> Path:
+        return self.root / (f"{name}.csv" if self.fmt == "csv" else name)
+
+    def dataset(self, name: str):
+        """pyarrow Dataset over everything exported to a table."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if name not in TABLES:
+            raise ValueError(f"Unknown table {name!r} (expected one of {', '.join(TABLES)})")
+        schema = table_schemas()[name]
+        if self.fmt == "csv":
+            return ds.dataset(self._path(name), format="csv", schema=schema)
+        return ds.dataset(
+            self._path(name),
+            format="parquet" if self.fmt == "parquet" else "ipc",
+            partitioning=ds.partitioning(pa.schema([schema.field("category")]), flavor="hive"),
+            schema=schema,
+        )
+
+    def read(self, name: str, columns: Optional[list[str]] = None, category: Optional[str] = None):
+        """Exported rows of a table as a pyarrow Table, optionally of one project category."""
+        import pyarrow.dataset as ds
+
+        if not self._path(name).exists():
+            return table_schemas()[name].empty_table().select(columns or table_schemas()[name].names)
+        return self.dataset(name).to_table(
+            columns=columns,
+            filter=ds.field("category") == category if category else None,
+        )
+
+
+_default_export: Optional[EvaluationExport] = None
+
+
+def default_export() -> Optional[EvaluationExport]:
+    """The export at EXPORT_DIR in EXPORT_FORMAT, or None if the export is disabled."""
+    global _default_export
+    if _default_export is None and EXPORT_DIR:
+        _default_export = EvaluationExport(EXPORT_DIR, EXPORT_FORMAT)
+    return _default_export
+
+
+def export_evaluation(state: dict, evaluation_id: str) -> None:
+    """Append a finished evaluation to the default export; errors are logged, not raised."""
+    if not state.get("scores"):
+        return
+    try:
+        export = default_export()
+        if export is not None:
+            export.append([(evaluation_id, state)])
+    except Exception as e:
+        logger.warning("Could not export evaluation %s: %s", evaluation_id, e)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Exported evaluation results")
+    parser.add_argument("--dir", default=EXPORT_DIR, help="Export directory (default: EXPORT_DIR)")
+    parser.add_argument("--format", default=EXPORT_FORMAT, choices=FORMATS)
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="Print exported rows as JSON lines")
+    show.add_argument("table", choices=TABLES)
+    show.add_argument("--category")
+    show.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        sys.exit("Export is disabled (EXPORT_DIR is empty)")
+    table = EvaluationExport(args.dir, args.format).read(args.table, category=args.category)
+    for row in table.slice(0, args.limit).to_pylist():
+        print(json.dumps(row, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from langgraph.graph import StateGraph, END
+from src.llm import tracks_llm_usage
 from src.state import BidEvalState
 from src.nodes.parse import parse_and_enrich
 from src.nodes.score import score_and_flag
@@ -9,9 +10,9 @@ def create_graph():
     """Create and compile the bid evaluation graph."""
     workflow = StateGraph(BidEvalState)
     
-    workflow.add_node("parse_and_enrich", parse_and_enrich)
-    workflow.add_node("score_and_flag", score_and_flag)
-    workflow.add_node("critique_and_finalize", critique_and_finalize)
+    workflow.add_node("parse_and_enrich", tracks_llm_usage(parse_and_enrich))
+    workflow.add_node("score_and_flag", tracks_llm_usage(score_and_flag))
+    workflow.add_node("critique_and_finalize", tracks_llm_usage(critique_and_finalize))
     
     workflow.set_entry_point("parse_and_enrich")
     workflow.add_edge("parse_and_enrich", "score_and_flag")
@@ -0,0 +1,127 @@
+"""Hedged requests for tail-latency control.
+
+A call that is still running after the `percentile` latency of recent calls
+with the same key gets a duplicate request; whichever returns first wins and
+the other is cancelled. Hedges are capped at `budget` (a fraction of all
+requests), so a slow provider cannot double the load. Latency samples come
+from the calls themselves: the primary's duration, or how long it had run
+when it was abandoned for a hedge, so slow primaries stay in the window (a
+hedge's duration is only used when the primary failed).
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+from src.config import LLM_HEDGE_BUDGET, LLM_HEDGE_MIN_SAMPLES, LLM_HEDGE_PERCENTILE
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """Runs request factories with a percentile-delayed hedge and a hedge budget."""
+
+    def __init__(
+        self,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        budget: float = LLM_HEDGE_BUDGET,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        window: int = 200,
+        name: str = "llm",
+    ):
+        """
+        Args:
+            percentile: Latency percentile after which a hedge is sent (0 disables hedging)
+            budget: Maximum share of requests that may be hedged
+            min_samples: Latencies observed for a key before it is hedged
+            window: Recent latencies kept per key
+            name: Prefix of the metrics counters
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.window = window
+        self.name = name
+        self._latencies: dict[Hashable, deque] = {}
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self, key: Hashable) -> Optional[float]:
+        """Seconds after which a request for `key` is hedged, or None if it is not hedged."""
+        if self.percentile <= 0:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < max(1, self.min_samples):
+            return None
+        return latencies[min(len(latencies) - 1, math.ceil(self.percentile / 100 * len(latencies)) - 1)]
+
+    def record_latency(self, key: Hashable, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def _take_hedge(self) -> bool:
+        """Reserve a hedge if the budget allows one."""
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    async def run(self, request: Callable[[], Awaitable[T]], key: Hashable) -> T:
+        """Await `request()`, hedging it with a second `request()` if it is slow."""
+        with self._lock:
+            self._requests += 1
+        metrics.increment(f"{self.name}_requests")
+        started = time.monotonic()
+        primary = asyncio.ensure_future(request())
+        delay = self.hedge_delay(key)
+        if delay is None:
+            result = await primary
+            self.record_latency(key, time.monotonic() - started)
+            return result
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._take_hedge():
+                metrics.increment(f"{self.name}_hedges")
+                logger.info("Request still running after %.1fs, sending a hedge", delay)
+                hedge_started = time.monotonic()
+                hedge = asyncio.ensure_future(request())
+                tasks.add(hedge)
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if not t.cancelled() and t.exception() is None), None)
+                if winner is not None:
+                    break
+                tasks -= done
+                if not tasks:
+                    return next(iter(done)).result()  # Every request failed - raise the error
+            if winner is primary:
+                self.record_latency(key, time.monotonic() - started)
+            else:
+                metrics.increment(f"{self.name}_hedge_wins")
+                if primary.done():  # The primary failed; an abandoned one is recorded below
+                    self.record_latency(key, time.monotonic() - hedge_started)
+            return winner.result()
+        finally:
+            if not primary.done():
+                self.record_latency(key, time.monotonic() - started)  # At least this slow
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        """Hedge rate (hedged share of requests) and win rate (share of hedges that beat the primary)."""
+        requests = metrics.get(f"{self.name}_requests")
+        hedges = metrics.get(f"{self.name}_hedges")
+        return {
+            "hedge_rate": hedges / requests if requests else 0.0,
+            "win_rate": metrics.get(f"{self.name}_hedge_wins") / hedges if hedges else 0.0,
+        }
@@ -0,0 +1,322 @@
+"""Historical store of finished evaluations.
+
+Each evaluated tender is persisted in SQLite - recommendation, bids, scores,
+flags, timestamp and project category - with indexes for the two queries
+the pipeline runs on every evaluation:
+
+- market cost benchmark: how past bids in the same project category priced
+  against their project's target budget (median cost/budget ratio)
+- contractor track record: how a contractor's past bids scored, how often
+  they were selected and how often they were flagged, counted per tender
+
+A track record feeds the contractor's reputation score in later tenders, so
+it uses each bid's merit score - the overall score without its reputation
+component - and reputation does not reinforce itself.
+
+Re-evaluating a project replaces its stored evaluation, so revisions of the
+same tender are counted once.
+"""
+import logging
+import re
+import sqlite3
+import time
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from typing import Optional
+from src.bids import BidTable
+from src.config import HISTORY_MIN_SAMPLES, HISTORY_STORE_PATH
+from src.schemas import BidScore, ContractorProfile
+from src.tools.contractor_index import name_key
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    project_hash TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    budget_target REAL,
+    recommendation_type TEXT,
+    confidence REAL,
+    selected_bid TEXT,
+    bid_count INTEGER NOT NULL,
+    recommendation TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_category ON evaluations (category, created_at);
+CREATE TABLE IF NOT EXISTS bids (
+    project_hash TEXT NOT NULL,
+    bid_id TEXT NOT NULL,
+    contractor_key TEXT NOT NULL,
+    contractor_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    cost REAL,
+    cost_ratio REAL,
+    timeline_months REAL,
+    overall_score REAL,
+    scoring_method TEXT,
+    selected INTEGER NOT NULL,
+    serious_flags INTEGER NOT NULL,
+    flag_types TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    merit_score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_bids_project ON bids (project_hash);
+CREATE INDEX IF NOT EXISTS idx_bids_contractor ON bids (contractor_key, created_at);
+CREATE INDEX IF NOT EXISTS idx_bids_category ON bids (category, created_at);
+"""
+
+CATEGORY_KEYWORDS = {
+    "healthcare": ("healthcare", "hospital", "medical", "clinic", "patient"),
+    "industrial": ("industrial", "warehouse", "factory", "manufacturing", "loading dock", "plant"),
+    "retail": ("retail", "store", "shopping", "mall", "restaurant"),
+    "residential": ("residential", "apartment", "housing", "condo", "dwelling", "homes"),
+    "institutional": ("courthouse", "school", "university", "library", "museum", "historic"),
+    "commercial": ("commercial", "office", "mixed-use", "hotel"),
+}
+
+SERIOUS_SEVERITIES = ("high", "critical")
+
+
+def project_category(project_description: str) -> str:
+    """Project category from description keywords ("other" if none match)."""
+    text = project_description.lower()
+    counts = {
+        category: sum(len(re.findall(rf"\b{re.escape(keyword)}", text)) for keyword in keywords)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    category, hits = max(counts.items(), key=lambda item: item[1])
+    return category if hits else "other"
+
+
+@dataclass
+class TrackRecord:
+    """A contractor's results across past evaluations."""
+    contractor_name: str
+    evaluations: int  # Past tenders the contractor bid in
+    times_selected: int  # Tenders won
+    mean_score: float  # Mean merit score (overall score without reputation)
+    serious_flag_rate: float  # Share of past tenders with a high/critical red flag
+    recurring_flags: list[tuple[str, int]] = field(default_factory=list)  # (flag type, tenders flagged)
+
+    @property
+    def reputation_score(self) -> float:
+        """Reputation from past performance: mean score, plus selections, minus serious flags."""
+        selection_rate = self.times_selected / self.evaluations
+        score = self.mean_score + 0.15 * selection_rate - 0.25 * self.serious_flag_rate
+        return round(max(0.3, min(1.0, score)), 2)
+
+    def to_profile(self) -> ContractorProfile:
+        """Contractor profile built from the track record instead of a web search."""
+        return ContractorProfile(
+            contractor_name=self.contractor_name,
+            reputation_score=self.reputation_score,
+            recent_projects=[
+                f"Bid in {self.evaluations} past tenders (selected {self.times_selected}x), "
+                f"mean evaluation score {self.mean_score:.2f}"
+            ],
+            red_flags_found=[
+                f"{flag_type} flagged in {count} of {self.evaluations} past tenders"
+                for flag_type, count in self.recurring_flags
+            ][:3],
+            credibility_sources=[f"evaluation history ({self.evaluations} tenders)"],
+        )
+
+
+class EvaluationHistory:
+    """SQLite store of evaluated tenders with benchmark and track-record queries."""
+
+    def __init__(self, path, wal: bool = True):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            wal: Use WAL journaling; disable for databases on network file systems
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(bids)")}
+            if "merit_score" not in columns:  # Stores created before merit scores were recorded
+                conn.execute("ALTER TABLE bids ADD COLUMN merit_score REAL")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def record(self, state: dict) -> None:
+        """Store (or replace) the evaluation of a project from a final graph state."""
+        description_hash = state["project_hash"]
+        category = project_category(state.get("project_description", ""))
+        requirements = state.get("requirements")
+        budget_target = requirements.budget_target if requirements else None
+        recommendation = state.get("final_recommendation")
+        selected_bid = None
+        if recommendation and recommendation.recommendation_type.value == "ACCEPT" and recommendation.ranked_bids:
+            selected_bid = recommendation.ranked_bids[0]
+
+        # Keyed by the same (generated if missing) ids the scores use
+        bids = {bid.id: bid for bid in BidTable.of(state.get("bid_table") or state.get("bids", []))}
+        flags: dict[str, list] = {}
+        for flag in state.get("red_flags", []):
+            flags.setdefault(flag.affected_bid, []).append(flag)
+
+        now = time.time()
+        rows = []
+        for score in state.get("scores", []):
+            bid = bids.get(score.bid_id)
+            cost = bid.cost if bid else None
+            bid_flags = flags.get(score.bid_id, [])
+            rows.append((
+                description_hash,
+                score.bid_id,
+                name_key(score.contractor_name),
+                score.contractor_name,
+                category,
+                cost,
+                cost / budget_target if cost and budget_target else None,
+                bid.timeline_months if bid else None,
+                score.overall_score,
+                score.scoring_method,
+                int(score.bid_id == selected_bid),
+                int(any(f.severity in SERIOUS_SEVERITIES for f in bid_flags)),
+                ",".join(sorted({f.type.value for f in bid_flags if f.severity in SERIOUS_SEVERITIES})),
+                now,
+                merit_score(score),
+            ))
+
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        description_hash,
+                        category,
+                        budget_target,
+                        recommendation.recommendation_type.value if recommendation else None,
+                        recommendation.confidence if recommendation else None,
+                        selected_bid,
+                        len(rows),
+                        recommendation.model_dump_json() if recommendation else None,
+                        now,
+                    ),
+                )
+                conn.execute("DELETE FROM bids WHERE project_hash = ?", (description_hash,))
+                conn.executemany("INSERT INTO bids VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def cost_benchmark(
+        self,
+        category: str,
+        budget_target: Optional[float],
+        exclude_project_hash: str = "",
+        min_samples: int = HISTORY_MIN_SAMPLES,
+        window: int = 500,
+    ) -> Optional[float]:
+        """
+        Market cost benchmark for a project: its target budget scaled by the median
+        cost/budget ratio of the latest past bids in the same category.
+
+        Returns None without a target budget or with fewer than `min_samples` past bids.
+        """
+        if not budget_target:
+            return None
+        with closing(self._connect()) as conn:
+            ratios = [row[0] for row in conn.execute(
+                "SELECT cost_ratio FROM bids WHERE category = ? AND cost_ratio IS NOT NULL AND project_hash != ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (category, exclude_project_hash, window),
+            )]
+        if len(ratios) < max(1, min_samples):
+            return None
+        return round(budget_target * median(ratios), 2)
+
+    def track_records(self, contractor_names: list[str], exclude_project_hash: str = "") -> dict[str, TrackRecord]:
+        """
+        Track records keyed by the requested names; contractors without history are omitted.
+
+        A contractor bidding several times in one tender counts once for it:
+        selected or flagged if any of its bids was, scored by their mean.
+        """
+        keys = {name_key(name): name for name in contractor_names if name}
+        if not keys:
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT contractor_key, COUNT(DISTINCT project_hash), SUM(selected), AVG(score), AVG(serious_flags), "
+                "GROUP_CONCAT(flag_types, ';') FROM ("
+                "  SELECT contractor_key, project_hash, MAX(selected) AS selected, "
+                "  AVG(COALESCE(merit_score, overall_score)) AS score, MAX(serious_flags) AS serious_flags, "
+                "  GROUP_CONCAT(flag_types, ',') AS flag_types FROM bids "
+                f"  WHERE contractor_key IN ({','.join('?' * len(keys))}) AND project_hash != ? "
+                "  GROUP BY contractor_key, project_hash"
+                ") GROUP BY contractor_key",
+                (*keys, exclude_project_hash),
+            ).fetchall()
+        records = {}
+        for key, evaluations, selected, mean_score, flag_rate, flag_types in rows:
+            # Tenders each serious flag type was raised in
+            flag_counts = Counter(
+                t for tender in (flag_types or "").split(";") for t in set(tender.split(",")) if t
+            )
+            records[keys[key]] = TrackRecord(
+                contractor_name=keys[key],
+                evaluations=evaluations,
+                times_selected=selected or 0,
+                mean_score=round(mean_score or 0.0, 3),
+                serious_flag_rate=round(flag_rate or 0.0, 3),
+                recurring_flags=flag_counts.most_common(),
+            )
+        return records
+
+    def recent(self, category: Optional[str] = None, limit: int = 20) -> list[dict]:
+        """Latest stored evaluations, optionally of one category."""
+        query = "SELECT project_hash, category, recommendation_type, confidence, selected_bid, bid_count, created_at FROM evaluations"
+        params: list = []
+        if category:
+            query += " WHERE category = ?"
+            params.append(category)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(query, params)]
+
+
+def merit_score(score: BidScore) -> float:
+    """Overall score with the reputation component left out (the other weights rescaled)."""
+    from src.nodes.score import SCORING_WEIGHTS  # The scoring node pulls in the LLM clients
+
+    weights = {dimension: w for dimension, w in SCORING_WEIGHTS.items() if dimension != "reputation"}
+    merit = sum(getattr(score, f"{dimension}_score") * w for dimension, w in weights.items()) / sum(weights.values())
+    return round(merit, 3)
+
+
+_default_history: Optional[EvaluationHistory] = None
+
+
+def default_history() -> Optional[EvaluationHistory]:
+    """The store at HISTORY_STORE_PATH, or None if the history is disabled."""
+    global _default_history
+    if _default_history is None and HISTORY_STORE_PATH:
+        _default_history = EvaluationHistory(HISTORY_STORE_PATH)
+    return _default_history
+
+
+def record_evaluation(state: dict) -> None:
+    """Persist a finished evaluation in the default history; errors are logged, not raised."""
+    if not state.get("project_hash") or not state.get("scores"):
+        return
+    try:
+        history = default_history()
+        if history is not None:
+            history.record(state)
+    except Exception as e:
+        logger.warning("Could not record evaluation in history: %s", e)
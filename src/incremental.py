@@ -0,0 +1,50 @@
+"""Incremental re-evaluation of a tender when bids are added or amended."""
+import logging
+from typing import Optional
+from src.graph import create_graph
+from src.state import BidEvalState, build_initial_state
+
+logger = logging.getLogger(__name__)
+
+
+async def reevaluate(
+    previous: BidEvalState,
+    bids: list[dict],
+    project_description: Optional[str] = None,
+    graph=None,
+) -> BidEvalState:
+    """
+    Re-evaluate a tender, reusing the work stored in a previous result.
+
+    Requirements are reused while the project description is unchanged,
+    contractor profiles are reused for known contractors, and bids whose
+    content hash matches a stored result keep their score and red flags (the
+    hash covers the requirements, the scope scoring method and the market
+    benchmark, so a change to any of them re-scores the bid). Only new or
+    changed bids are sent to the LLM for scoring; ranking and the rule-based
+    critique checks always rerun.
+
+    This is a library entry point: app.py and the service evaluate every
+    upload from scratch and do not call it.
+
+    Args:
+        previous: Final state of an earlier evaluation of the same tender
+        bids: Complete current list of bids (unchanged, amended and new)
+        project_description: New description, or None to keep the previous one
+        graph: Compiled evaluation graph (defaults to create_graph())
+    """
+    if project_description is None:
+        project_description = previous["project_description"]
+
+    state = build_initial_state(project_description, bids)
+    state["requirements"] = previous.get("requirements")
+    state["project_hash"] = previous.get("project_hash", "")
+    state["contractor_profiles"] = list(previous.get("contractor_profiles") or [])
+    state["bid_results"] = dict(previous.get("bid_results") or {})
+    state["critique_cache"] = dict(previous.get("critique_cache") or {})
+
+    logger.info("Re-evaluating tender with %d bids (%d stored bid results)", len(bids), len(state['bid_results']))
+
+    if graph is None:
+        graph = create_graph()
+    return await graph.ainvoke(state)
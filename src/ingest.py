@@ -0,0 +1,238 @@
+"""Streaming loader for tender files.
+
+Tenders are read in chunks instead of with json.load: bids are decoded one
+at a time from a `{"project": {...}, "bids": [...]}` JSON document, or from
+JSONL (a `{"project": {...}}` line, then one bid per line), and each bid is
+validated against BidSubmission as it is decoded. Invalid bids are reported
+and skipped instead of failing the whole upload. Evaluation starts once the
+tender is complete: the prefilter ranks the whole field before any bid is scored.
+
+    with open(path, "rb") as f:
+        tender = load_tender(f, jsonl=path.endswith(".jsonl"))
+
+TenderReader takes the chunks directly, for sources that push them (an HTTP
+request body).
+"""
+import codecs
+import json
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Optional, TextIO, Union
+from pydantic import ValidationError
+from src.schemas import BidSubmission
+
+CHUNK_SIZE = 1 << 16
+
+_INCOMPLETE = object()
+
+
+@dataclass
+class BidError:
+    index: int  # Position of the bid in the file
+    message: str
+
+
+@dataclass
+class Tender:
+    project_description: str
+    bids: list[dict]
+    errors: list[BidError] = field(default_factory=list)
+    fields: dict = field(default_factory=dict)  # Other top-level fields (e.g. deadline_seconds)
+
+
+def bid_error(bid: Any) -> Optional[str]:
+    """Why a bid is invalid, or None if it matches BidSubmission."""
+    if not isinstance(bid, dict):
+        return "bid is not a JSON object"
+    try:
+        BidSubmission.model_validate(bid)
+    except ValidationError as e:
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+    return None
+
+
+class TenderStreamParser:
+    """
+    Incremental tender parser: feed() text chunks, get back the values completed so far.
+
+    Events are ("project", value), ("bid", value), ("invalid", message) for
+    unparseable JSONL lines, and ("field", (key, value)) for other top-level
+    fields. Only one bid (or top-level value) is buffered at a time.
+    """
+
+    def __init__(self, jsonl: bool = False):
+        self.jsonl = jsonl
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._line = 0
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str, final: bool = False) -> list[tuple[str, Any]]:
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        events = self._parse_lines(final) if self.jsonl else self._parse_document(final)
+        if final and not self.jsonl and self._state != "end":
+            raise ValueError("Invalid JSON format: file ends before the tender object is complete")
+        return events
+
+    def _parse_lines(self, final: bool) -> list:
+        events = []
+        while True:
+            newline = self._buffer.find("\n", self._pos)
+            if newline == -1 and not final:
+                return events
+            end = len(self._buffer) if newline == -1 else newline
+            line = self._buffer[self._pos:end].strip()
+            self._pos = end + 1 if newline != -1 else end
+            self._line += 1
+            if line:
+                try:
+                    value = json.loads(line)
+                except json.JSONDecodeError as e:
+                    events.append(("invalid", f"line {self._line}: invalid JSON ({e.msg})"))
+                else:
+                    if isinstance(value, dict) and "project" in value:
+                        events.append(("project", value["project"]))
+                        events.extend(("field", item) for item in value.items() if item[0] != "project")
+                    else:
+                        events.append(("bid", value))
+            if newline == -1:
+                return events
+
+    def _decode(self, final: bool) -> Any:
+        """Next complete JSON value at the current position, or _INCOMPLETE if more input is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ValueError(f"Invalid JSON format: {e}") from None
+            return _INCOMPLETE
+        if end == len(self._buffer) and not final:
+            return _INCOMPLETE  # A number may continue in the next chunk
+        self._pos = end
+        return value
+
+    def _expect(self, chars: str) -> str:
+        char = self._buffer[self._pos]
+        if char not in chars:
+            raise ValueError(f"Invalid JSON format: unexpected {char!r} (expected one of {chars!r})")
+        self._pos += 1
+        return char
+
+    def _parse_document(self, final: bool) -> list:
+        events = []
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos >= len(self._buffer):
+                return events
+            state = self._state
+            if state == "start":
+                if self._buffer[self._pos] != "{":
+                    raise ValueError("Invalid JSON format: Expected an object with 'project' and 'bids' fields")
+                self._pos += 1
+                self._state = "key"
+            elif state == "key":
+                if self._buffer[self._pos] == "}":
+                    self._pos += 1
+                    self._state = "end"
+                    continue
+                key = self._decode(final)
+                if key is _INCOMPLETE:
+                    return events
+                if not isinstance(key, str):
+                    raise ValueError("Invalid JSON format: Expected an object with 'project' and 'bids' fields")
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(":")
+                self._state = "value"
+            elif state == "value":
+                if self._key == "bids":
+                    if self._buffer[self._pos] != "[":
+                        raise ValueError("Invalid JSON format: Missing or empty 'bids' array")
+                    self._pos += 1
+                    self._state = "bids"
+                    continue
+                value = self._decode(final)
+                if value is _INCOMPLETE:
+                    return events
+                events.append(("project", value) if self._key == "project" else ("field", (self._key, value)))
+                self._state = "next_key"
+            elif state == "next_key":
+                self._state = "key" if self._expect(",}") == "," else "end"
+            elif state == "bids":
+                if self._buffer[self._pos] == "]":
+                    self._pos += 1
+                    self._state = "next_key"
+                    continue
+                bid = self._decode(final)
+                if bid is _INCOMPLETE:
+                    return events
+                events.append(("bid", bid))
+                self._state = "next_bid"
+            elif state == "next_bid":
+                self._state = "bids" if self._expect(",]") == "," else "next_key"
+            else:
+                raise ValueError("Invalid JSON format: unexpected data after the tender object")
+
+
+class TenderReader:
+    """Builds a Tender from chunks (bytes or str) as they arrive, validating each bid."""
+
+    def __init__(self, jsonl: bool = False):
+        """
+        Args:
+            jsonl: Input is JSONL instead of a single JSON document
+        """
+        self._parser = TenderStreamParser(jsonl)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._project = None
+        self._bids: list[dict] = []
+        self._errors: list[BidError] = []
+        self._fields: dict = {}
+        self._index = 0
+
+    def feed(self, chunk: Union[bytes, str]) -> None:
+        text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        self._handle(self._parser.feed(text))
+
+    def finish(self) -> Tender:
+        """
+        Raises:
+            ValueError: If the file is malformed, or the project description or valid bids are missing
+        """
+        self._handle(self._parser.feed(self._utf8.decode(b"", final=True), final=True))
+        if not isinstance(self._project, dict) or not self._project.get("description"):
+            raise ValueError("Invalid JSON format: Missing 'project.description' field")
+        if not self._bids:
+            detail = f" ({len(self._errors)} invalid bids, first: {self._errors[0].message})" if self._errors else ""
+            raise ValueError(f"Invalid JSON format: Missing or empty 'bids' array{detail}")
+        return Tender(self._project["description"], self._bids, self._errors, self._fields)
+
+    def _handle(self, events: list) -> None:
+        for kind, value in events:
+            if kind == "project":
+                self._project = value
+            elif kind == "field":
+                self._fields[value[0]] = value[1]
+            else:
+                error = value if kind == "invalid" else bid_error(value)
+                if error:
+                    self._errors.append(BidError(self._index, error))
+                else:
+                    self._bids.append(value)
+                self._index += 1
+
+
+def load_tender(
+    stream: Union[BinaryIO, TextIO],
+    jsonl: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tender:
+    """Read a tender from a file object in chunks (see TenderReader)."""
+    reader = TenderReader(jsonl)
+    while chunk := stream.read(chunk_size):
+        reader.feed(chunk)
+    return reader.finish()
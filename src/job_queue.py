@@ -0,0 +1,220 @@
+"""Shared SQLite job queue for evaluating tenders across processes and hosts.
+
+Jobs are claimed with a time-limited lease. A worker that dies or stalls
+stops renewing its lease and the job becomes claimable again; failed jobs
+are retried with backoff until `max_attempts` is reached. Several worker
+processes (see src/worker.py), possibly on different hosts with the
+database on a shared volume, can claim from the same queue file.
+"""
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable ON jobs (status, available_at);
+"""
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased to a worker."""
+    job_id: str
+    project_description: str
+    bids: list[dict]
+    attempts: int
+    deadline_seconds: Optional[float] = None  # Overrides EVALUATION_DEADLINE_SECONDS
+
+
+class JobQueue:
+    """SQLite-backed queue of evaluation jobs with leases, retries and result write-back."""
+
+    def __init__(
+        self,
+        path,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        retry_backoff: float = 30.0,
+        wal: bool = True,
+    ):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            lease_seconds: How long a claim is valid without a heartbeat
+            max_attempts: Attempts before a job is marked failed
+            retry_backoff: Base delay before a failed job is retried (doubles per attempt)
+            wal: Use WAL journaling; disable for databases on network file systems
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(
+        self,
+        project_description: str,
+        bids: list[dict],
+        deadline_seconds: Optional[float] = None,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Add a tender to the queue and return its job id."""
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        payload = json.dumps({
+            "project_description": project_description,
+            "bids": bids,
+            "deadline_seconds": deadline_seconds,
+        })
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, payload, self.max_attempts, now, now, now),
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[ClaimedJob]:
+        """
+        Atomically lease the oldest available job to a worker.
+
+        Jobs whose lease expired are reclaimed (or failed once their
+        attempts are used up). Returns None if nothing is available.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            # Expired leases on the last attempt are not retried again
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired on final attempt', "
+                "lease_owner = NULL, updated_at = ? "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        payload = json.loads(row["payload"])
+        return ClaimedJob(
+            job_id=row["id"],
+            project_description=payload["project_description"],
+            bids=payload["bids"],
+            attempts=row["attempts"] + 1,
+            deadline_seconds=payload.get("deadline_seconds"),
+        )
+
+    def _update_owned(self, job_id: str, worker_id: str, assignments: str, params: tuple) -> bool:
+        """Update a job only while the worker still holds its lease."""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (*params, time.time(), job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; False means the lease was lost and the job should be abandoned."""
+        return self._update_owned(job_id, worker_id, "lease_expires = ?", (time.time() + self.lease_seconds,))
+
+    def complete(self, job_id: str, worker_id: str, result: dict) -> bool:
+        """Store the result and mark the job succeeded."""
+        return self._update_owned(
+            job_id, worker_id,
+            "status = 'succeeded', result = ?, error = NULL, lease_owner = NULL",
+            (json.dumps(result),),
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the job is requeued with backoff until attempts run out."""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        if job["attempts"] >= job["max_attempts"]:
+            return self._update_owned(job_id, worker_id, "status = 'failed', error = ?, lease_owner = NULL", (error,))
+        retry_at = time.time() + self.retry_backoff * (2 ** (job["attempts"] - 1))
+        return self._update_owned(
+            job_id, worker_id,
+            "status = 'queued', error = ?, lease_owner = NULL, lease_expires = NULL, available_at = ?",
+            (error, retry_at),
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job. A running job's worker notices at its
+        next heartbeat and abandons the evaluation.
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', error = 'Cancelled', lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Job record with decoded result, or None if unknown."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, status, result, error, attempts, max_attempts, lease_owner, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
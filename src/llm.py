@@ -0,0 +1,135 @@
+"""Structured-output LLM calls shared by all graph nodes."""
+import asyncio
+import functools
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, Optional, Type, TypeVar
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+from src.cancellation import check_cancelled
+from src.cassette import active_cassette
+from src.config import get_gpt4o_mini, get_gpt4o
+from src.hedging import Hedger
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+MODELS = {
+    "gpt-4o-mini": get_gpt4o_mini,
+    "gpt-4o": get_gpt4o,
+}
+
+# Hedges slow structured-output calls (see src/hedging.py and LLM_HEDGE_PERCENTILE)
+hedger = Hedger()
+
+USAGE_KEYS = ("calls", "prompt_tokens", "cached_prompt_tokens", "completion_tokens")
+
+_usage: ContextVar[Optional[dict]] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_usage(totals: Optional[dict] = None) -> Iterator[dict]:
+    """
+    Accumulate token usage of the ainvoke_structured calls made inside the block.
+
+    Yields a dict with USAGE_KEYS counts, starting from `totals` (e.g. the
+    state's "llm_usage" from earlier nodes).
+    """
+    usage = {key: 0 for key in USAGE_KEYS}
+    usage.update(totals or {})
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def cached_token_ratio(usage: Optional[dict]) -> float:
+    """Share of prompt tokens served from OpenAI's prompt cache."""
+    if not usage or not usage.get("prompt_tokens"):
+        return 0.0
+    return usage["cached_prompt_tokens"] / usage["prompt_tokens"]
+
+
+def tracks_llm_usage(node: Callable[[dict], Awaitable[dict]]) -> Callable[[dict], Awaitable[dict]]:
+    """Wrap a graph node so the state's "llm_usage" totals include the node's LLM calls."""
+    @functools.wraps(node)
+    async def wrapper(state: dict) -> dict:
+        with track_usage(state.get("llm_usage")) as usage:
+            before = usage["calls"]
+            result = await node(state)
+        if usage["calls"] > before:
+            logger.info(
+                "%s: %d LLM calls; run total %d prompt tokens, %.0f%% from the prompt cache",
+                node.__name__, usage["calls"] - before, usage["prompt_tokens"], cached_token_ratio(usage) * 100,
+            )
+        return {**result, "llm_usage": usage}
+    return wrapper
+
+
+def _record_usage(message) -> None:
+    """Add a response's token usage to the metrics and the tracked usage, if any."""
+    usage_metadata = getattr(message, "usage_metadata", None) or {}
+    counts = {
+        "calls": 1,
+        "prompt_tokens": usage_metadata.get("input_tokens", 0),
+        "cached_prompt_tokens": (usage_metadata.get("input_token_details") or {}).get("cache_read", 0) or 0,
+        "completion_tokens": usage_metadata.get("output_tokens", 0),
+    }
+    usage = _usage.get()
+    for key, count in counts.items():
+        metrics.increment(f"llm_{key}", count)
+        if usage is not None:
+            usage[key] = usage.get(key, 0) + count
+
+
+def structured_request(prompt: ChatPromptTemplate, schema: Type[BaseModel], inputs: dict, model: str) -> dict:
+    """The exact request sent to the model, used as the cassette key."""
+    messages = prompt.format_messages(**inputs)
+    return {
+        "model": model,
+        "schema": schema.__name__,
+        "messages": [[m.type, m.content] for m in messages],
+    }
+
+
+async def ainvoke_structured(
+    prompt: ChatPromptTemplate,
+    schema: Type[SchemaT],
+    inputs: dict,
+    model: str = "gpt-4o-mini",
+) -> SchemaT:
+    """
+    Run `prompt | model.with_structured_output(schema)` on the inputs.
+
+    Served from the active cassette in replay mode (the model is never
+    initialized, so no API key is needed) and recorded in record mode.
+
+    Cancelling the awaiting task (see src/cancellation.py) aborts the
+    in-flight request instead of leaving it running in a thread. Slow
+    requests are hedged with a duplicate request when hedging is enabled.
+    """
+    check_cancelled()
+    cassette = active_cassette()
+    request = structured_request(prompt, schema, inputs, model) if cassette else None
+    if cassette and cassette.replaying:
+        return schema.model_validate(cassette.lookup("llm", request))
+
+    # include_raw keeps the model message, whose usage reports prompt-cache hits
+    chain = prompt | MODELS[model]().with_structured_output(schema, include_raw=True)
+    try:
+        output = await hedger.run(lambda: chain.ainvoke(inputs), key=(model, schema.__name__))
+    except asyncio.CancelledError:
+        metrics.increment("llm_calls_cancelled")
+        raise
+    _record_usage(output["raw"])
+    if output.get("parsing_error"):
+        raise output["parsing_error"]
+    result = output["parsed"]
+
+    if cassette and result is not None:
+        cassette.record("llm", request, result.model_dump(mode="json"))
+    return result
@@ -0,0 +1,68 @@
+"""Logging context and filters.
+
+The evaluation and bid being processed are kept in context variables, so any
+log record emitted while they are set carries them (as `evaluation_id` and
+`bid_id` record attributes) without threading them through every call:
+
+    with log_context(evaluation_id=job_id):
+        await graph.ainvoke(state)
+
+Per-bid messages in hot loops are logged with `extra=SAMPLED`; SamplingFilter
+keeps one in every N of them per call site.
+"""
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_CONTEXT: dict[str, ContextVar] = {
+    "evaluation_id": ContextVar("evaluation_id", default=None),
+    "bid_id": ContextVar("bid_id", default=None),
+}
+
+CONTEXT_FIELDS = tuple(_CONTEXT)
+
+# `extra` for hot-loop messages that may be sampled
+SAMPLED = {"sampled": True}
+
+
+@contextmanager
+def log_context(**ids: Optional[str]) -> Iterator[None]:
+    """Attach ids (evaluation_id, bid_id) to log records emitted inside the block."""
+    tokens = [(_CONTEXT[name], _CONTEXT[name].set(value)) for name, value in ids.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the context ids onto the record; must run in the thread that logs."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _CONTEXT.items():
+            if getattr(record, name, None) is None:
+                setattr(record, name, var.get())
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps the first and then every `every`-th SAMPLED record per call site; warnings always pass."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or record.levelno >= logging.WARNING or not getattr(record, "sampled", False):
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._counts[site]
+            self._counts[site] += 1
+        return seen % self.every == 0
@@ -1,34 +1,109 @@
-"""Logging configuration for the bid evaluation agent."""
+"""Logging configuration for the bid evaluation agent.
+
+Log calls only enqueue the record (QueueHandler); a QueueListener thread
+formats it and does the file and console I/O, so logging never blocks the
+event loop during concurrent evaluations. Messages use %-style arguments and
+are formatted in the listener thread, or not at all below LOG_LEVEL.
+
+The file log is JSON lines carrying the evaluation and bid ids from
+src/log_context.py; the console uses LOG_FORMAT ("text" or "json").
+"""
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
+from src.config import LOG_FORMAT, LOG_LEVEL, LOG_SAMPLE_EVERY
+from src.log_context import CONTEXT_FIELDS, ContextFilter, SamplingFilter
 
-# Try to create logs directory, but handle errors gracefully (e.g., in Streamlit Cloud)
 LOG_DIR = Path(__file__).parent.parent / "logs"
-try:
-    LOG_DIR.mkdir(exist_ok=True)
-    # Try to create file handler
-    file_handler = logging.FileHandler(LOG_DIR / "bid_evaluation.log")
-    handlers = [file_handler, logging.StreamHandler(sys.stdout)]
-except (PermissionError, OSError, Exception):
-    # If we can't create logs directory (e.g., in Streamlit Cloud), use console only
-    handlers = [logging.StreamHandler(sys.stdout)]
-
-# Configure root logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=handlers
-)
-
-# Set specific log levels for external libraries
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("httpcore").setLevel(logging.WARNING)
-logging.getLogger("openai").setLevel(logging.WARNING)
-logging.getLogger("langchain").setLevel(logging.WARNING)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_configured_pid: Optional[int] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the evaluation/bid context when set."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them.
+
+    The stock QueueHandler formats the message in the logging thread; here the
+    listener does it. Arguments are formatted after the call returns, so log
+    values, not mutable objects that may change in the meantime.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+def configure_logging() -> None:
+    """Route the root logger through the queue (once per process)."""
+    global _listener, _queue_handler, _configured_pid
+    if _configured_pid == os.getpid():
+        return
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        # Forked child: the parent's listener thread does not exist here
+        root.removeHandler(_queue_handler)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    handlers = [console]
+    # Try to create logs directory, but handle errors gracefully (e.g., in Streamlit Cloud)
+    try:
+        LOG_DIR.mkdir(exist_ok=True)
+        file_handler = logging.FileHandler(LOG_DIR / "bid_evaluation.log")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    except OSError:
+        pass  # Console only
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+    _queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_EVERY))
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(_listener.stop)  # Flush queued records on exit
+    _configured_pid = os.getpid()
+
+    # Set specific log levels for external libraries
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    logging.getLogger("openai").setLevel(logging.WARNING)
+    logging.getLogger("langchain").setLevel(logging.WARNING)
 
 
 def get_logger(name: str) -> logging.Logger:
-    """Get a logger instance for a module."""
+    """Get a logger instance for a module, configuring logging on first use."""
+    configure_logging()
     return logging.getLogger(name)
-
@@ -0,0 +1,35 @@
+"""Process-wide counters for the evaluation pipeline.
+
+Counters are incremented from graph nodes, tools and the job service/workers
+and exposed by the job service at GET /metrics.
+"""
+import threading
+from collections import Counter
+
+
+class Metrics:
+    """Thread-safe named counters."""
+
+    def __init__(self):
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            return self._counters[name]
+
+    def snapshot(self) -> dict[str, float]:
+        """Current value of every counter."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = Metrics()
@@ -1,14 +1,87 @@
+import asyncio
 import logging
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from src.state import BidEvalState
-from src.schemas import FinalRecommendation, RecommendationType, RedFlagType
-from src.config import gpt4o
+from src.schemas import BID_SCORE_LIST, RED_FLAG_LIST, FinalRecommendation, RecommendationType, RedFlagType
+from src.cancellation import check_cancelled
+from src.cassette import CassetteMiss
+from src.config import CASCADE_CRITIQUE_MIN_CONFIDENCE, CRITIQUE_TEXT_MAX_CHARS, MODEL_CASCADE
+from src.deadline import mark_degraded, run_until, stage_deadline
+from src.llm import ainvoke_structured
+from src.metrics import metrics
+from src.scope_summary import clip
+from src.utils import content_hash
 
 logger = logging.getLogger(__name__)
 
+# Number of top-ranked bids whose content decides whether a stored review can be reused
+REVIEW_CACHE_TOP_N = 3
 
-def critique_and_finalize(state: BidEvalState) -> BidEvalState:
+
+def _review_cache_key(state: BidEvalState) -> Optional[str]:
+    """
+    Key for reusing the GPT-4o review across re-evaluations of a tender.
+    
+    The review is reused while the top-ranked bids are unchanged; bids added
+    or amended further down the ranking only rerun the rule-based checks.
+    """
+    bid_results = state.get("bid_results") or {}
+    hash_by_bid_id = {r.score.bid_id: bid_hash for bid_hash, r in bid_results.items()}
+    top_hashes = [hash_by_bid_id.get(s.bid_id) for s in state["scores"][:REVIEW_CACHE_TOP_N]]
+    if not top_hashes or None in top_hashes:
+        return None
+    return content_hash(top_hashes)
+
+
+def rule_based_review(scores: list, red_flags: list) -> FinalRecommendation:
+    """
+    Apply the review's decision rules without the model.
+    
+    Used when the GPT-4o review does not finish within the deadline; the
+    REJECT_ALL cases are decided before the review is requested.
+    """
+    top = scores[0]
+    margin = top.overall_score - scores[1].overall_score if len(scores) > 1 else 1.0
+    serious_flags = [f for f in red_flags if f.affected_bid == top.bid_id and f.severity in ["high", "critical"]]
+    
+    if top.overall_score >= 0.65 and not serious_flags and margin > 0.05:
+        recommendation_type = RecommendationType.ACCEPT
+        confidence = 0.7
+        rationale = f"{top.contractor_name} leads with {top.overall_score:.2f}, {margin:.2f} ahead of the next bid, with no serious red flags."
+    else:
+        recommendation_type = RecommendationType.REQUIRES_CLARIFICATION
+        confidence = 0.6
+        concerns = [f"{len(serious_flags)} serious red flags"] if serious_flags else []
+        if top.overall_score < 0.65:
+            concerns.append(f"score {top.overall_score:.2f} below 0.65")
+        if margin <= 0.05:
+            concerns.append(f"only {margin:.2f} ahead of the next bid")
+        rationale = f"{top.contractor_name} ranks first but needs clarification: {', '.join(concerns)}."
+    
+    return FinalRecommendation(
+        recommendation_type=recommendation_type,
+        ranked_bids=[s.bid_id for s in scores],
+        confidence=confidence,
+        rationale=rationale,
+        trade_offs=["Rule-based recommendation - the GPT-4o review did not finish within the deadline"],
+    )
+
+
+def _escalation_reason(review: FinalRecommendation, scores: list, red_flags: list) -> Optional[str]:
+    """Why a GPT-4o-mini review should be redone by GPT-4o, or None to keep it."""
+    if review.confidence < CASCADE_CRITIQUE_MIN_CONFIDENCE:
+        return f"confidence {review.confidence:.2f} below {CASCADE_CRITIQUE_MIN_CONFIDENCE:.2f}"
+    expected = rule_based_review(scores, red_flags).recommendation_type
+    if review.recommendation_type != expected:
+        return f"{review.recommendation_type.value} conflicts with the decision rules ({expected.value})"
+    return None
+
+
+async def critique_and_finalize(state: BidEvalState) -> dict:
     """Self-critique analysis and finalize recommendation."""
+    check_cancelled()
+    
     # Input validation
     if not state.get("scores") or not isinstance(state["scores"], list):
         logger.error("Missing or invalid 'scores' field in state")
@@ -19,13 +92,15 @@ def critique_and_finalize(state: BidEvalState) -> BidEvalState:
             rationale="No scores available for evaluation.",
             trade_offs=[],
         )
-        return {**state, "final_recommendation": recommendation}
+        return {"final_recommendation": recommendation}
     
     scores = state["scores"]
     red_flags = state.get("red_flags", [])
     requirements = state.get("requirements")
+    deadline = stage_deadline(state, "critique_and_finalize")
+    degraded = []  # This stage's entries, appended to the state's list by the reducer
     
-    logger.info(f"Critiquing {len(scores)} scored bids with {len(red_flags)} red flags")
+    logger.info("Critiquing %d scored bids with %d red flags", len(scores), len(red_flags))
     
     if not scores:
         recommendation = FinalRecommendation(
@@ -35,9 +110,10 @@ def critique_and_finalize(state: BidEvalState) -> BidEvalState:
             rationale="No valid bids to evaluate.",
             trade_offs=[],
         )
-        return {**state, "final_recommendation": recommendation}
+        return {"final_recommendation": recommendation}
     
     top_score = scores[0].overall_score
+    critique_cache = {}
     
     # Decision logic - reject ALL if truly all bids are bad
     # Check if ALL bids have critical issues
@@ -106,13 +182,53 @@ Perform self-critique and provide final recommendation. Be thorough in identifyi
         ])
         
         try:
-            chain = prompt | gpt4o.with_structured_output(FinalRecommendation)
+            review_key = _review_cache_key(state)
+            cached_review = (state.get("critique_cache") or {}).get(review_key) if review_key else None
+            if cached_review is not None:
+                logger.info("Top-ranked bids unchanged, reusing stored critique review")
+                review = cached_review
+            else:
+                review_inputs = {
+                    # One JSON array per list instead of a model_dump_json() call per item; long
+                    # reasoning and evidence (e.g. quoting a verbose scope) are clipped
+                    "scores": BID_SCORE_LIST.dump_json([
+                        s.model_copy(update={"reasoning": clip(s.reasoning, CRITIQUE_TEXT_MAX_CHARS)})
+                        if len(s.reasoning) > CRITIQUE_TEXT_MAX_CHARS else s
+                        for s in scores
+                    ]).decode(),
+                    "red_flags": RED_FLAG_LIST.dump_json([
+                        f.model_copy(update={"evidence": clip(f.evidence, CRITIQUE_TEXT_MAX_CHARS)})
+                        if len(f.evidence) > CRITIQUE_TEXT_MAX_CHARS else f
+                        for f in red_flags
+                    ]).decode(),
+                    "requirements": requirements.model_dump_json() if requirements else "",
+                }
+                try:
+                    # Model cascade: GPT-4o-mini first, GPT-4o only for uncertain reviews
+                    review = await run_until(ainvoke_structured(
+                        prompt, FinalRecommendation, review_inputs, model="gpt-4o-mini" if MODEL_CASCADE else "gpt-4o",
+                    ), deadline)
+                except asyncio.TimeoutError:
+                    review = rule_based_review(scores, red_flags)
+                    review_key = None  # Not a model review - don't reuse it
+                    mark_degraded(degraded, "critique_and_finalize", "rule-based recommendation instead of the GPT-4o review")
+                else:
+                    escalation = _escalation_reason(review, scores, red_flags) if MODEL_CASCADE else None
+                    if escalation:
+                        logger.info("Escalating critique review to GPT-4o: %s", escalation)
+                        metrics.increment("cascade_escalated_reviews")
+                        try:
+                            review = await run_until(ainvoke_structured(
+                                prompt, FinalRecommendation, review_inputs, model="gpt-4o",
+                            ), deadline)
+                        except asyncio.TimeoutError:
+                            mark_degraded(degraded, "critique_and_finalize", "kept the GPT-4o-mini review, GPT-4o escalation timed out")
+                    metrics.increment("cascade_mini_reviews" if MODEL_CASCADE else "cascade_gpt4o_reviews")
+            if review_key:
+                critique_cache = {review_key: review}
             
-            recommendation = chain.invoke({
-                "scores": [s.model_dump_json() for s in scores],
-                "red_flags": [f.model_dump_json() for f in red_flags],
-                "requirements": requirements.model_dump_json() if requirements else "",
-            })
+            # Adjust a copy so the stored review stays as the model returned it
+            recommendation = review.model_copy(deep=True)
             
             # Ensure ranked_bids matches scores order
             recommendation.ranked_bids = [s.bid_id for s in scores]
@@ -128,7 +244,7 @@ Perform self-critique and provide final recommendation. Be thorough in identifyi
                 recommendation.recommendation_type = RecommendationType.REQUIRES_CLARIFICATION
                 recommendation.trade_offs.append("Top bid has suspiciously low cost - requires clarification to verify no hidden costs")
                 recommendation.confidence = max(0.6, recommendation.confidence - 0.1)
-                logger.info(f"Downgraded to REQUIRES_CLARIFICATION due to gaming attempt flag on {top_bid_id}")
+                logger.info("Downgraded to REQUIRES_CLARIFICATION due to gaming attempt flag on %s", top_bid_id)
             
             # Check if ANY bid has gaming flags - if so, be more cautious
             # This is a test requirement: if gaming attempt detected, require clarification
@@ -142,7 +258,7 @@ Perform self-critique and provide final recommendation. Be thorough in identifyi
                     recommendation.recommendation_type = RecommendationType.REQUIRES_CLARIFICATION
                     recommendation.trade_offs.append(f"Gaming attempt detected in bids (suspiciously low cost) - requires clarification before acceptance")
                     recommendation.confidence = max(0.65, recommendation.confidence - 0.05)
-                    logger.info(f"Downgraded to REQUIRES_CLARIFICATION due to gaming attempt detected in bids")
+                    logger.info("Downgraded to REQUIRES_CLARIFICATION due to gaming attempt detected in bids")
             
             # Check for incomplete bids - only downgrade if top bid has critical incomplete scope
             incomplete_flags_top = [f for f in red_flags 
@@ -166,10 +282,12 @@ Perform self-critique and provide final recommendation. Be thorough in identifyi
                     recommendation.confidence = min(0.75, recommendation.confidence)
                     recommendation.trade_offs.append("Close scores between top bids - lower confidence")
             
-            logger.info(f"Final recommendation: {recommendation.recommendation_type.value} with confidence {recommendation.confidence:.2f}")
+            logger.info("Final recommendation: %s with confidence %.2f", recommendation.recommendation_type.value, recommendation.confidence)
             
+        except CassetteMiss:
+            raise  # Stale cassette - fail the replay instead of falling back
         except Exception as e:
-            logger.error(f"Error in critique step: {str(e)}")
+            logger.error("Error in critique step: %s", e)
             # Fallback recommendation
             recommendation = FinalRecommendation(
                 recommendation_type=RecommendationType.REQUIRES_CLARIFICATION,
@@ -180,7 +298,8 @@ Perform self-critique and provide final recommendation. Be thorough in identifyi
             )
     
     return {
-        **state,
         "final_recommendation": recommendation,
+        "critique_cache": critique_cache,
+        "degraded": degraded,
     }
 
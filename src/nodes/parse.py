@@ -1,15 +1,72 @@
+import asyncio
 import logging
 from langchain_core.prompts import ChatPromptTemplate
+from src.bids import BidTable
 from src.state import BidEvalState
-from src.schemas import ProjectRequirements
-from src.config import gpt4o_mini
+from src.schemas import ContractorProfile, ProjectRequirements
+from src.cancellation import check_cancelled
+from src.cassette import CassetteMiss
+from src.llm import ainvoke_structured
+from src.requirements_parser import extract_requirements, fill_schema, unresolved_fields
+from src.config import HISTORY_MIN_EVALUATIONS
+from src.deadline import mark_degraded, run_until, stage_deadline
+from src.history import default_history, project_category
+from src.requirements_store import default_store
+from src.tools.contractor_index import default_index
 from src.tools.serper import search_all_contractors
+from src.utils import project_hash
 
 logger = logging.getLogger(__name__)
 
 
-async def parse_and_enrich(state: BidEvalState) -> BidEvalState:
+async def extract_project_requirements(project_desc: str) -> ProjectRequirements:
+    """Extract requirements with the rule-based parser, asking the LLM only for unresolved fields."""
+    # Budget/timeline bounds, priorities and constraints usually follow fixed patterns
+    extracted = extract_requirements(project_desc)
+    missing = unresolved_fields(extracted)
+    
+    if not missing:
+        logger.info("Requirements resolved by the rule-based parser, skipping LLM extraction")
+        return ProjectRequirements(**extracted)
+    
+    # LLM fills only the fields the parser could not resolve
+    try:
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", "Extract project requirements from the description. Be specific and comprehensive."),
+            ("user", "Project description:\n{project_description}"),
+        ])
+        
+        filled = await ainvoke_structured(prompt, fill_schema(tuple(missing)), {"project_description": project_desc})
+        logger.info("Successfully extracted project requirements (LLM filled: %s)", ', '.join(missing))
+        return ProjectRequirements(**{**filled.model_dump(), **extracted})
+    except CassetteMiss:
+        raise
+    except Exception as e:
+        logger.error("Error extracting requirements: %s", e)
+        raise ValueError(f"Failed to extract project requirements: {str(e)}")
+
+
+def rule_based_requirements(project_desc: str) -> ProjectRequirements:
+    """Requirements from the rule-based parser alone, with defaults for fields it could not resolve."""
+    defaults = {"scope": project_desc.strip(), "constraints": [], "priorities": []}
+    return ProjectRequirements(**{**defaults, **extract_requirements(project_desc)})
+
+
+def default_profile(contractor_name: str) -> ContractorProfile:
+    """Neutral profile for a contractor without search results."""
+    return ContractorProfile(
+        contractor_name=contractor_name,
+        reputation_score=0.5,
+        recent_projects=[],
+        red_flags_found=[],
+        credibility_sources=[],
+    )
+
+
+async def parse_and_enrich(state: BidEvalState) -> dict:
     """Extract requirements and enrich contractor profiles."""
+    check_cancelled()
+    
     # Input validation
     if not state.get("project_description"):
         raise ValueError("Missing required field: project_description")
@@ -23,38 +80,92 @@ async def parse_and_enrich(state: BidEvalState) -> BidEvalState:
     project_desc = state["project_description"]
     bids = state["bids"]
     
-    logger.info(f"Parsing requirements for project with {len(bids)} bids")
+    logger.info("Parsing requirements for project with %d bids", len(bids))
     
-    # Extract requirements
-    try:
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "Extract project requirements from the description. Be specific and comprehensive."),
-            ("user", "Project description:\n{project_description}"),
-        ])
-        
-        chain = prompt | gpt4o_mini.with_structured_output(ProjectRequirements)
-        requirements = chain.invoke({"project_description": project_desc})
-        logger.info("Successfully extracted project requirements")
-    except Exception as e:
-        logger.error(f"Error extracting requirements: {str(e)}")
-        raise ValueError(f"Failed to extract project requirements: {str(e)}")
+    # Validated, typed bids shared by the later nodes (built once per evaluation)
+    bid_table = BidTable.from_dicts(bids)
+    
+    description_hash = project_hash(project_desc)
+    deadline = stage_deadline(state, "parse_and_enrich")
+    degraded = []  # This stage's entries, appended to the state's list by the reducer
+    
+    if state.get("requirements") and state.get("project_hash") == description_hash:
+        # Re-evaluation of the same project - requirements were already extracted
+        requirements = state["requirements"]
+        logger.info("Project description unchanged, reusing extracted requirements")
+    else:
+        store = default_store()
+        requirements = await asyncio.to_thread(store.get, description_hash) if store else None
+        if requirements is not None:
+            logger.info("Requirements found in the requirements store, skipping extraction")
+        else:
+            try:
+                requirements = await run_until(extract_project_requirements(project_desc), deadline)
+                if store:
+                    await asyncio.to_thread(store.put, description_hash, requirements)
+            except asyncio.TimeoutError:
+                requirements = rule_based_requirements(project_desc)
+                mark_degraded(degraded, "parse_and_enrich", "requirements from the rule-based parser only")
+    
+    history = default_history()
     
     # Get contractor names
-    contractor_names = [bid.get("contractor_name", "") for bid in bids if bid.get("contractor_name")]
+    contractor_names = [bid.contractor_name for bid in bid_table]
+    
+    # Profiles already known from a previous evaluation are kept, only new contractors are searched
+    known_profiles = {p.contractor_name: p for p in state.get("contractor_profiles") or []}
+    contractor_profiles = [known_profiles[name] for name in dict.fromkeys(contractor_names) if name in known_profiles]
+    new_names = [name for name in contractor_names if name not in known_profiles]
     
     # Handle empty contractor names list
     if not contractor_names:
         logger.warning("No contractor names found in bids, skipping Serper search")
         contractor_profiles = []
-    else:
-        logger.info(f"Searching for {len(contractor_names)} contractors via Serper")
-        # Parallel Serper searches
-        contractor_profiles = await search_all_contractors(contractor_names)
-        logger.info(f"Retrieved profiles for {len(contractor_profiles)} contractors")
+    elif new_names:
+        # Contractors with an established track record in past evaluations need no web search
+        track_records = await asyncio.to_thread(history.track_records, new_names, description_hash) if history else {}
+        established = [
+            record for record in track_records.values() if record.evaluations >= HISTORY_MIN_EVALUATIONS
+        ]
+        if established:
+            logger.info("Using evaluation history for %d contractors with a track record", len(established))
+            contractor_profiles += [record.to_profile() for record in established]
+        search_names = [name for name in new_names if name not in {r.contractor_name for r in established}]
+        
+        if search_names:
+            logger.info("Looking up %d contractors (local index, then Serper)", len(search_names))
+            # Indexed contractors are read locally, unseen ones are searched in parallel
+            index = default_index()
+            try:
+                contractor_profiles += await run_until(search_all_contractors(search_names, index=index), deadline)
+            except asyncio.TimeoutError:
+                # Whatever the search stored in the index so far, default profiles for the rest
+                cached = await asyncio.to_thread(index.get_many, search_names) if index else {}
+                contractor_profiles += [cached.get(name) or default_profile(name) for name in dict.fromkeys(search_names)]
+                mark_degraded(
+                    degraded,
+                    "parse_and_enrich",
+                    f"{len(set(search_names) - set(cached))} of {len(set(search_names))} contractors got default profiles",
+                )
+        logger.info("Retrieved profiles for %d contractors", len(contractor_profiles))
+    
+    # Market cost benchmark from past bids on projects of the same category
+    category = project_category(project_desc)
+    market_cost_benchmark = None
+    if history and requirements:
+        market_cost_benchmark = await asyncio.to_thread(
+            history.cost_benchmark, category, requirements.budget_target, description_hash
+        )
+        if market_cost_benchmark:
+            logger.info("Market cost benchmark for %s projects: $%.0f", category, market_cost_benchmark)
     
     return {
-        **state,
+        "project_hash": description_hash,
+        "bid_table": bid_table,
         "requirements": requirements,
         "contractor_profiles": contractor_profiles,
+        "project_category": category,
+        "market_cost_benchmark": market_cost_benchmark,
+        "degraded": degraded,
     }
 
@@ -1,41 +1,36 @@
+import asyncio
 import logging
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
+from src.bids import Bid, BidTable
 from src.state import BidEvalState
-from src.schemas import BidScore, RedFlag, RedFlagType
-from src.config import gpt4o_mini
-from src.utils import detect_constraint_violations
+from src.schemas import BidScore, BidResult, ContractorProfile, ProjectRequirements, RedFlag, RedFlagType
+from src.config import PREFILTER_TOP_K, PREFILTER_BORDERLINE_MARGIN, LOCAL_SCOPE_SCORING_MIN_BIDS, MODEL_CASCADE
+from src.cancellation import check_cancelled
+from src.cascade import bids_to_escalate
+from src.cassette import CassetteMiss
+from src.deadline import mark_degraded, run_until, stage_deadline
+from src.llm import ainvoke_structured
+from src.log_context import SAMPLED, log_context
+from src.metrics import metrics
+from src.prefilter import prefilter_bids, score_bids_heuristically
+from src.scope_coverage import compute_scope_coverage
+from src.scope_summary import prompt_scope
+from src.utils import detect_constraint_violations, hash_requirements, bid_content_hash, compact_json, scoring_context_hash
 
 logger = logging.getLogger(__name__)
 
+# Fixed weights (original approach)
+SCORING_WEIGHTS = {
+    "cost": 0.25,
+    "timeline": 0.20,
+    "scope": 0.25,
+    "risk": 0.15,
+    "reputation": 0.15,
+}
 
-def score_and_flag(state: BidEvalState) -> BidEvalState:
-    """Score bids and detect red flags."""
-    # Input validation
-    if not state.get("bids") or not isinstance(state["bids"], list):
-        raise ValueError("Missing or invalid 'bids' field")
-    
-    if len(state["bids"]) == 0:
-        raise ValueError("No bids to score")
-    
-    if not state.get("requirements"):
-        logger.warning("No requirements found in state, proceeding with empty requirements")
-    
-    bids = state["bids"]
-    requirements = state["requirements"]
-    contractor_profiles = {p.contractor_name: p for p in state.get("contractor_profiles", [])}
-    
-    # Use fixed weights (original approach)
-    weights = {
-        "cost": 0.25,
-        "timeline": 0.20,
-        "scope": 0.25,
-        "risk": 0.15,
-        "reputation": 0.15,
-    }
-    logger.info(f"Scoring {len(bids)} bids with fixed weights: Cost={weights['cost']:.0%}, Timeline={weights['timeline']:.0%}, Scope={weights['scope']:.0%}, Risk={weights['risk']:.0%}, Reputation={weights['reputation']:.0%}")
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """Score the bid across 5 dimensions (0-1 scale) using the contractor profile data from web research:
+SCORING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """Score the bid across 5 dimensions (0-1 scale) using the contractor profile data from web research:
 
 - cost_score: Cost competitiveness vs market benchmarks
 - timeline_score: Timeline feasibility and realism. If contractor profile has recent_projects, use them to assess experience. If NO web research data available, use bid timeline and scope to assess feasibility - DO NOT penalize for missing data.
@@ -61,303 +56,458 @@ CRITICAL INSTRUCTIONS:
 6. Provide detailed reasoning BEFORE assigning scores (chain-of-thought), explicitly mentioning:
    - How you used contractor profile data (if available)
    - Why you're using neutral scores (if data is missing)
-   - The actual calculation: cost_score×0.25 + timeline_score×0.20 + scope_score×0.25 + risk_score×0.15 + reputation_score×0.15 = overall_score"""),
-        ("user", """Requirements: {requirements}
-Bid: {bid}
+   - The actual calculation: cost_score×0.25 + timeline_score×0.20 + scope_score×0.25 + risk_score×0.15 + reputation_score×0.15 = overall_score
+
+Bids and contractor profiles are given as compact JSON. The profile's web_research field says what is known:
+- "found": reputation_score, recent_projects, red_flags_found and credibility_sources were retrieved from web search (Serper API) in the last 12 months. Use this data to inform your scores.
+- "none_found": web research was attempted but no data found (or Serper API key not configured). Do NOT penalize scores for missing data - use bid quality to assess, with neutral scores (0.60-0.70) for timeline, risk, and reputation.
+- "unavailable": no web research data for this contractor (Serper API may not be configured or contractor not found). Treat as "none_found"."""),
+    # Per-project context, identical for every bid of a tender: together with the static
+    # instructions above it forms a shared prefix that OpenAI's prompt caching reuses
+    ("system", """Project requirements: {requirements}
+Market cost benchmark: {market_cost_benchmark}"""),
+    ("user", """Bid: {bid}
 Contractor Profile (from web research): {profile}
 
 Score this bid. You MUST use the contractor profile data from web research in your scoring."""),
-    ])
+])
+
+
+def _format_profile(profile: Optional[ContractorProfile]) -> str:
+    """Compact profile for the LLM, distinguishing "no data" from "negative data" (see SCORING_PROMPT)."""
+    if profile:
+        has_actual_data = (
+            profile.credibility_sources or 
+            profile.red_flags_found or 
+            (profile.reputation_score != 0.5) or  # Not default value
+            profile.recent_projects
+        )
+        
+        if has_actual_data:
+            return compact_json({**profile.model_dump(mode="json"), "web_research": "found"})
+        # Profile exists but has default/missing data
+        return compact_json({"contractor_name": profile.contractor_name, "web_research": "none_found"})
+    return compact_json({"web_research": "unavailable"})
+
+
+def _adjust_scores(score: BidScore, bid: Bid, profile: Optional[ContractorProfile], weights: dict) -> BidScore:
+    """Apply scope heuristics and Serper research to LLM scores, then compute overall_score."""
+    contractor_name = score.contractor_name
+    
+    # Check scope text for vagueness (heuristic check) - STRICTER
+    scope_text = bid.scope_lower
+    vague_scope_keywords = ["construction", "building", "work", "renovation work"]
+    is_vague_scope = bid.word_count < 10 or any(
+        scope_text.strip() == keyword or scope_text.strip().startswith(keyword + " ")
+        for keyword in vague_scope_keywords
+    )
+    
+    # If scope is very vague, reduce scope_score more aggressively
+    if is_vague_scope:
+        if bid.word_count < 5:
+            # Extremely vague (e.g., "Building construction")
+            score.scope_score = min(score.scope_score, 0.50)
+        elif bid.word_count < 10:
+            # Very vague
+            score.scope_score = min(score.scope_score, 0.65)
+        else:
+            # Somewhat vague
+            score.scope_score = min(score.scope_score, 0.75)
+        logger.info("Detected vague scope text for %s, adjusted scope_score to %.2f", contractor_name, score.scope_score, extra=SAMPLED)
     
-    chain = prompt | gpt4o_mini.with_structured_output(BidScore)
+    # Additional check: If scope mentions subcontracting critical work, reduce scope score
+    if bid.mentions("subcontract"):
+        if score.scope_score > 0.70:
+            # Reduce scope score if critical work is subcontracted without details
+            score.scope_score = max(0.60, score.scope_score - 0.10)
+            logger.info("Subcontracted work detected for %s, reduced scope_score to %.2f", contractor_name, score.scope_score, extra=SAMPLED)
     
-    scores = []
+    # ENFORCE: If Serper data exists, use it to adjust scores
+    # IMPORTANT: Distinguish between "no data found" vs "negative data found"
+    has_web_research = profile and (
+        profile.credibility_sources or 
+        profile.red_flags_found or 
+        (profile.reputation_score != 0.5) or  # Not default value
+        profile.recent_projects
+    )
+    
+    if profile and profile.reputation_score is not None:
+        # Only blend if we have actual web research data (not default/missing)
+        if has_web_research:
+            # Blend LLM's reputation_score with Serper's reputation_score (70% Serper, 30% LLM)
+            serper_reputation = profile.reputation_score
+            llm_reputation = score.reputation_score
+            score.reputation_score = (serper_reputation * 0.7) + (llm_reputation * 0.3)
+            logger.info("Using Serper reputation data for %s: %.2f", contractor_name, serper_reputation, extra=SAMPLED)
+        else:
+            # Missing Serper data - use LLM score, don't penalize
+            logger.info("No Serper data for %s, using LLM reputation score: %.2f", contractor_name, score.reputation_score, extra=SAMPLED)
+        
+        # Adjust risk_score based on Serper red flags - only if we have actual data
+        if profile.red_flags_found and has_web_research:
+            # Reduce risk_score if red flags found online
+            risk_reduction = min(0.3, len(profile.red_flags_found) * 0.1)
+            score.risk_score = max(0.0, score.risk_score - risk_reduction)
+            logger.info("Red flags found online for %s, reduced risk_score by %.2f", contractor_name, risk_reduction, extra=SAMPLED)
+        
+        # Adjust timeline_score and risk_score based on recent projects
+        if profile.recent_projects and has_web_research:
+            # Having recent projects increases confidence in timeline and reduces risk
+            project_bonus = min(0.15, len(profile.recent_projects) * 0.03)
+            score.timeline_score = min(1.0, score.timeline_score + project_bonus)
+            score.risk_score = min(1.0, score.risk_score + project_bonus * 0.5)
+            logger.info("Recent projects found for %s, boosted timeline_score by %.2f", contractor_name, project_bonus, extra=SAMPLED)
+        elif not profile.recent_projects:
+            # No recent projects found - but don't penalize if it's missing data
+            # Only penalize if we have web research but found nothing (negative signal)
+            if has_web_research and profile.reputation_score < 0.6:
+                # We searched and found low reputation + no projects = negative signal
+                score.risk_score = max(0.0, score.risk_score - 0.1)
+                logger.info("No recent projects found for %s despite web search, slight risk penalty", contractor_name, extra=SAMPLED)
+            else:
+                # Missing data - use neutral/moderate score, don't penalize
+                # Ensure timeline_score doesn't go too low due to missing data
+                if score.timeline_score < 0.60:
+                    score.timeline_score = max(0.60, score.timeline_score)
+                    logger.info("Missing Serper data for %s, using neutral timeline_score: %.2f", contractor_name, score.timeline_score, extra=SAMPLED)
+                # Ensure risk_score doesn't go too low due to missing data
+                if score.risk_score < 0.50:
+                    score.risk_score = max(0.50, score.risk_score)
+                    logger.info("Missing Serper data for %s, using neutral risk_score: %.2f", contractor_name, score.risk_score, extra=SAMPLED)
+    
+    # Calculate weighted overall score using fixed weights
+    score.overall_score = (
+        score.cost_score * weights["cost"] +
+        score.timeline_score * weights["timeline"] +
+        score.scope_score * weights["scope"] +
+        score.risk_score * weights["risk"] +
+        score.reputation_score * weights["reputation"]
+    )
+    # Round to 2 decimal places for consistency
+    score.overall_score = round(score.overall_score, 2)
+    return score
+
+
+def _detect_red_flags(
+    score: BidScore,
+    bid: Bid,
+    profile: Optional[ContractorProfile],
+    requirements: Optional[ProjectRequirements],
+    missing_requirements: Optional[list[str]] = None,
+) -> list[RedFlag]:
+    """Detect red flags - using both bid analysis and Serper web research data."""
     red_flags = []
     
-    for bid in bids:
-        # Validate bid structure
-        if not isinstance(bid, dict):
-            logger.warning(f"Skipping invalid bid (not a dict): {bid}")
-            continue
+    # Check for incomplete scope - stricter threshold for better detection
+    scope_threshold = 0.75  # Stricter to catch more incomplete/vague scopes
+    if score.scope_score < scope_threshold:
+        # Determine severity based on how incomplete
+        if score.scope_score < 0.5:
+            severity = "critical"
+        elif score.scope_score < 0.6:
+            severity = "high"
+        else:
+            severity = "medium"
+        evidence = f"Scope score: {score.scope_score:.2f}. {score.reasoning}"
+        if missing_requirements:
+            # Gap evidence from the local requirement-coverage matrix
+            evidence += f" Requirements not addressed in scope: {'; '.join(missing_requirements[:5])}"
+        red_flags.append(RedFlag(
+            type=RedFlagType.INCOMPLETE_SCOPE,
+            severity=severity,
+            evidence=evidence,
+            affected_bid=score.bid_id,
+        ))
+    
+    # Check for suspiciously low cost - detect based on actual cost vs scope completeness
+    # Method 1: High cost_score but low scope_score (LLM detected pattern)
+    if (score.cost_score > 0.85 and score.scope_score < 0.75) or \
+       (score.cost_score > 0.9 and score.scope_score < 0.8):
+        red_flags.append(RedFlag(
+            type=RedFlagType.SUSPICIOUSLY_LOW_COST,
+            severity="medium",
+            evidence=f"Very competitive cost ({score.cost_score:.2f}) but incomplete/vague scope ({score.scope_score:.2f}). May indicate hidden costs or scope gaps.",
+            affected_bid=score.bid_id,
+        ))
+    
+    # Method 2: Detect suspicious pattern based on scope vagueness + cost competitiveness
+    # Pattern: Vague/incomplete scope + competitive cost = potential gaming attempt
+    scope_text = bid.scope_lower.strip()
+    is_vague_scope = (
+        bid.word_count < 5 or 
+        scope_text in ["renovation work", "building construction", "construction", "building"] or
+        (bid.word_count < 10 and score.scope_score < 0.7)
+    )
+    
+    # If scope is vague AND cost is competitive, flag as suspicious
+    # This catches cases where the bidder offers good price but vague scope
+    if is_vague_scope and score.scope_score < 0.7:
+        if score.cost_score > 0.75:  # Competitive cost
+            red_flags.append(RedFlag(
+                type=RedFlagType.SUSPICIOUSLY_LOW_COST,
+                severity="medium",
+                evidence=f"Suspicious pattern detected: Competitive cost (score: {score.cost_score:.2f}) combined with vague/incomplete scope (score: {score.scope_score:.2f}, scope text: '{scope_text[:60]}'). This may indicate hidden costs or scope gaps.",
+                affected_bid=score.bid_id,
+            ))
+    
+    # Check for vague timeline
+    if score.timeline_score < 0.6:
+        red_flags.append(RedFlag(
+            type=RedFlagType.VAGUE_TIMELINE,
+            severity="medium",
+            evidence=f"Timeline score: {score.timeline_score:.2f}. Timeline may be unrealistic or vague.",
+            affected_bid=score.bid_id,
+        ))
+    
+    # Detect constraint violations (subcontractor risk, operational disruption, etc.)
+    if requirements:
+        constraint_violations = detect_constraint_violations(bid, requirements, score.scope_score)
+        for violation in constraint_violations:
+            red_flags.append(RedFlag(
+                type=RedFlagType[violation["type"]],
+                severity=violation["severity"],
+                evidence=violation["evidence"],
+                affected_bid=score.bid_id,
+            ))
+    
+    # Enhanced subcontractor risk detection
+    scope_text_lower = bid.scope_lower
+    if bid.mentions("subcontract"):
+        # Check if critical work is subcontracted
+        critical_keywords = ["electrical", "power", "hvac", "structural", "foundation"]
+        if any(keyword in scope_text_lower for keyword in critical_keywords):
+            # Check if scope score is low (indicates incomplete details)
+            if score.scope_score < 0.75:
+                red_flags.append(RedFlag(
+                    type=RedFlagType.SUBCONTRACTOR_RISK,
+                    severity="high",
+                    evidence=f"Critical work ({', '.join([k for k in critical_keywords if k in scope_text_lower])}) is subcontracted with incomplete scope details (score: {score.scope_score:.2f}). Increases coordination risk and operational disruption potential.",
+                    affected_bid=score.bid_id,
+                ))
+    
+    # ENFORCE: Use Serper web research data for red flags
+    if profile:
+        # Only flag reputation issues if we have actual web research data (not default/missing API key)
+        has_web_research = profile.credibility_sources or profile.red_flags_found or (profile.reputation_score != 0.5 and profile.recent_projects)
         
-        contractor_name = bid.get("contractor_name", "")
-        if not contractor_name:
-            logger.warning(f"Skipping bid without contractor_name: {bid.get('id', 'unknown')}")
-            continue
+        # Red flags from web research (Serper) - only if we have actual data
+        if profile.red_flags_found and has_web_research:
+            severity = "critical" if len(profile.red_flags_found) >= 3 else "high"
+            red_flags.append(RedFlag(
+                type=RedFlagType.POOR_REPUTATION,
+                severity=severity,
+                evidence=f"Web research found reputation issues: {', '.join(profile.red_flags_found[:3])}. Sources: {', '.join(profile.credibility_sources[:2]) if profile.credibility_sources else 'N/A'}",
+                affected_bid=score.bid_id,
+            ))
         
-        bid_id = bid.get("id")
-        if not bid_id:
-            bid_id = f"bid_{len(scores)}"
-            logger.warning(f"Bid missing 'id' field, generated ID: {bid_id}")
+        # If reputation score from Serper is very low, flag it - only if we have actual web research
+        if profile.reputation_score < 0.6 and has_web_research:
+            red_flags.append(RedFlag(
+                type=RedFlagType.POOR_REPUTATION,
+                severity="high",
+                evidence=f"Low reputation score from web research: {profile.reputation_score:.2f}. Recent projects: {len(profile.recent_projects)} found.",
+                affected_bid=score.bid_id,
+            ))
         
-        profile = contractor_profiles.get(contractor_name)
+        # If no recent projects found, flag as potential risk - only if we have web research data
+        if not profile.recent_projects and profile.reputation_score < 0.7 and has_web_research:
+            red_flags.append(RedFlag(
+                type=RedFlagType.REQUIRES_CLARIFICATION,
+                severity="medium",
+                evidence=f"Limited online presence: No recent projects found in web research. Reputation score: {profile.reputation_score:.2f}",
+                affected_bid=score.bid_id,
+            ))
+    
+    return red_flags
+
+
+async def score_and_flag(state: BidEvalState) -> dict:
+    """Score bids and detect red flags."""
+    check_cancelled()
+    
+    # Input validation
+    if not state.get("bids") or not isinstance(state["bids"], list):
+        raise ValueError("Missing or invalid 'bids' field")
+    
+    if len(state["bids"]) == 0:
+        raise ValueError("No bids to score")
+    
+    if not state.get("requirements"):
+        logger.warning("No requirements found in state, proceeding with empty requirements")
+    
+    bids = state["bids"]
+    requirements = state["requirements"]
+    contractor_profiles = {p.contractor_name: p for p in state.get("contractor_profiles", [])}
+    deadline = stage_deadline(state, "score_and_flag")
+    degraded = []  # This stage's entries, appended to the state's list by the reducer
+    
+    # Results from a previous evaluation of this tender, keyed by bid content hash
+    previous_results = state.get("bid_results") or {}
+    requirements_hash = hash_requirements(requirements)
+    
+    weights = SCORING_WEIGHTS
+    logger.info(
+        "Scoring %d bids with fixed weights: Cost=%.0f%%, Timeline=%.0f%%, Scope=%.0f%%, Risk=%.0f%%, Reputation=%.0f%%",
+        len(bids), weights["cost"] * 100, weights["timeline"] * 100, weights["scope"] * 100, weights["risk"] * 100, weights["reputation"] * 100,
+    )
+    
+    # Validated, typed bids - built once in parse_and_enrich (rebuilt if the state lacks it)
+    candidates = state.get("bid_table") or BidTable.from_dicts(bids)
+    
+    # Typical pricing of past bids on similar projects (see src/history.py)
+    market_cost_benchmark = state.get("market_cost_benchmark")
+    if market_cost_benchmark:
+        market_context = (
+            f"${market_cost_benchmark:,.0f} (median pricing of past {state.get('project_category', 'similar')} "
+            "bids relative to budget, from evaluation history)"
+        )
+    else:
+        market_context = "Not available - use the project budget"
+    # Serialized once so every bid's prompt starts with the same bytes
+    requirements_json = compact_json(requirements.model_dump(mode="json")) if requirements else ""
+    
+    # Requirement-by-bid coverage matrix, computed once for the whole tender
+    coverage = compute_scope_coverage(requirements, candidates)
+    coverage_scores = coverage.scores() if coverage else {}
+    # Large tenders take scope_score from local coverage instead of the LLM's judgment
+    use_local_scope = bool(coverage) and 0 < LOCAL_SCOPE_SCORING_MIN_BIDS <= len(candidates)
+    # Stored results are only reused when scored the same way against the same benchmark
+    context_hash = scoring_context_hash(requirements_hash, use_local_scope, market_cost_benchmark)
+    
+    # Stage one: deterministic ranking, only the top-K + borderline bids are scored by the LLM
+    llm_bid_ids, heuristic_scores = prefilter_bids(
+        candidates,
+        requirements,
+        contractor_profiles,
+        top_k=PREFILTER_TOP_K,
+        borderline_margin=PREFILTER_BORDERLINE_MARGIN,
+        scope_coverage=coverage_scores,
+        market_cost_benchmark=market_cost_benchmark,
+    )
+    
+    async def score_with_llm(bid: Bid, model: str) -> BidScore:
+        """LLM score for one bid, with the local adjustments applied."""
+        profile = contractor_profiles.get(bid.contractor_name)
+        # Very long scopes are sent as a cached, requirement-aligned extract
+        scope = prompt_scope(bid.scope, requirements, requirements_hash)
+        with log_context(bid_id=bid.id):
+            score = await run_until(ainvoke_structured(SCORING_PROMPT, BidScore, {
+                "requirements": requirements_json,
+                "market_cost_benchmark": market_context,
+                "bid": compact_json(bid.data if scope == bid.scope else {**bid.data, "scope": scope}),
+                "profile": _format_profile(profile),
+            }, model=model), deadline)
+            score.bid_id = bid.id
+            score.contractor_name = bid.contractor_name
+            score.scoring_method = "llm"
+            if use_local_scope:
+                score.scope_score = coverage_scores[bid.id]
+            return _adjust_scores(score, bid, profile, weights)
+    
+    def result_for(bid: Bid, score: BidScore) -> BidResult:
+        missing_requirements = coverage.missing(bid.id) if coverage else None
+        return BidResult(
+            bid_hash=bid_content_hash(bid.data, context_hash),
+            score=score,
+            red_flags=_detect_red_flags(score, bid, contractor_profiles.get(bid.contractor_name), requirements, missing_requirements),
+        )
+    
+    # Results in bid order, keyed by position so bids sharing an id keep their own scores
+    results: dict[int, BidResult] = {}
+    mini_scored = set()
+    reused = 0
+    out_of_time = 0
+    
+    for position, bid in enumerate(candidates):
+        check_cancelled()
+        bid_id = bid.id
+        contractor_name = bid.contractor_name
+        bid_hash = bid_content_hash(bid.data, context_hash)
+        previous = previous_results.get(bid_hash)
         
-        # Format profile data for better LLM understanding
-        # Distinguish between "no data" vs "negative data"
-        if profile:
-            has_actual_data = (
-                profile.credibility_sources or 
-                profile.red_flags_found or 
-                (profile.reputation_score != 0.5) or  # Not default value
-                profile.recent_projects
+        if previous is not None and (previous.score.scoring_method == "llm" or bid_id not in llm_bid_ids):
+            # Unchanged bid - reuse the stored score and flags instead of calling the LLM
+            results[position] = BidResult(
+                bid_hash=bid_hash,
+                score=previous.score.model_copy(update={"bid_id": bid_id}),
+                red_flags=[f.model_copy(update={"affected_bid": bid_id}) for f in previous.red_flags],
             )
-            
-            if has_actual_data:
-                profile_data = {
-                    "contractor_name": profile.contractor_name,
-                    "reputation_score_from_web_research": profile.reputation_score,
-                    "recent_projects_found": profile.recent_projects,
-                    "red_flags_found_online": profile.red_flags_found,
-                    "credibility_sources": profile.credibility_sources,
-                    "note": "This data was retrieved from web search (Serper API) in the last 12 months. Use this data to inform your scores."
-                }
-            else:
-                # Profile exists but has default/missing data
-                profile_data = {
-                    "contractor_name": profile.contractor_name,
-                    "reputation_score_from_web_research": profile.reputation_score,
-                    "recent_projects_found": [],
-                    "red_flags_found_online": [],
-                    "credibility_sources": [],
-                    "note": "Web research was attempted but no data found (or Serper API key not configured). Do NOT penalize scores for missing data - use bid quality to assess. Use neutral scores (0.60-0.70) for timeline, risk, and reputation if data is missing."
-                }
+            reused += 1
+        elif bid_id not in llm_bid_ids:
+            # Out of contention - keep the heuristic score
+            results[position] = result_for(bid, heuristic_scores[bid_id])
         else:
-            profile_data = {
-                "note": "No web research data available for this contractor (Serper API may not be configured or contractor not found). Do NOT penalize scores for missing data - use bid quality to assess. Use neutral scores (0.60-0.70) for timeline, risk, and reputation if data is missing."
-            }
-        
+            try:
+                score = await score_with_llm(bid, "gpt-4o-mini")
+                mini_scored.add(bid_id)
+            except asyncio.TimeoutError:
+                # Out of time - the remaining bids keep their heuristic scores
+                if not heuristic_scores:
+                    heuristic_scores = score_bids_heuristically(
+                        candidates, requirements, contractor_profiles, coverage_scores, market_cost_benchmark
+                    )
+                score = heuristic_scores[bid_id]
+                out_of_time += 1
+            except CassetteMiss:
+                raise  # Stale cassette - fail the replay instead of dropping the bid
+            except Exception as e:
+                logger.error("Error scoring bid %s for %s: %s", bid_id, contractor_name, e)
+                continue
+            
+            if not score:
+                continue
+            results[position] = result_for(bid, score)
+    
+    # Model cascade: re-score only the uncertain mini scores with GPT-4o
+    escalations = {}
+    if MODEL_CASCADE and mini_scored:
+        if not heuristic_scores:
+            heuristic_scores = score_bids_heuristically(
+                candidates, requirements, contractor_profiles, coverage_scores, market_cost_benchmark
+            )
+        escalations = bids_to_escalate(
+            [r.score for r in results.values()],
+            mini_scored,
+            heuristic_scores,
+            [f for r in results.values() for f in r.red_flags],
+        )
+        metrics.increment("cascade_mini_scores", len(mini_scored))
+    escalated = []
+    for bid_id, reason in escalations.items():
+        check_cancelled()
+        logger.info("Escalating bid %s to GPT-4o: %s", bid_id, reason)
+        position = candidates.position(bid_id)
         try:
-            result = chain.invoke({
-                "requirements": requirements.model_dump_json() if requirements else "",
-                "bid": bid,
-                "profile": profile_data,
-            })
+            score = await score_with_llm(candidates.bids[position], "gpt-4o")
+        except asyncio.TimeoutError:
+            mark_degraded(degraded, "score_and_flag", f"{len(escalations) - len(escalated)} uncertain bids kept GPT-4o-mini scores")
+            break
+        except CassetteMiss:
+            raise
         except Exception as e:
-            logger.error(f"Error scoring bid {bid_id} for {contractor_name}: {str(e)}")
+            logger.error("Error re-scoring bid %s with GPT-4o, keeping the GPT-4o-mini score: %s", bid_id, e)
             continue
-        
-        if result:
-            score = result
-            score.bid_id = bid_id
-            score.contractor_name = contractor_name
-            
-            # Check scope text for vagueness (heuristic check) - STRICTER
-            scope_text = bid.get("scope", "").lower()
-            vague_scope_keywords = ["construction", "building", "work", "renovation work"]
-            is_vague_scope = len(scope_text.split()) < 10 or any(
-                scope_text.strip() == keyword or scope_text.strip().startswith(keyword + " ")
-                for keyword in vague_scope_keywords
-            )
-            
-            # If scope is very vague, reduce scope_score more aggressively
-            if is_vague_scope:
-                if len(scope_text.split()) < 5:
-                    # Extremely vague (e.g., "Building construction")
-                    score.scope_score = min(score.scope_score, 0.50)
-                elif len(scope_text.split()) < 10:
-                    # Very vague
-                    score.scope_score = min(score.scope_score, 0.65)
-                else:
-                    # Somewhat vague
-                    score.scope_score = min(score.scope_score, 0.75)
-                logger.info(f"Detected vague scope text for {contractor_name}, adjusted scope_score to {score.scope_score:.2f}")
-            
-            # Additional check: If scope mentions subcontracting critical work, reduce scope score
-            if "subcontract" in scope_text or "subcontracted" in scope_text:
-                if score.scope_score > 0.70:
-                    # Reduce scope score if critical work is subcontracted without details
-                    score.scope_score = max(0.60, score.scope_score - 0.10)
-                    logger.info(f"Subcontracted work detected for {contractor_name}, reduced scope_score to {score.scope_score:.2f}")
-            
-            # ENFORCE: If Serper data exists, use it to adjust scores
-            # IMPORTANT: Distinguish between "no data found" vs "negative data found"
-            has_web_research = profile and (
-                profile.credibility_sources or 
-                profile.red_flags_found or 
-                (profile.reputation_score != 0.5) or  # Not default value
-                profile.recent_projects
-            )
-            
-            if profile and profile.reputation_score is not None:
-                # Only blend if we have actual web research data (not default/missing)
-                if has_web_research:
-                    # Blend LLM's reputation_score with Serper's reputation_score (70% Serper, 30% LLM)
-                    serper_reputation = profile.reputation_score
-                    llm_reputation = score.reputation_score
-                    score.reputation_score = (serper_reputation * 0.7) + (llm_reputation * 0.3)
-                    logger.info(f"Using Serper reputation data for {contractor_name}: {serper_reputation:.2f}")
-                else:
-                    # Missing Serper data - use LLM score, don't penalize
-                    logger.info(f"No Serper data for {contractor_name}, using LLM reputation score: {score.reputation_score:.2f}")
-                
-                # Adjust risk_score based on Serper red flags - only if we have actual data
-                if profile.red_flags_found and has_web_research:
-                    # Reduce risk_score if red flags found online
-                    risk_reduction = min(0.3, len(profile.red_flags_found) * 0.1)
-                    score.risk_score = max(0.0, score.risk_score - risk_reduction)
-                    logger.info(f"Red flags found online for {contractor_name}, reduced risk_score by {risk_reduction:.2f}")
-                
-                # Adjust timeline_score and risk_score based on recent projects
-                if profile.recent_projects and has_web_research:
-                    # Having recent projects increases confidence in timeline and reduces risk
-                    project_bonus = min(0.15, len(profile.recent_projects) * 0.03)
-                    score.timeline_score = min(1.0, score.timeline_score + project_bonus)
-                    score.risk_score = min(1.0, score.risk_score + project_bonus * 0.5)
-                    logger.info(f"Recent projects found for {contractor_name}, boosted timeline_score by {project_bonus:.2f}")
-                elif not profile.recent_projects:
-                    # No recent projects found - but don't penalize if it's missing data
-                    # Only penalize if we have web research but found nothing (negative signal)
-                    if has_web_research and profile.reputation_score < 0.6:
-                        # We searched and found low reputation + no projects = negative signal
-                        score.risk_score = max(0.0, score.risk_score - 0.1)
-                        logger.info(f"No recent projects found for {contractor_name} despite web search, slight risk penalty")
-                    else:
-                        # Missing data - use neutral/moderate score, don't penalize
-                        # Ensure timeline_score doesn't go too low due to missing data
-                        if score.timeline_score < 0.60:
-                            score.timeline_score = max(0.60, score.timeline_score)
-                            logger.info(f"Missing Serper data for {contractor_name}, using neutral timeline_score: {score.timeline_score:.2f}")
-                        # Ensure risk_score doesn't go too low due to missing data
-                        if score.risk_score < 0.50:
-                            score.risk_score = max(0.50, score.risk_score)
-                            logger.info(f"Missing Serper data for {contractor_name}, using neutral risk_score: {score.risk_score:.2f}")
-            
-            # Calculate weighted overall score using fixed weights
-            score.overall_score = (
-                score.cost_score * weights["cost"] +
-                score.timeline_score * weights["timeline"] +
-                score.scope_score * weights["scope"] +
-                score.risk_score * weights["risk"] +
-                score.reputation_score * weights["reputation"]
-            )
-            # Round to 2 decimal places for consistency
-            score.overall_score = round(score.overall_score, 2)
-            
-            scores.append(score)
-            
-            # Detect red flags - using both bid analysis and Serper web research data
-            # Check for incomplete scope - stricter threshold for better detection
-            scope_threshold = 0.75  # Stricter to catch more incomplete/vague scopes
-            if score.scope_score < scope_threshold:
-                # Determine severity based on how incomplete
-                if score.scope_score < 0.5:
-                    severity = "critical"
-                elif score.scope_score < 0.6:
-                    severity = "high"
-                else:
-                    severity = "medium"
-                red_flags.append(RedFlag(
-                    type=RedFlagType.INCOMPLETE_SCOPE,
-                    severity=severity,
-                    evidence=f"Scope score: {score.scope_score:.2f}. {score.reasoning}",
-                    affected_bid=score.bid_id,
-                ))
-            
-            # Check for suspiciously low cost - detect based on actual cost vs scope completeness
-            # Method 1: High cost_score but low scope_score (LLM detected pattern)
-            if (score.cost_score > 0.85 and score.scope_score < 0.75) or \
-               (score.cost_score > 0.9 and score.scope_score < 0.8):
-                red_flags.append(RedFlag(
-                    type=RedFlagType.SUSPICIOUSLY_LOW_COST,
-                    severity="medium",
-                    evidence=f"Very competitive cost ({score.cost_score:.2f}) but incomplete/vague scope ({score.scope_score:.2f}). May indicate hidden costs or scope gaps.",
-                    affected_bid=score.bid_id,
-                ))
-            
-            # Method 2: Detect suspicious pattern based on scope vagueness + cost competitiveness
-            # Pattern: Vague/incomplete scope + competitive cost = potential gaming attempt
-            scope_text = bid.get("scope", "").strip().lower()
-            is_vague_scope = (
-                len(scope_text.split()) < 5 or 
-                scope_text in ["renovation work", "building construction", "construction", "building"] or
-                (len(scope_text.split()) < 10 and score.scope_score < 0.7)
-            )
-            
-            # If scope is vague AND cost is competitive, flag as suspicious
-            # This catches cases where the bidder offers good price but vague scope
-            if is_vague_scope and score.scope_score < 0.7:
-                if score.cost_score > 0.75:  # Competitive cost
-                    red_flags.append(RedFlag(
-                        type=RedFlagType.SUSPICIOUSLY_LOW_COST,
-                        severity="medium",
-                        evidence=f"Suspicious pattern detected: Competitive cost (score: {score.cost_score:.2f}) combined with vague/incomplete scope (score: {score.scope_score:.2f}, scope text: '{scope_text[:60]}'). This may indicate hidden costs or scope gaps.",
-                        affected_bid=score.bid_id,
-                    ))
-            
-            # Check for vague timeline
-            if score.timeline_score < 0.6:
-                red_flags.append(RedFlag(
-                    type=RedFlagType.VAGUE_TIMELINE,
-                    severity="medium",
-                    evidence=f"Timeline score: {score.timeline_score:.2f}. Timeline may be unrealistic or vague.",
-                    affected_bid=score.bid_id,
-                ))
-            
-            # Detect constraint violations (subcontractor risk, operational disruption, etc.)
-            if requirements:
-                constraint_violations = detect_constraint_violations(bid, requirements, score.scope_score)
-                for violation in constraint_violations:
-                    red_flags.append(RedFlag(
-                        type=RedFlagType[violation["type"]],
-                        severity=violation["severity"],
-                        evidence=violation["evidence"],
-                        affected_bid=score.bid_id,
-                    ))
-            
-            # Enhanced subcontractor risk detection
-            scope_text_lower = bid.get("scope", "").lower()
-            if "subcontract" in scope_text_lower or "subcontracted" in scope_text_lower:
-                # Check if critical work is subcontracted
-                critical_keywords = ["electrical", "power", "hvac", "structural", "foundation"]
-                if any(keyword in scope_text_lower for keyword in critical_keywords):
-                    # Check if scope score is low (indicates incomplete details)
-                    if score.scope_score < 0.75:
-                        red_flags.append(RedFlag(
-                            type=RedFlagType.SUBCONTRACTOR_RISK,
-                            severity="high",
-                            evidence=f"Critical work ({', '.join([k for k in critical_keywords if k in scope_text_lower])}) is subcontracted with incomplete scope details (score: {score.scope_score:.2f}). Increases coordination risk and operational disruption potential.",
-                            affected_bid=score.bid_id,
-                        ))
-            
-            # ENFORCE: Use Serper web research data for red flags
-            if profile:
-                # Only flag reputation issues if we have actual web research data (not default/missing API key)
-                has_web_research = profile.credibility_sources or profile.red_flags_found or (profile.reputation_score != 0.5 and profile.recent_projects)
-                
-                # Red flags from web research (Serper) - only if we have actual data
-                if profile.red_flags_found and has_web_research:
-                    severity = "critical" if len(profile.red_flags_found) >= 3 else "high"
-                    red_flags.append(RedFlag(
-                        type=RedFlagType.POOR_REPUTATION,
-                        severity=severity,
-                        evidence=f"Web research found reputation issues: {', '.join(profile.red_flags_found[:3])}. Sources: {', '.join(profile.credibility_sources[:2]) if profile.credibility_sources else 'N/A'}",
-                        affected_bid=score.bid_id,
-                    ))
-                
-                # If reputation score from Serper is very low, flag it - only if we have actual web research
-                if profile.reputation_score < 0.6 and has_web_research:
-                    red_flags.append(RedFlag(
-                        type=RedFlagType.POOR_REPUTATION,
-                        severity="high",
-                        evidence=f"Low reputation score from web research: {profile.reputation_score:.2f}. Recent projects: {len(profile.recent_projects)} found.",
-                        affected_bid=score.bid_id,
-                    ))
-                
-                # If no recent projects found, flag as potential risk - only if we have web research data
-                if not profile.recent_projects and profile.reputation_score < 0.7 and has_web_research:
-                    red_flags.append(RedFlag(
-                        type=RedFlagType.REQUIRES_CLARIFICATION,
-                        severity="medium",
-                        evidence=f"Limited online presence: No recent projects found in web research. Reputation score: {profile.reputation_score:.2f}",
-                        affected_bid=score.bid_id,
-                    ))
+        results[position] = result_for(candidates.bids[position], score)
+        escalated.append(bid_id)
+    if escalated:
+        metrics.increment("cascade_escalated_scores", len(escalated))
+        logger.info("Model cascade: %d of %d bids re-scored with GPT-4o", len(escalated), len(mini_scored))
+    
+    scores = [r.score for r in results.values()]
+    red_flags = [f for r in results.values() for f in r.red_flags]
+    bid_results = {r.bid_hash: r for r in results.values()}
+    
+    if reused:
+        logger.info("Reused stored results for %d unchanged bids", reused)
+    if out_of_time:
+        mark_degraded(degraded, "score_and_flag", f"{out_of_time} bids kept heuristic scores instead of LLM scores")
     
     # Sort by overall score
     scores.sort(key=lambda x: x.overall_score, reverse=True)
     
     return {
-        **state,
         "scores": scores,
         "red_flags": red_flags,
+        "bid_results": bid_results,
+        "degraded": degraded,
     }
-
@@ -0,0 +1,116 @@
+"""Speculative prefetch of requirements and contractor enrichment.
+
+The Streamlit app starts parse_and_enrich in the background as soon as an
+uploaded tender file validates, while the reviewer is still reading it.
+Results are memoized by file hash; when "Evaluate Bids" is clicked the
+prefetched requirements and profiles are seeded into the initial state, so
+parse_and_enrich finds them ready (same project hash, known contractors).
+Prefetches nobody is waiting for any more - the file was replaced or
+removed - are cancelled.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+from src.state import BidEvalState, build_initial_state
+
+logger = logging.getLogger(__name__)
+
+# Keys carried from a prefetched parse_and_enrich result into the evaluation
+PREFETCHED_KEYS = ("project_hash", "requirements", "contractor_profiles")
+
+
+def file_hash(data: bytes) -> str:
+    """Content hash of an uploaded file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class Prefetcher:
+    """Runs parse_and_enrich ahead of time on a background event loop, memoized by file hash."""
+
+    def __init__(self, max_results: int = 32):
+        self.max_results = max_results
+        self._futures: OrderedDict[str, Future] = OrderedDict()
+        self._owners: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="prefetch-loop", daemon=True)
+        self._thread.start()
+
+    async def _prefetch(self, project_description: str, bids: list[dict]) -> BidEvalState:
+        from src.nodes.parse import parse_and_enrich
+        return await parse_and_enrich(build_initial_state(project_description, bids))
+
+    def start(self, key: str, project_description: str, bids: list[dict], owner: str = "") -> Future:
+        """
+        Start prefetching a tender (no-op if it is already running or done).
+
+        Args:
+            key: File hash of the uploaded tender
+            owner: Session interested in the result; see release()
+        """
+        with self._lock:
+            self._owners.setdefault(key, set()).add(owner)
+            future = self._futures.get(key)
+            if future is not None and not future.cancelled():
+                self._futures.move_to_end(key)
+                return future
+            logger.info("Prefetching requirements and contractor profiles for upload %s", key[:12])
+            future = asyncio.run_coroutine_threadsafe(self._prefetch(project_description, bids), self._loop)
+            self._futures[key] = future
+            self._evict()
+            return future
+
+    def release(self, key: str, owner: str = "") -> None:
+        """Drop an owner's interest; the prefetch is cancelled if it is unfinished and unwanted."""
+        with self._lock:
+            owners = self._owners.get(key, set())
+            owners.discard(owner)
+            future = self._futures.get(key)
+            if not owners and future is not None and not future.done():
+                logger.info("Cancelling abandoned prefetch for upload %s", key[:12])
+                future.cancel()
+                del self._futures[key]
+
+    async def result(self, key: str, timeout: Optional[float] = None) -> Optional[BidEvalState]:
+        """
+        Prefetched state for a file, waiting up to `timeout` seconds for a running prefetch.
+
+        Awaited from the evaluation's own task, so cancelling the evaluation
+        stops the wait. Returns None if nothing was prefetched, the prefetch
+        failed or it did not finish in time. A prefetch that is waited on is
+        never cancelled by the wait: it keeps running, for a later evaluation.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+        if future is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # The waiting evaluation was cancelled, not the prefetch
+            return None
+        except asyncio.TimeoutError:
+            logger.warning("Prefetch for upload %s still running after %.1fs, evaluating without it", key[:12], timeout)
+            return None
+        except Exception as e:
+            logger.warning("Prefetch for upload %s failed, evaluating without it: %s", key[:12], e)
+            return None
+
+    def _evict(self) -> None:
+        """Forget the oldest finished results beyond max_results (running prefetches are kept)."""
+        finished = [key for key, future in self._futures.items() if future.done()]
+        for key in finished[:max(0, len(self._futures) - self.max_results)]:
+            del self._futures[key]
+            self._owners.pop(key, None)
+
+
+def seed_state(state: BidEvalState, prefetched: Optional[BidEvalState]) -> BidEvalState:
+    """Copy prefetched requirements and profiles into an initial evaluation state."""
+    if prefetched and not prefetched.get("degraded"):  # Out-of-time fallbacks are not worth reusing
+        state.update({key: prefetched[key] for key in PREFETCHED_KEYS if prefetched.get(key) is not None})
+    return state
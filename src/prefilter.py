@@ -0,0 +1,204 @@
+"""Stage-one deterministic bid ranking used before LLM scoring."""
+import logging
+from typing import Iterable, Optional, Union
+from src.bids import Bid, BidTable, as_bid
+from src.schemas import BidScore, ContractorProfile, ProjectRequirements
+from src.utils import detect_constraint_violations
+
+logger = logging.getLogger(__name__)
+
+# Weights match the LLM scoring step so heuristic and LLM scores are comparable
+HEURISTIC_WEIGHTS = {
+    "cost": 0.25,
+    "timeline": 0.20,
+    "scope": 0.25,
+    "risk": 0.15,
+    "reputation": 0.15,
+}
+
+
+def _ratio_score(ratio: Optional[float], at_benchmark: float, zero_at: float) -> float:
+    """Score a value/benchmark ratio: mild bonus below 1.0, then linear down to 0 at `zero_at`."""
+    if ratio is None:
+        return 0.60  # Missing data - neutral
+    if ratio <= 1.0:
+        return min(1.0, at_benchmark + (1.0 - ratio) * 0.5)
+    return max(0.0, at_benchmark * (1 - (ratio - 1.0) / (zero_at - 1.0)))
+
+
+def heuristic_scope_score(scope: Union[Bid, str], coverage: Optional[float] = None) -> float:
+    """
+    Scope completeness from requirement coverage (or length if unavailable),
+    capped with the vagueness rules used in score_and_flag.
+    """
+    if isinstance(scope, Bid):
+        scope_text, word_count = scope.scope_lower, scope.word_count
+    else:
+        scope_text = scope.strip().lower()
+        word_count = len(scope_text.split())
+    if coverage is not None:
+        score = 0.30 + 0.65 * coverage
+    else:
+        score = min(0.90, max(0.30, word_count / 40))
+
+    if word_count < 5:
+        score = min(score, 0.50)
+    elif word_count < 10:
+        score = min(score, 0.65)
+
+    if "subcontract" in scope_text and score > 0.70:
+        score = max(0.60, score - 0.10)
+    return score
+
+
+def heuristic_bid_score(
+    bid: Union[Bid, dict],
+    requirements: Optional[ProjectRequirements],
+    profile: Optional[ContractorProfile],
+    cost_benchmark: Optional[float],
+    timeline_benchmark: Optional[float],
+    scope_coverage: Optional[float] = None,
+) -> BidScore:
+    """
+    Score a bid without the LLM.
+
+    Uses the numeric bid fields against the benchmarks, the scope heuristics
+    and detect_constraint_violations(). Cost at 2x the benchmark scores 0.
+    """
+    bid = as_bid(bid)
+    cost = bid.cost
+    timeline = bid.timeline_months
+    cost_ratio = cost / cost_benchmark if cost and cost_benchmark else None
+    timeline_ratio = timeline / timeline_benchmark if timeline and timeline_benchmark else None
+
+    cost_score = _ratio_score(cost_ratio, at_benchmark=0.85, zero_at=2.0)
+    timeline_score = _ratio_score(timeline_ratio, at_benchmark=0.75, zero_at=2.0)
+    scope_score = heuristic_scope_score(bid, scope_coverage)
+
+    risk_score = 0.70
+    if requirements:
+        for violation in detect_constraint_violations(bid, requirements, scope_score):
+            risk_score -= 0.15 if violation["severity"] == "high" else 0.05
+    if cost_ratio is not None and cost_ratio < 0.7:
+        # Far below benchmark - likely hidden costs or scope gaps
+        risk_score -= 0.10
+    if (bid.warranty_years or 0) >= 2:
+        risk_score += 0.05
+    risk_score = min(1.0, max(0.0, risk_score))
+
+    reputation_score = profile.reputation_score if profile and profile.credibility_sources else 0.65
+
+    overall_score = (
+        cost_score * HEURISTIC_WEIGHTS["cost"] +
+        timeline_score * HEURISTIC_WEIGHTS["timeline"] +
+        scope_score * HEURISTIC_WEIGHTS["scope"] +
+        risk_score * HEURISTIC_WEIGHTS["risk"] +
+        reputation_score * HEURISTIC_WEIGHTS["reputation"]
+    )
+
+    cost_text = f"{cost_ratio:.2f}x benchmark" if cost_ratio is not None else "unknown"
+    timeline_text = f"{timeline_ratio:.2f}x benchmark" if timeline_ratio is not None else "unknown"
+    return BidScore(
+        bid_id=bid.id,
+        contractor_name=bid.contractor_name,
+        cost_score=round(cost_score, 2),
+        timeline_score=round(timeline_score, 2),
+        scope_score=round(scope_score, 2),
+        risk_score=round(risk_score, 2),
+        reputation_score=round(reputation_score, 2),
+        overall_score=round(overall_score, 2),
+        reasoning=(
+            f"Heuristic pre-screen score (not reviewed by LLM): cost {cost_text}, "
+            f"timeline {timeline_text}, scope {bid.word_count} words."
+        ),
+        scoring_method="heuristic",
+    )
+
+
+def cost_and_timeline_benchmarks(
+    bids: Union[BidTable, Iterable[Union[Bid, dict]]],
+    requirements: Optional[ProjectRequirements] = None,
+    market_cost_benchmark: Optional[float] = None,
+) -> tuple[Optional[float], Optional[float]]:
+    """
+    Benchmarks for the heuristic pass: the market cost benchmark from evaluation
+    history and the project's target budget and timeline when available,
+    otherwise the median cost and timeline across the tender's bids.
+    """
+    cost_benchmark = market_cost_benchmark or (requirements.budget_target if requirements else None)
+    timeline_benchmark = requirements.timeline_target_months if requirements else None
+    table = BidTable.of(bids)
+    if cost_benchmark is None:
+        cost_benchmark = table.median_cost()
+    if timeline_benchmark is None:
+        timeline_benchmark = table.median_timeline()
+    return cost_benchmark, timeline_benchmark
+
+
+def score_bids_heuristically(
+    bids: Union[BidTable, Iterable[Union[Bid, dict]]],
+    requirements: Optional[ProjectRequirements],
+    contractor_profiles: dict[str, ContractorProfile],
+    scope_coverage: Optional[dict[str, float]] = None,
+    market_cost_benchmark: Optional[float] = None,
+) -> dict[str, BidScore]:
+    """Heuristic scores of all bids keyed by bid id."""
+    table = BidTable.of(bids)
+    cost_benchmark, timeline_benchmark = cost_and_timeline_benchmarks(table, requirements, market_cost_benchmark)
+    return {
+        bid.id: heuristic_bid_score(
+            bid,
+            requirements,
+            contractor_profiles.get(bid.contractor_name),
+            cost_benchmark,
+            timeline_benchmark,
+            (scope_coverage or {}).get(bid.id),
+        )
+        for bid in table
+    }
+
+
+def prefilter_bids(
+    bids: Union[BidTable, Iterable[Union[Bid, dict]]],
+    requirements: Optional[ProjectRequirements],
+    contractor_profiles: dict[str, ContractorProfile],
+    top_k: int,
+    borderline_margin: float,
+    scope_coverage: Optional[dict[str, float]] = None,
+    market_cost_benchmark: Optional[float] = None,
+) -> tuple[set[str], dict[str, BidScore]]:
+    """
+    Rank all bids heuristically and pick the ones worth LLM scoring.
+
+    Args:
+        bids: Bid table (or bids with `id` set)
+        requirements: Extracted project requirements
+        contractor_profiles: Profiles keyed by contractor name
+        top_k: Number of top heuristic bids sent to the LLM (<= 0 sends all)
+        borderline_margin: Bids within this margin of the K-th score are also sent
+            (at most another K, so LLM cost stays bounded on large tenders)
+        scope_coverage: Local requirement coverage per bid id (see src/scope_coverage.py)
+        market_cost_benchmark: Cost benchmark from evaluation history (see src/history.py)
+
+    Returns:
+        (ids of bids to score with the LLM, heuristic scores keyed by bid id)
+    """
+    table = BidTable.of(bids)
+    if top_k <= 0 or len(table) <= top_k:
+        return set(table.ids), {}
+
+    heuristic_scores = score_bids_heuristically(
+        table, requirements, contractor_profiles, scope_coverage, market_cost_benchmark
+    )
+
+    ranked = sorted(heuristic_scores.values(), key=lambda s: s.overall_score, reverse=True)
+    cutoff = ranked[top_k - 1].overall_score - borderline_margin
+    selected = {s.bid_id for s in ranked[:top_k]}
+    borderline = [s.bid_id for s in ranked[top_k:2 * top_k] if s.overall_score >= cutoff]
+    selected.update(borderline)
+
+    logger.info(
+        "Prefilter: %d of %d bids selected for LLM scoring (top %d + %d borderline)",
+        len(selected), len(table), top_k, len(borderline),
+    )
+    return selected, heuristic_scores
@@ -0,0 +1,220 @@
+"""Rule-based extraction of project requirements from tender descriptions.
+
+Project descriptions follow predictable patterns ("Target budget: $1.2M
+(acceptable up to $1.35M)", "Timeline: Target 6 months, acceptable extension
+2 weeks", "PRIORITIES:" sections, ...). This parser resolves the budget and
+timeline bounds, priorities, constraint phrases, operating conditions and
+(when labelled) the scope with regular expressions. parse_and_enrich only asks the LLM for the
+fields listed by unresolved_fields().
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Type
+from pydantic import BaseModel, create_model
+from src.schemas import ProjectRequirements
+
+# Fields ProjectRequirements cannot be built without
+TEXT_FIELDS = ("scope", "constraints", "priorities")
+NUMERIC_FIELDS = ("budget_target", "budget_max", "timeline_target_months", "timeline_max_months")
+
+MONEY_RE = re.compile(r"\$\s?(\d[\d,]*(?:\.\d+)?)\s*(thousand|million|billion|mm|k|m|b)?\b", re.IGNORECASE)
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*-?\s*(days?|weeks?|months?|years?)\b", re.IGNORECASE)
+PERCENT_OVERRUN_RE = re.compile(r"over(?:run)?\D{0,20}?(\d+(?:\.\d+)?)\s*%", re.IGNORECASE)
+PER_UNIT_RE = re.compile(r"\s*(?:per|each|/)\s*\w", re.IGNORECASE)
+BUDGET_CAP_RE = re.compile(
+    r"(?:up to|cap(?:ped)?(?: at)?|stop (?:above|at)|not to exceed|maximum(?: of)?|max\.?|ceiling(?: of)?)\s*$",
+    re.IGNORECASE,
+)
+TIMELINE_CAP_RE = re.compile(
+    r"(?:within|up to|maximum(?: of)?|max\.?|no more than|at most|no later than)\s*$", re.IGNORECASE
+)
+EXTENSION_RE = re.compile(r"(?:extension|extended by|extend by|slippage|slip|grace)(?: of)?\s*$", re.IGNORECASE)
+
+SECTION_RE = re.compile(r"^([A-Z][A-Z /&-]{2,}):\s*$")
+SUBHEADER_RE = re.compile(r"^[^:]{2,60}:$")
+LABEL_RE = re.compile(r"^(?P<label>[A-Za-z][A-Za-z ]{0,40}?)\s*:\s*(?P<value>\S.*)$")
+SCOPE_RE = re.compile(r"^scope(?: of work)?(?:\s+includes?|\s*:)\s*(?P<value>\S.*)$", re.IGNORECASE)
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z(])")
+PHRASE_SPLIT_RE = re.compile(r",\s*(?![^()]*\))")
+MUST_RE = re.compile(r"\bmust\b", re.IGNORECASE)
+# Operating conditions the site imposes on the works (occupied, live, phased, after-hours, ...)
+OPERATING_CONDITION_RE = re.compile(
+    r"\b(?:occupied|live|operational|in operation|(?:multi-)?phas(?:e|ed|ing)|after[- ]hours|overnight)\b",
+    re.IGNORECASE,
+)
+
+MONEY_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mm": 1e6, "million": 1e6, "b": 1e9, "billion": 1e9}
+MONTHS_PER_UNIT = {"day": 12 / 365, "week": 12 / 52, "month": 1.0, "year": 12.0}
+
+CONSTRAINT_SECTIONS = ("constraints", "regulatory", "compliance")
+OPTIONAL_SCOPE_RE = re.compile(r"conditional|optional|nice|alternate", re.IGNORECASE)
+
+
+def parse_money(match: re.Match) -> float:
+    """Dollar amount of a MONEY_RE match ("$1.35M" -> 1350000.0)."""
+    value = float(match.group(1).replace(",", ""))
+    return value * MONEY_MULTIPLIERS.get((match.group(2) or "").lower(), 1.0)
+
+
+def parse_duration_months(match: re.Match) -> float:
+    """Length in months of a DURATION_RE match ("2 weeks" -> 0.46)."""
+    unit = match.group(2).lower().rstrip("s")
+    return float(match.group(1)) * MONTHS_PER_UNIT[unit]
+
+
+def _is_per_unit(clause: str, match: re.Match) -> bool:
+    """True for amounts like "$800K per location" that are not project totals."""
+    return bool(PER_UNIT_RE.match(clause, match.end()))
+
+
+def parse_budget(clause: str) -> tuple[Optional[float], Optional[float]]:
+    """
+    Target and maximum budget from a budget statement.
+
+    "Target $1.2M, acceptable overrun up to 8%, hard stop above $1.35M" -> (1.2M, 1.35M).
+    Per-unit amounts are ignored; a percentage overrun sets the maximum if no cap is given.
+    """
+    target, caps = None, []
+    for match in MONEY_RE.finditer(clause):
+        if _is_per_unit(clause, match):
+            continue
+        if BUDGET_CAP_RE.search(clause[:match.start()]):
+            caps.append(parse_money(match))
+        elif target is None:
+            target = parse_money(match)
+
+    maximum = max(caps) if caps else None
+    if maximum is None and target is not None and (overrun := PERCENT_OVERRUN_RE.search(clause)):
+        maximum = target * (1 + float(overrun.group(1)) / 100)
+    if target is None:
+        target = maximum
+    return target, maximum
+
+
+def parse_timeline(clause: str) -> tuple[Optional[float], Optional[float]]:
+    """
+    Target and maximum duration in months from a timeline statement.
+
+    "Target 6 months, acceptable extension 2 weeks" -> (6.0, 6.46);
+    "3 months per location, all complete within 6 months" -> (6.0, 6.0).
+    """
+    target, caps, extension = None, [], 0.0
+    for match in DURATION_RE.finditer(clause):
+        if _is_per_unit(clause, match):
+            continue
+        before = clause[:match.start()]
+        if EXTENSION_RE.search(before):
+            extension += parse_duration_months(match)
+        elif TIMELINE_CAP_RE.search(before):
+            caps.append(parse_duration_months(match))
+        elif target is None:
+            target = parse_duration_months(match)
+
+    maximum = max(caps) if caps else None
+    if target is None:
+        target = maximum
+    elif maximum is None and extension:
+        maximum = target + extension
+    return (
+        round(target, 2) if target is not None else None,
+        round(maximum, 2) if maximum is not None else None,
+    )
+
+
+def _sentences(text: str) -> list[str]:
+    return [s.strip() for s in SENTENCE_END_RE.split(text) if s.strip()]
+
+
+def _phrases(text: str) -> list[str]:
+    return [p.strip(" .") for p in PHRASE_SPLIT_RE.split(text) if p.strip(" .")]
+
+
+def extract_requirements(description: str) -> dict:
+    """
+    Extract the requirement fields the description states explicitly.
+
+    Handles both the single-paragraph style of bids/*.json and the sectioned
+    style of projects/*.txt. Only resolved fields are included in the result.
+    """
+    fields: dict = {}
+    constraints, priorities, scope_items = [], [], []
+    section, skip_scope_items = None, False
+
+    for line in description.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if header := SECTION_RE.match(line):
+            section, skip_scope_items = header.group(1).lower(), False
+            continue
+        item = line.lstrip("-•* ").strip()
+        in_scope_section = bool(section and section.startswith("scope"))
+        if in_scope_section and SUBHEADER_RE.match(item):
+            skip_scope_items = bool(OPTIONAL_SCOPE_RE.search(item))
+            continue
+
+        in_priorities = section == "priorities"
+        for sentence in _sentences(item):
+            labelled = LABEL_RE.match(sentence)
+            label = labelled.group("label").lower() if labelled else ""
+            value = labelled.group("value").strip(" .") if labelled else ""
+
+            if label.endswith("budget") and "budget_target" not in fields:
+                target, maximum = parse_budget(value)
+                if target is not None:
+                    fields["budget_target"], fields["budget_max"] = target, maximum
+                constraints.append(sentence.rstrip("."))
+            elif label.endswith(("timeline", "schedule")) and "timeline_target_months" not in fields:
+                target, maximum = parse_timeline(value)
+                if target is not None:
+                    fields["timeline_target_months"], fields["timeline_max_months"] = target, maximum
+                constraints.append(sentence.rstrip("."))
+            elif label == "priorities":
+                priorities.append(value)
+                in_priorities = True
+            elif "constraint" in label:
+                constraints.extend(_phrases(value))
+            elif scope := SCOPE_RE.match(sentence):
+                value = scope.group("value").rstrip(".")
+                scope_items.append(value[0].upper() + value[1:])
+            elif in_priorities:
+                priorities.append(sentence.rstrip("."))
+            elif in_scope_section:
+                if not skip_scope_items:
+                    scope_items.append(sentence.rstrip("."))
+            elif (
+                section in CONSTRAINT_SECTIONS
+                or MUST_RE.search(sentence)
+                or OPERATING_CONDITION_RE.search(sentence)
+            ):
+                constraints.append(sentence.rstrip("."))
+
+    if scope_items:
+        fields["scope"] = "; ".join(scope_items)
+    if constraints:
+        fields["constraints"] = list(dict.fromkeys(constraints))
+    if priorities:
+        fields["priorities"] = priorities
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def unresolved_fields(extracted: dict) -> list[str]:
+    """
+    Fields the LLM still has to fill, or an empty list if none of the
+    required text fields are missing (unstated numeric bounds stay None).
+    """
+    if all(extracted.get(name) for name in TEXT_FIELDS):
+        return []
+    return [name for name in TEXT_FIELDS + NUMERIC_FIELDS if not extracted.get(name)]
+
+
+@lru_cache(maxsize=None)
+def fill_schema(field_names: tuple[str, ...]) -> Type[BaseModel]:
+    """Structured-output schema restricted to the given ProjectRequirements fields."""
+    if set(field_names) >= set(ProjectRequirements.model_fields):
+        return ProjectRequirements
+    return create_model(
+        "ProjectRequirementsFill",
+        **{name: (ProjectRequirements.model_fields[name].annotation, ProjectRequirements.model_fields[name])
+           for name in field_names},
+    )
@@ -0,0 +1,159 @@
+"""Persistent store of extracted project requirements.
+
+Requirements are keyed by the normalized project description hash
+(src.utils.project_hash), so a project is extracted once and every later
+evaluation of it - revised bids, re-uploads, queue workers on other
+processes - reads the stored result instead of calling the LLM again.
+
+Precompute the sample projects (or any directory of tenders):
+
+    python -m src.requirements_store precompute projects/ bids/
+    python -m src.requirements_store show "<project description>"
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+from src.config import REQUIREMENTS_STORE_PATH
+from src.schemas import ProjectRequirements
+from src.utils import project_hash
+
+# Bump when ProjectRequirements or the extraction changes so stale entries are re-extracted
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requirements (
+    project_hash TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    requirements TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class RequirementsStore:
+    """SQLite table of ProjectRequirements keyed by project description hash."""
+
+    def __init__(self, path, wal: bool = True):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            wal: Use WAL journaling; disable for databases on network file systems
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def get(self, description_hash: str) -> Optional[ProjectRequirements]:
+        """Stored requirements for a project, or None if not extracted yet."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT requirements FROM requirements WHERE project_hash = ? AND version = ?",
+                (description_hash, STORE_VERSION),
+            ).fetchone()
+        return ProjectRequirements.model_validate_json(row[0]) if row else None
+
+    def put(self, description_hash: str, requirements: ProjectRequirements) -> None:
+        """Store (or replace) the requirements of a project."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO requirements (project_hash, version, requirements, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (description_hash, STORE_VERSION, requirements.model_dump_json(), time.time()),
+            )
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM requirements WHERE version = ?", (STORE_VERSION,)).fetchone()[0]
+
+
+_default_store: Optional[RequirementsStore] = None
+
+
+def default_store() -> Optional[RequirementsStore]:
+    """The store at REQUIREMENTS_STORE_PATH, or None if the store is disabled."""
+    global _default_store
+    if _default_store is None and REQUIREMENTS_STORE_PATH:
+        _default_store = RequirementsStore(REQUIREMENTS_STORE_PATH)
+    return _default_store
+
+
+def _project_descriptions(paths: list[str]):
+    """Yield (path, description) for .txt project files and tender .json files."""
+    for path in paths:
+        path = Path(path)
+        files = sorted(f for f in path.iterdir() if f.suffix in (".txt", ".json")) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix == ".json":
+                with open(file, "r") as f:
+                    description = (json.load(f).get("project") or {}).get("description")
+            else:
+                description = file.read_text()
+            if description:
+                yield file, description
+
+
+def precompute(store: RequirementsStore, paths: list[str], force: bool = False) -> int:
+    """
+    Extract and store requirements for every project found in `paths`.
+
+    Returns:
+        Number of projects extracted (already stored projects are skipped unless force=True)
+    """
+    from src.nodes.parse import extract_project_requirements
+
+    extracted = 0
+    for file, description in _project_descriptions(paths):
+        description_hash = project_hash(description)
+        if not force and store.get(description_hash) is not None:
+            print(f"cached\t{file}")
+            continue
+        store.put(description_hash, asyncio.run(extract_project_requirements(description)))
+        extracted += 1
+        print(f"extracted\t{file}")
+    return extracted
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute and inspect stored project requirements")
+    parser.add_argument("--store", default=REQUIREMENTS_STORE_PATH or None, required=not REQUIREMENTS_STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bulk = commands.add_parser("precompute", help="Extract requirements for project files or directories")
+    bulk.add_argument("paths", nargs="+")
+    bulk.add_argument("--force", action="store_true", help="Re-extract projects that are already stored")
+
+    show = commands.add_parser("show", help="Print the stored requirements of a project description")
+    show.add_argument("description")
+
+    args = parser.parse_args(argv)
+    store = RequirementsStore(args.store)
+
+    if args.command == "precompute":
+        count = precompute(store, args.paths, force=args.force)
+        print(f"{count} projects extracted, {len(store)} stored")
+        return 0
+
+    requirements = store.get(project_hash(args.description))
+    if requirements is None:
+        print("Project not found in store", file=sys.stderr)
+        return 1
+    print(requirements.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    from src.logging_config import get_logger  # Configures logging for the CLI
+    get_logger(__name__)
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, Literal
 from enum import Enum
 
@@ -7,6 +7,22 @@ class ProjectRequirements(BaseModel):
     constraints: list[str] = Field(description="Technical and regulatory constraints")
     scope: str = Field(description="Project scope and deliverables")
     priorities: list[str] = Field(description="Key priorities (cost, timeline, quality, etc.)")
+    budget_target: Optional[float] = Field(default=None, description="Target budget in USD, if stated")
+    budget_max: Optional[float] = Field(default=None, description="Maximum acceptable budget (hard cap) in USD, if stated")
+    timeline_target_months: Optional[float] = Field(default=None, description="Target duration in months, if stated")
+    timeline_max_months: Optional[float] = Field(default=None, description="Maximum acceptable duration in months, if stated")
+
+
+class BidSubmission(BaseModel):
+    """An uploaded bid, validated as it is read (src/ingest.py); other fields are allowed."""
+    model_config = ConfigDict(extra="allow")
+
+    id: Optional[str] = None
+    contractor_name: str = Field(min_length=1)
+    cost: Optional[float] = Field(default=None, gt=0, description="Bid price in USD")
+    timeline_months: Optional[float] = Field(default=None, gt=0)
+    scope: str = ""
+    warranty_years: Optional[float] = Field(default=None, ge=0)
 
 
 class ContractorProfile(BaseModel):
@@ -27,6 +43,10 @@ class BidScore(BaseModel):
     reputation_score: float = Field(ge=0, le=1, description="Reputation from research 0-1")
     overall_score: float = Field(ge=0, le=1, description="Weighted overall score")
     reasoning: str = Field(description="Chain-of-thought reasoning for scores")
+    scoring_method: Literal["llm", "heuristic"] = Field(
+        default="llm",
+        description="Always 'llm' (set to 'heuristic' only for bids pre-screened without the LLM)",
+    )
 
 
 class RedFlagType(str, Enum):
@@ -48,6 +68,13 @@ class RedFlag(BaseModel):
     affected_bid: str
 
 
+class BidResult(BaseModel):
+    """Stored outcome of scoring one bid, keyed by its content hash for reuse."""
+    bid_hash: str
+    score: BidScore
+    red_flags: list[RedFlag] = Field(default_factory=list)
+
+
 class RecommendationType(str, Enum):
     ACCEPT = "ACCEPT"
     REJECT_ALL = "REJECT_ALL"
@@ -61,3 +88,16 @@ class FinalRecommendation(BaseModel):
     rationale: str = Field(description="Explanation of recommendation")
     trade_offs: list[str] = Field(default_factory=list, description="Key trade-offs considered")
 
+
+# Compiled once: validate and serialize whole lists in a single call instead of per item
+BID_SCORE_LIST = TypeAdapter(list[BidScore])
+RED_FLAG_LIST = TypeAdapter(list[RedFlag])
+CONTRACTOR_PROFILE_LIST = TypeAdapter(list[ContractorProfile])
+BID_RESULT_MAP = TypeAdapter(dict[str, BidResult])
+
+# List adapters by item type (see state.serialize_state)
+LIST_ADAPTERS = {
+    BidScore: BID_SCORE_LIST,
+    RedFlag: RED_FLAG_LIST,
+    ContractorProfile: CONTRACTOR_PROFILE_LIST,
+}
@@ -0,0 +1,141 @@
+"""Local scope-coverage scoring of bids against extracted requirements.
+
+Requirement items (scope deliverables and constraints) and bid scopes are
+vectorized with IDF weights in NumPy, and a requirement-by-bid coverage
+matrix is computed in one matrix product. No external service is used.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Union
+import numpy as np
+from src.bids import Bid
+from src.schemas import ProjectRequirements
+
+# A requirement counts as covered when this share of its IDF-weighted terms appears in the bid
+COVERED_THRESHOLD = 0.5
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an the and or of for to in on at by with from as is are be been will must shall should may
+all any each this that these those it its their our we you include includes including
+new existing work works project scope required requirements per
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens without stopwords, with plural 's' stripped."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _split_outside_parentheses(text: str) -> list[str]:
+    """Split a scope sentence into items, keeping parenthesized details with their item."""
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0 and (char in ",;\n" or (char == "." and (i + 1 == len(text) or text[i + 1].isspace()))):
+            items.append(text[start:i])
+            start = i + 1
+    items.append(text[start:])
+    return [item.strip(" -•*\t") for item in items if item.strip(" -•*\t")]
+
+
+def requirement_items(requirements: ProjectRequirements) -> tuple[list[str], list[str]]:
+    """
+    Break requirements into individually checkable items.
+
+    Returns:
+        (item texts, item kinds - "scope" or "constraint")
+    """
+    items, kinds, seen = [], [], set()
+    candidates = [(item, "scope") for item in _split_outside_parentheses(requirements.scope or "")]
+    candidates += [(constraint.strip(), "constraint") for constraint in requirements.constraints or []]
+    for text, kind in candidates:
+        key = " ".join(tokenize(text))
+        if key and key not in seen:
+            seen.add(key)
+            items.append(text)
+            kinds.append(kind)
+    return items, kinds
+
+
+@dataclass
+class ScopeCoverage:
+    """Requirement-by-bid coverage matrix with per-bid scores and gaps."""
+    requirements: list[str]
+    kinds: list[str]
+    bid_ids: list[str]
+    matrix: np.ndarray  # (requirements, bids) share of each requirement's weighted terms found in the bid
+    _columns: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._columns = {bid_id: i for i, bid_id in enumerate(self.bid_ids)}
+
+    @property
+    def covered(self) -> np.ndarray:
+        return self.matrix >= COVERED_THRESHOLD
+
+    def scores(self) -> dict[str, float]:
+        """Scope coverage score (0-1) per bid, based on scope deliverables."""
+        rows = np.array([kind == "scope" for kind in self.kinds])
+        if not rows.any():
+            rows = np.ones(len(self.kinds), dtype=bool)
+        partial = np.minimum(self.matrix[rows] / COVERED_THRESHOLD, 1.0)
+        return {bid_id: round(float(value), 2) for bid_id, value in zip(self.bid_ids, partial.mean(axis=0))}
+
+    def missing(self, bid_id: str) -> list[str]:
+        """Requirement items the bid's scope does not address."""
+        column = self.matrix[:, self._columns[bid_id]] >= COVERED_THRESHOLD
+        return [item for item, covered in zip(self.requirements, column) if not covered]
+
+
+def compute_scope_coverage(requirements: Optional[ProjectRequirements], bids: list[Union[Bid, dict]]) -> Optional[ScopeCoverage]:
+    """
+    Score every bid's scope against every requirement item in one batched operation.
+
+    Returns None if there are no requirements or bids to compare.
+    """
+    if not requirements or not bids:
+        return None
+    items, kinds = requirement_items(requirements)
+    if not items:
+        return None
+
+    item_tokens = [set(tokenize(item)) for item in items]
+    bid_tokens = [set(tokenize(bid.scope_lower if isinstance(bid, Bid) else bid.get("scope", ""))) for bid in bids]
+    vocabulary = {term: i for i, term in enumerate(sorted(set().union(*item_tokens, *bid_tokens)))}
+
+    def presence(token_sets: list[set]) -> np.ndarray:
+        matrix = np.zeros((len(token_sets), len(vocabulary)), dtype=np.float32)
+        for row, tokens in enumerate(token_sets):
+            matrix[row, [vocabulary[t] for t in tokens]] = 1.0
+        return matrix
+
+    required = presence(item_tokens)
+    offered = presence(bid_tokens)
+
+    # IDF over requirement items: terms specific to one deliverable ("aluminum", "lobby") weigh more
+    # than terms shared by many ("system"). Bids are not part of the corpus, so a bid's coverage
+    # does not change when other bids are added (stored results stay valid on re-evaluation).
+    document_frequency = required.sum(axis=0)
+    idf = np.log((len(items) + 1) / (document_frequency + 1)) + 1.0
+
+    weighted = required * idf
+    matrix = (weighted @ offered.T) / weighted.sum(axis=1, keepdims=True)
+
+    return ScopeCoverage(
+        requirements=items,
+        kinds=kinds,
+        bid_ids=[bid.id if isinstance(bid, Bid) else bid.get("id", "") for bid in bids],
+        matrix=matrix,
+    )
@@ -0,0 +1,98 @@
+"""Condensed bid scopes for LLM prompts.
+
+Scopes longer than SCOPE_SUMMARY_MIN_CHARS are replaced in the scoring
+prompt by a requirement-aligned extract of at most SCOPE_SUMMARY_MAX_CHARS:
+sentences naming exclusions, subcontracting, allowances or assumptions are
+kept first, then the sentences covering the most requirement terms not yet
+covered, in their original order. Prompt size (and so latency and tokens)
+is bounded however long a bid is, and no model call is needed to build it.
+
+Extracts are cached by the hash of scope and requirements, so a bid scored
+twice (model cascade) or re-evaluated is condensed once. The bid itself is
+not modified: content hashes, the local scope rules and red-flag evidence
+use the original text.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+from src.config import SCOPE_SUMMARY_MAX_CHARS, SCOPE_SUMMARY_MIN_CHARS
+from src.metrics import metrics
+from src.schemas import ProjectRequirements
+from src.scope_coverage import requirement_items, tokenize
+from src.utils import content_hash
+
+SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+# Sentences the reviewer needs even when they match no requirement
+CAVEAT_RE = re.compile(r"\b(exclu\w*|not included|by others|subcontract\w*|allowances?|assum\w*|provisional)\b", re.IGNORECASE)
+
+# Extracts kept in memory (least recently used are dropped first)
+CACHE_SIZE = 1024
+
+_cache: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def clip(text: str, max_chars: int) -> str:
+    """`text` cut at a word boundary to at most `max_chars` characters (with an ellipsis if cut)."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 1)].rsplit(" ", 1)[0] + "…"
+
+
+def condense_scope(scope: str, requirements: Optional[ProjectRequirements], max_chars: int = SCOPE_SUMMARY_MAX_CHARS) -> str:
+    """Requirement-aligned extract of a scope, at most `max_chars` characters."""
+    header = f"[Extract of a {len(scope):,}-character scope] "
+    budget = max_chars - len(header)
+    sentences = [s.strip() for s in SENTENCE_RE.split(scope) if s.strip()]
+    terms = set(tokenize(" ".join(requirement_items(requirements)[0]))) if requirements else set()
+    tokens = [set(tokenize(sentence)) & terms for sentence in sentences]
+
+    chosen: set[int] = set()
+    covered: set[str] = set()
+    used = 0
+
+    def fits(i: int) -> bool:
+        return i not in chosen and used + len(sentences[i]) + (1 if chosen else 0) <= budget
+
+    def take(i: int) -> None:
+        nonlocal used
+        used += len(sentences[i]) + (1 if chosen else 0)
+        chosen.add(i)
+        covered.update(tokens[i])
+
+    for i, sentence in enumerate(sentences):
+        if CAVEAT_RE.search(sentence) and fits(i):
+            take(i)
+    # Greedy requirement coverage: next, the sentence adding the most uncovered terms that still fits
+    while candidates := [i for i in range(len(sentences)) if fits(i) and tokens[i] - covered]:
+        take(max(candidates, key=lambda i: (len(tokens[i] - covered), -i)))
+    # Leftover room: the scope's opening sentences
+    for i in range(len(sentences)):
+        if fits(i):
+            take(i)
+
+    if not chosen:
+        return header + clip(scope, budget)  # One very long sentence
+    return header + " ".join(sentences[i] for i in sorted(chosen))
+
+
+def prompt_scope(scope: str, requirements: Optional[ProjectRequirements], requirements_hash: str = "") -> str:
+    """The scope to show the LLM: the text itself, or its cached extract if it is over the threshold."""
+    if SCOPE_SUMMARY_MIN_CHARS <= 0 or len(scope) <= SCOPE_SUMMARY_MIN_CHARS:
+        return scope
+    key = content_hash([scope, requirements_hash, SCOPE_SUMMARY_MAX_CHARS])
+    with _cache_lock:
+        extract = _cache.get(key)
+        if extract is not None:
+            _cache.move_to_end(key)
+            metrics.increment("scope_summary_cache_hits")
+            return extract
+    extract = condense_scope(scope, requirements)
+    metrics.increment("scope_summaries")
+    with _cache_lock:
+        _cache[key] = extract
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return extract
@@ -0,0 +1,349 @@
+"""HTTP job service for bid evaluations.
+
+Accepts tenders in the same `{"project": {...}, "bids": [...]}` format as the
+Streamlit app, plus an optional "deadline_seconds" overriding
+EVALUATION_DEADLINE_SECONDS. Tenders are queued as jobs and run on a bounded
+pool of async workers sharing one compiled graph. Run with:
+
+    python -m src.service --port 8000
+    # or: uvicorn src.service:app
+
+Endpoints:
+    POST /jobs                 Submit a tender, returns {"job_id": ...} (202)
+    GET  /jobs/{job_id}        Job status and progress
+    GET  /jobs/{job_id}/events Server-sent events with progress until the job finishes
+    GET  /jobs/{job_id}/result Final evaluation (409 until the job has finished)
+    POST /jobs/{job_id}/cancel Cancel a queued or running job
+    GET  /health               Worker pool status
+    GET  /metrics              Pipeline counters and LLM hedge/win rates
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from src.cancellation import CancellationToken, EvaluationCancelled, run_cancellable
+from src.config import SERVICE_MAX_WORKERS, SERVICE_MAX_QUEUED_JOBS, SERVICE_JOB_HISTORY
+from src.graph import create_graph
+from src.export import export_evaluation
+from src.history import record_evaluation
+from src.ingest import TenderReader
+from src.llm import hedger
+from src.logging_config import configure_logging
+from src.metrics import metrics
+from src.state import build_initial_state, serialize_state
+from src.tools.contractor_index import start_background_refresh
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+@dataclass
+class EvaluationJob:
+    """A submitted tender and the progress of its evaluation."""
+    job_id: str
+    project_description: str
+    bids: list[dict]
+    deadline_seconds: Optional[float] = None
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    events: list[dict] = field(default_factory=list)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+    token: CancellationToken = field(default_factory=CancellationToken)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def summary(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "bids": len(self.bids),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.events,
+            "error": self.error,
+            "degraded": (self.result or {}).get("degraded", []),
+        }
+
+
+class JobManager:
+    """Queue of evaluation jobs processed by a fixed number of async workers."""
+
+    def __init__(
+        self,
+        max_workers: int = SERVICE_MAX_WORKERS,
+        max_queued: int = SERVICE_MAX_QUEUED_JOBS,
+        history: int = SERVICE_JOB_HISTORY,
+        graph_factory: Callable = create_graph,
+    ):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.history = history
+        self.graph = graph_factory()  # Compiled once and shared by all workers
+        self.jobs: dict[str, EvaluationJob] = {}
+        # Bounded by the count of jobs still waiting, so a cancelled job frees its slot at once
+        # (its queue entry is skipped by the worker that takes it)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued = 0
+        self._workers: list[asyncio.Task] = []
+        self._running = 0
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.max_workers)]
+        logger.info("Started %d evaluation workers", self.max_workers)
+
+    async def stop(self) -> None:
+        # A worker whose job was just cancelled via the API takes this cancel as the job's,
+        # so the flag (not the cancel alone) is what ends its loop
+        self._stopping = True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        project_description: str,
+        bids: list[dict],
+        deadline_seconds: Optional[float] = None,
+    ) -> EvaluationJob:
+        """Queue a tender for evaluation (raises asyncio.QueueFull when the queue is full)."""
+        if 0 < self.max_queued <= self._queued:
+            raise asyncio.QueueFull
+        job = EvaluationJob(
+            job_id=uuid.uuid4().hex,
+            project_description=project_description,
+            bids=bids,
+            deadline_seconds=deadline_seconds,
+        )
+        self._queue.put_nowait(job)
+        self._queued += 1
+        self.jobs[job.job_id] = job
+        self._prune()
+        logger.info("Queued job %s with %d bids", job.job_id, len(bids))
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[EvaluationJob]:
+        """
+        Cancel a job: a queued job is never started, a running one is stopped
+        and its worker freed at once. Finished jobs are left unchanged.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.token.cancel("cancelled via API")
+        if job.status == "queued":
+            self._queued -= 1
+            await self._finish_cancelled(job)
+        return job
+
+    async def _finish_cancelled(self, job: EvaluationJob) -> None:
+        job.status = "cancelled"
+        job.error = job.token.reason
+        job.finished_at = time.time()
+        metrics.increment("jobs_cancelled")
+        await self._emit(job, {"status": job.status})
+        logger.info("Job %s cancelled", job.job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self._running,
+            "queued": self._queued,
+            "jobs": len(self.jobs),
+        }
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [j for j in self.jobs.values() if j.finished]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job.job_id]
+
+    async def _emit(self, job: EvaluationJob, event: dict) -> None:
+        async with job.changed:
+            job.events.append({"time": time.time(), **event})
+            job.changed.notify_all()
+
+    async def _worker(self, worker_id: int) -> None:
+        while not self._stopping:
+            job = await self._queue.get()
+            if job.finished:  # Cancelled while queued
+                self._queue.task_done()
+                continue
+            self._queued -= 1
+            self._running += 1
+            try:
+                await self._run(job)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+    async def _run(self, job: EvaluationJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        await self._emit(job, {"status": "running"})
+
+        async def evaluate() -> dict:
+            state = build_initial_state(job.project_description, job.bids, job.deadline_seconds)
+            async for mode, chunk in self.graph.astream(state, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    state = chunk
+                else:
+                    for node in chunk:
+                        await self._emit(job, {"status": "running", "node": node})
+            return state
+
+        try:
+            state = await run_cancellable(evaluate(), job.token, evaluation_id=job.job_id)
+            await asyncio.to_thread(record_evaluation, state)
+            await asyncio.to_thread(export_evaluation, state, job.job_id)
+            job.token.raise_if_cancelled()  # A cancel that arrived while persisting is still reported
+            # Terminal only once persisted, so a client seeing "succeeded" finds it in the history and export
+            job.result = serialize_state(state)
+            job.status = "succeeded"
+        except EvaluationCancelled:
+            await self._finish_cancelled(job)
+            return
+        except Exception as e:
+            logger.error("Job %s failed: %s", job.job_id, e)
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        await self._emit(job, {"status": job.status})
+        logger.info("Job %s %s in %.1fs", job.job_id, job.status, job.finished_at - job.started_at)
+
+
+def create_app(manager: Optional[JobManager] = None, **manager_kwargs) -> Starlette:
+    """Create the service app (a JobManager is created on startup if not given)."""
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        configure_logging()
+        app.state.manager = manager or JobManager(**manager_kwargs)
+        await app.state.manager.start()
+        start_background_refresh()  # Keeps the contractor index fresh off the request path
+        try:
+            yield
+        finally:
+            await app.state.manager.stop()
+
+    def get_job(request: Request) -> Optional[EvaluationJob]:
+        return request.app.state.manager.jobs.get(request.path_params["job_id"])
+
+    async def submit_job(request: Request) -> JSONResponse:
+        # Parsed and validated bid by bid as the body arrives (JSON, or JSONL as application/x-ndjson)
+        reader = TenderReader(jsonl=request.headers.get("content-type", "").startswith("application/x-ndjson"))
+        try:
+            async for chunk in request.stream():
+                reader.feed(chunk)
+            tender = reader.finish()
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        deadline_seconds = tender.fields.get("deadline_seconds")
+        if deadline_seconds is not None and (not isinstance(deadline_seconds, (int, float)) or deadline_seconds <= 0):
+            return JSONResponse({"error": "deadline_seconds must be a positive number"}, status_code=400)
+        try:
+            job = request.app.state.manager.submit(tender.project_description, tender.bids, deadline_seconds)
+        except asyncio.QueueFull:
+            return JSONResponse({"error": "Job queue is full, retry later"}, status_code=503)
+        response = {"job_id": job.job_id, "status": job.status}
+        if tender.errors:
+            response["rejected_bids"] = [{"index": e.index, "error": e.message} for e in tender.errors]
+        return JSONResponse(response, status_code=202)
+
+    async def job_status(request: Request) -> JSONResponse:
+        job = get_job(request)
+        if job is None:
+            return JSONResponse({"error": "Job not found"}, status_code=404)
+        return JSONResponse(job.summary())
+
+    async def job_result(request: Request) -> JSONResponse:
+        job = get_job(request)
+        if job is None:
+            return JSONResponse({"error": "Job not found"}, status_code=404)
+        if not job.finished:
+            return JSONResponse({"error": f"Job is {job.status}", "status": job.status}, status_code=409)
+        if job.status == "failed":
+            return JSONResponse({"error": job.error, "status": job.status}, status_code=500)
+        if job.status == "cancelled":
+            return JSONResponse({"error": "Job was cancelled", "status": job.status}, status_code=410)
+        return JSONResponse({"job_id": job.job_id, "status": job.status, "result": job.result})
+
+    async def cancel_job(request: Request) -> JSONResponse:
+        job = await request.app.state.manager.cancel(request.path_params["job_id"])
+        if job is None:
+            return JSONResponse({"error": "Job not found"}, status_code=404)
+        if job.status in ("succeeded", "failed"):
+            return JSONResponse({"error": f"Job already {job.status}", "status": job.status}, status_code=409)
+        return JSONResponse({"job_id": job.job_id, "status": job.status}, status_code=202)
+
+    async def job_events(request: Request):
+        job = get_job(request)
+        if job is None:
+            return JSONResponse({"error": "Job not found"}, status_code=404)
+
+        async def stream():
+            sent = 0
+            while True:
+                async with job.changed:
+                    await job.changed.wait_for(lambda: len(job.events) > sent or job.finished)
+                    events = job.events[sent:]
+                for event in events:
+                    yield f"data: {json.dumps(event)}\n\n"
+                sent += len(events)
+                if job.finished and sent == len(job.events):
+                    break
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", **request.app.state.manager.stats()})
+
+    async def pipeline_metrics(request: Request) -> JSONResponse:
+        return JSONResponse({**metrics.snapshot(), "llm_hedging": hedger.stats()})
+
+    return Starlette(
+        routes=[
+            Route("/jobs", submit_job, methods=["POST"]),
+            Route("/jobs/{job_id}", job_status, methods=["GET"]),
+            Route("/jobs/{job_id}/result", job_result, methods=["GET"]),
+            Route("/jobs/{job_id}/events", job_events, methods=["GET"]),
+            Route("/jobs/{job_id}/cancel", cancel_job, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+            Route("/metrics", pipeline_metrics, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the bid evaluation job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=SERVICE_MAX_WORKERS, help="Concurrent evaluations")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(max_workers=args.workers), host=args.host, port=args.port)
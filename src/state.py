@@ -1,19 +1,104 @@
-from typing import TypedDict, Optional
+import operator
+import time
+from typing import Annotated, TypedDict, Optional
+from typing_extensions import NotRequired
+from pydantic import BaseModel
+from src.bids import BidTable
+from src.config import EVALUATION_DEADLINE_SECONDS
 from src.schemas import (
+    BID_RESULT_MAP,
+    LIST_ADAPTERS,
     ProjectRequirements,
     ContractorProfile,
     BidScore,
+    BidResult,
     RedFlag,
     FinalRecommendation,
 )
 
 
+def merge_scores(current: list[BidScore], update: list[BidScore]) -> list[BidScore]:
+    """Reducer for "scores": add or replace scores by bid id, keeping the list ranked by overall_score."""
+    updated = {score.bid_id for score in update}
+    merged = [score for score in current if score.bid_id not in updated] + list(update)
+    return sorted(merged, key=lambda score: score.overall_score, reverse=True)
+
+
 class BidEvalState(TypedDict):
+    """
+    Evaluation state. Nodes return only the fields they set; the graph merges
+    them in. Fields annotated with a reducer accumulate: scores are upserted
+    by bid id, and red flags and degraded parts are appended.
+    """
     project_description: str
     bids: list[dict]
     requirements: Optional[ProjectRequirements]
     contractor_profiles: list[ContractorProfile]
-    scores: list[BidScore]
-    red_flags: list[RedFlag]
+    scores: Annotated[list[BidScore], merge_scores]
+    red_flags: Annotated[list[RedFlag], operator.add]
     final_recommendation: Optional[FinalRecommendation]
+    # Validated bids built from `bids` by parse_and_enrich (see src/bids.py)
+    bid_table: NotRequired[BidTable]
+    # Reuse between evaluations of the same tender (see src/incremental.py)
+    project_hash: NotRequired[str]
+    bid_results: NotRequired[dict[str, BidResult]]
+    critique_cache: NotRequired[dict[str, FinalRecommendation]]
+    # From past evaluations (see src/history.py)
+    project_category: NotRequired[str]
+    market_cost_benchmark: NotRequired[Optional[float]]
+    # Time limit (epoch seconds) and the parts degraded to meet it (see src/deadline.py)
+    deadline: NotRequired[Optional[float]]
+    degraded: NotRequired[Annotated[list[str], operator.add]]
+    # Token usage of the run's LLM calls, including prompt-cache hits (see src/llm.py)
+    llm_usage: NotRequired[dict[str, int]]
+
+
+def build_initial_state(
+    project_description: str,
+    bids: list[dict],
+    deadline_seconds: Optional[float] = None,
+) -> BidEvalState:
+    """
+    Create the input state for a fresh evaluation.
+
+    The deadline starts now and defaults to EVALUATION_DEADLINE_SECONDS (<= 0 means none).
+    """
+    if deadline_seconds is None:
+        deadline_seconds = EVALUATION_DEADLINE_SECONDS
+    return {
+        "project_description": project_description,
+        "bids": bids,
+        "requirements": None,
+        "contractor_profiles": [],
+        "scores": [],
+        "red_flags": [],
+        "final_recommendation": None,
+        "deadline": time.time() + deadline_seconds if deadline_seconds > 0 else None,
+        "degraded": [],
+    }
+
+
+def _to_jsonable(value):
+    """Convert Pydantic models (including nested in lists/dicts) to JSON-compatible data."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        # Score, flag and profile lists are dumped in one call
+        adapter = LIST_ADAPTERS.get(type(value[0])) if value else None
+        if adapter is not None and all(type(v) is type(value[0]) for v in value):
+            return adapter.dump_python(value, mode="json")
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        if value and all(type(v) is BidResult for v in value.values()):
+            return BID_RESULT_MAP.dump_python(value, mode="json")
+        return {k: _to_jsonable(v) for k, v in value.items()}
+    return value
+
+
+# Derived from other fields, rebuilt on the next run instead of serialized
+DERIVED_FIELDS = ("bid_table",)
+
 
+def serialize_state(state: BidEvalState) -> dict:
+    """JSON-compatible copy of an evaluation state (e.g. for API responses or job results)."""
+    return {key: _to_jsonable(value) for key, value in state.items() if key not in DERIVED_FIELDS}
@@ -0,0 +1,275 @@
+"""Local contractor reputation index.
+
+Contractor profiles, the raw Serper hits they were scored from (full-text
+searchable with SQLite FTS5) and the history of past profiles are kept in
+a SQLite file. Evaluations read profiles from the index without network
+access; only contractors the index has never seen are searched live.
+A background refresher re-fetches stale entries off the request path.
+
+    python -m src.tools.contractor_index refresh [--all]
+    python -m src.tools.contractor_index search "lawsuit OR violation"
+    python -m src.tools.contractor_index show "Acme Builders"
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+from src.config import (
+    CONTRACTOR_INDEX_MAX_AGE_DAYS,
+    CONTRACTOR_INDEX_PATH,
+    CONTRACTOR_INDEX_REFRESH_INTERVAL,
+)
+from src.schemas import CONTRACTOR_PROFILE_LIST, ContractorProfile
+from src.tools.serper import profile_from_results, search_contractor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contractors (
+    name_key TEXT PRIMARY KEY,
+    contractor_name TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contractors_fetched ON contractors (fetched_at);
+CREATE TABLE IF NOT EXISTS profile_history (
+    name_key TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_name ON profile_history (name_key, fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS hits USING fts5(
+    name_key UNINDEXED,
+    source UNINDEXED,
+    title,
+    snippet,
+    link UNINDEXED
+);
+"""
+
+
+def name_key(contractor_name: str) -> str:
+    """Case- and whitespace-insensitive lookup key for a contractor name."""
+    return " ".join(contractor_name.lower().split())
+
+
+class ContractorIndex:
+    """SQLite index of contractor profiles, raw search hits and profile history."""
+
+    def __init__(self, path, max_age_days: float = 7.0, wal: bool = True):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_age_days: Entries older than this are refreshed by the background refresher
+            wal: Use WAL journaling; disable for databases on network file systems
+        """
+        self.path = Path(path)
+        self.max_age_seconds = max_age_days * 86400
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            if wal:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def record(self, contractor_name: str, data: dict) -> ContractorProfile:
+        """Score Serper results, store the profile and its hits, and return the profile."""
+        profile = profile_from_results(contractor_name, data)
+        key, now, profile_json = name_key(contractor_name), time.time(), profile.model_dump_json()
+        hits = [
+            (key, source, result.get("title", ""), result.get("snippet", ""), result.get("link", ""))
+            for source in ("news", "organic")
+            for result in data.get(source, [])
+        ]
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO contractors (name_key, contractor_name, profile, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, contractor_name, profile_json, now),
+                )
+                conn.execute("INSERT INTO profile_history VALUES (?, ?, ?)", (key, profile_json, now))
+                conn.execute("DELETE FROM hits WHERE name_key = ?", (key,))
+                conn.executemany("INSERT INTO hits VALUES (?, ?, ?, ?, ?)", hits)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return profile
+
+    def get(self, contractor_name: str) -> Optional[ContractorProfile]:
+        """Indexed profile (stale or not), or None for an unseen contractor."""
+        return self.get_many([contractor_name]).get(contractor_name)
+
+    def get_many(self, contractor_names: list[str]) -> dict[str, ContractorProfile]:
+        """Indexed profiles keyed by the requested names; unseen contractors are omitted."""
+        keys = {name_key(name): name for name in contractor_names}
+        if not keys:
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT name_key, profile FROM contractors WHERE name_key IN ({','.join('?' * len(keys))})",
+                list(keys),
+            ).fetchall()
+        # All rows validated in one call
+        indexed = CONTRACTOR_PROFILE_LIST.validate_json(f"[{','.join(profile_json for _, profile_json in rows)}]")
+        # Keep the caller's spelling so profiles match bids by contractor_name
+        return {
+            keys[key]: profile.model_copy(update={"contractor_name": keys[key]})
+            for (key, _), profile in zip(rows, indexed)
+        }
+
+    def stale(self, limit: Optional[int] = None) -> list[str]:
+        """Names of contractors whose entry is older than max_age, oldest first."""
+        query = "SELECT contractor_name FROM contractors WHERE fetched_at < ? ORDER BY fetched_at"
+        params = [time.time() - self.max_age_seconds]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute(query, params).fetchall()]
+
+    def names(self) -> list[str]:
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT contractor_name FROM contractors ORDER BY name_key")]
+
+    def history(self, contractor_name: str) -> list[tuple[float, ContractorProfile]]:
+        """Past profiles of a contractor as (fetched_at, profile), oldest first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT fetched_at, profile FROM profile_history WHERE name_key = ? ORDER BY fetched_at",
+                (name_key(contractor_name),),
+            ).fetchall()
+        profiles = CONTRACTOR_PROFILE_LIST.validate_json(f"[{','.join(profile for _, profile in rows)}]")
+        return [(fetched_at, profile) for (fetched_at, _), profile in zip(rows, profiles)]
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Full-text search over indexed titles and snippets (FTS5 query syntax)."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT c.contractor_name, h.source, h.title, h.snippet, h.link FROM hits h "
+                "JOIN contractors c ON c.name_key = h.name_key "
+                "WHERE hits MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [dict(zip(("contractor_name", "source", "title", "snippet", "link"), row)) for row in rows]
+
+    async def refresh(self, contractor_names: list[str], concurrency: int = 5) -> int:
+        """
+        Re-fetch contractors from Serper and update their entries.
+
+        Returns:
+            Number of contractors searched (failed searches keep their previous entry)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def refresh_one(name: str) -> None:
+            async with semaphore:
+                await search_contractor(name, index=self)
+
+        await asyncio.gather(*(refresh_one(name) for name in contractor_names))
+        return len(contractor_names)
+
+
+class IndexRefresher(threading.Thread):
+    """Daemon thread that periodically refreshes stale index entries in bulk."""
+
+    def __init__(self, index: ContractorIndex, interval: float, batch_size: int = 50):
+        super().__init__(name="contractor-index-refresher", daemon=True)
+        self.index = index
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                names = self.index.stale(limit=self.batch_size)
+                if names:
+                    logger.info("Refreshing %d stale contractor index entries", len(names))
+                    asyncio.run(self.index.refresh(names))
+            except Exception as e:
+                logger.error("Contractor index refresh failed: %s", e)
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+_default_index: Optional[ContractorIndex] = None
+_refresher: Optional[IndexRefresher] = None
+_lock = threading.Lock()
+
+
+def default_index() -> Optional[ContractorIndex]:
+    """The index at CONTRACTOR_INDEX_PATH, or None if the index is disabled."""
+    global _default_index
+    with _lock:
+        if _default_index is None and CONTRACTOR_INDEX_PATH:
+            _default_index = ContractorIndex(CONTRACTOR_INDEX_PATH, max_age_days=CONTRACTOR_INDEX_MAX_AGE_DAYS)
+    return _default_index
+
+
+def start_background_refresh(interval: Optional[float] = None) -> Optional[IndexRefresher]:
+    """Start the process-wide refresher for the default index (once). Returns None if disabled."""
+    global _refresher
+    interval = CONTRACTOR_INDEX_REFRESH_INTERVAL if interval is None else interval
+    index = default_index()
+    if index is None or interval <= 0:
+        return None
+    with _lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = IndexRefresher(index, interval)
+            _refresher.start()
+    return _refresher
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and refresh the local contractor index")
+    parser.add_argument("--index", default=CONTRACTOR_INDEX_PATH or None, required=not CONTRACTOR_INDEX_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh = commands.add_parser("refresh", help="Re-fetch stale (or all) contractors from Serper")
+    refresh.add_argument("--all", action="store_true")
+    refresh.add_argument("names", nargs="*", help="Contractors to add or refresh")
+
+    search = commands.add_parser("search", help="Full-text search over indexed search hits")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+
+    show = commands.add_parser("show", help="Print a contractor's profile history")
+    show.add_argument("name")
+
+    args = parser.parse_args(argv)
+    index = ContractorIndex(args.index, max_age_days=CONTRACTOR_INDEX_MAX_AGE_DAYS)
+
+    if args.command == "refresh":
+        names = args.names or (index.names() if args.all else index.stale())
+        print(f"Refreshed {asyncio.run(index.refresh(names))} contractors")
+    elif args.command == "search":
+        for hit in index.search(args.query, args.limit):
+            print(json.dumps(hit))
+    else:
+        history = index.history(args.name)
+        if not history:
+            print(f"Contractor not indexed: {args.name}", file=sys.stderr)
+            return 1
+        for fetched_at, profile in history:
+            print(json.dumps({"fetched_at": fetched_at, **profile.model_dump()}))
+    return 0
+
+
+if __name__ == "__main__":
+    from src.logging_config import get_logger  # Configures logging for the CLI
+    get_logger(__name__)
+    sys.exit(main())
@@ -1,17 +1,73 @@
-import httpx
 import asyncio
 import logging
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Union
 from src.schemas import ContractorProfile
-from src.config import SERPER_API_KEY
+from src.config import SERPER_BATCH_SIZE, get_serper_api_key
+from src.cancellation import check_cancelled
+from src.cassette import CassetteMiss, active_cassette, cassette_replaying
+from src.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.tools.contractor_index import ContractorIndex
 
 logger = logging.getLogger(__name__)
 
+SERPER_URL = "https://google.serper.dev/search"
+
+# Overrides the configured key when set (tests); otherwise resolved on first use
+SERPER_API_KEY: Optional[str] = None
+
+
+def _api_key() -> Optional[str]:
+    return SERPER_API_KEY or get_serper_api_key()
+
+
+async def _fetch_search_results(payload: Union[dict, list]) -> Union[dict, list]:
+    """
+    POST a search to Serper, recording to or replaying from the active cassette.
+    
+    A list of query payloads is sent as one multi-query request and returns a list of results.
+    """
+    cassette = active_cassette()
+    if cassette and cassette.replaying:
+        return cassette.lookup("serper", payload)
+    
+    import httpx  # Deferred: only needed when a search actually goes out
+    headers = {
+        "X-API-KEY": _api_key(),
+        "Content-Type": "application/json",
+    }
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(SERPER_URL, json=payload, headers=headers, timeout=30.0)
+            response.raise_for_status()
+            data = response.json()
+    except asyncio.CancelledError:
+        metrics.increment("serper_requests_cancelled")
+        raise
+    
+    if cassette:
+        cassette.record("serper", payload, data)
+    return data
+
+
+def contractor_query(contractor_name: str) -> dict:
+    """Serper search payload used to research a contractor."""
+    return {
+        "q": f"{contractor_name} construction company reviews projects",
+        "tbs": "qdr:y",  # Last 12 months
+        "num": 10,
+    }
+
 
-async def search_contractor(contractor_name: str) -> ContractorProfile:
-    """Search for contractor information using Serper API."""
+async def search_contractor(contractor_name: str, index: Optional["ContractorIndex"] = None) -> ContractorProfile:
+    """
+    Search for contractor information using Serper API.
+    
+    If an index is given, the search results are stored in it (see src/tools/contractor_index.py).
+    """
     if not contractor_name or not contractor_name.strip():
-        logger.warning(f"Empty contractor name provided, returning default profile")
+        logger.warning("Empty contractor name provided, returning default profile")
         return ContractorProfile(
             contractor_name=contractor_name or "Unknown",
             reputation_score=0.5,
@@ -20,8 +76,8 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
             credibility_sources=[],
         )
     
-    if not SERPER_API_KEY:
-        logger.warning(f"No SERPER_API_KEY configured, returning default profile for {contractor_name}")
+    if not _api_key() and not cassette_replaying():
+        logger.warning("No SERPER_API_KEY configured, returning default profile for %s", contractor_name)
         return ContractorProfile(
             contractor_name=contractor_name,
             reputation_score=0.5,
@@ -30,24 +86,13 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
             credibility_sources=[],
         )
     
-    url = "https://google.serper.dev/search"
-    headers = {
-        "X-API-KEY": SERPER_API_KEY,
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "q": f"{contractor_name} construction company reviews projects",
-        "tbs": "qdr:y",  # Last 12 months
-        "num": 10,
-    }
-
+    import httpx
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
+        data = await _fetch_search_results(contractor_query(contractor_name))
+    except CassetteMiss:
+        raise  # Stale cassette - fail the replay instead of using a default profile
     except httpx.TimeoutException:
-        logger.error(f"Serper API timeout for {contractor_name}, returning default profile")
+        logger.error("Serper API timeout for %s, returning default profile", contractor_name)
         return ContractorProfile(
             contractor_name=contractor_name,
             reputation_score=0.5,
@@ -56,7 +101,7 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
             credibility_sources=[],
         )
     except httpx.HTTPStatusError as e:
-        logger.error(f"Serper API HTTP error for {contractor_name}: {e.response.status_code}, returning default profile")
+        logger.error("Serper API HTTP error for %s: %s, returning default profile", contractor_name, e.response.status_code)
         return ContractorProfile(
             contractor_name=contractor_name,
             reputation_score=0.5,
@@ -65,7 +110,7 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
             credibility_sources=[],
         )
     except Exception as e:
-        logger.error(f"Unexpected error searching for {contractor_name}: {str(e)}, returning default profile")
+        logger.error("Unexpected error searching for %s: %s, returning default profile", contractor_name, e)
         return ContractorProfile(
             contractor_name=contractor_name,
             reputation_score=0.5,
@@ -74,6 +119,13 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
             credibility_sources=[],
         )
 
+    if index is not None:
+        return await asyncio.to_thread(index.record, contractor_name, data)
+    return profile_from_results(contractor_name, data)
+
+
+def profile_from_results(contractor_name: str, data: dict) -> ContractorProfile:
+    """Score a contractor from Serper search results with keyword heuristics."""
     # Extract information
     organic_results = data.get("organic", [])
     news_results = data.get("news", [])
@@ -128,8 +180,16 @@ async def search_contractor(contractor_name: str) -> ContractorProfile:
     )
 
 
-async def search_all_contractors(contractor_names: List[str]) -> List[ContractorProfile]:
-    """Parallel search for all contractors."""
+async def search_all_contractors(
+    contractor_names: List[str],
+    index: Optional["ContractorIndex"] = None,
+) -> List[ContractorProfile]:
+    """
+    Parallel search for all contractors.
+    
+    With an index, indexed contractors are read locally (no network) and only
+    unseen contractors are searched live; their results are added to the index.
+    """
     if not contractor_names:
         logger.warning("No contractor names provided for search")
         return []
@@ -140,16 +200,30 @@ async def search_all_contractors(contractor_names: List[str]) -> List[Contractor
         logger.warning("No valid contractor names after filtering")
         return []
     
-    tasks = [search_contractor(name) for name in valid_names]
+    check_cancelled()
+    indexed = await asyncio.to_thread(index.get_many, valid_names) if index is not None else {}
+    if indexed:
+        logger.info("Read %d contractor profiles from the local index", len(indexed))
+    # Each contractor is searched once, however many bids they submitted
+    unseen_names = list(dict.fromkeys(name for name in valid_names if name not in indexed))
+    
     try:
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if len(unseen_names) > 1 and (_api_key() or cassette_replaying()):
+            results = await search_contractors_batch(unseen_names, index)
+        else:
+            tasks = [search_contractor(name, index) for name in unseen_names]
+            results = dict(zip(unseen_names, await asyncio.gather(*tasks, return_exceptions=True)))
+        results.update(indexed)
         # Handle any exceptions that occurred during gathering
         profiles = []
-        for i, result in enumerate(results):
+        for name in valid_names:
+            result = results[name]
+            if isinstance(result, (asyncio.CancelledError, CassetteMiss)):
+                raise result  # Abandoned evaluation or stale cassette - don't substitute default profiles
             if isinstance(result, Exception):
-                logger.error(f"Error searching for {valid_names[i]}: {str(result)}")
+                logger.error("Error searching for %s: %s", name, result)
                 profiles.append(ContractorProfile(
-                    contractor_name=valid_names[i],
+                    contractor_name=name,
                     reputation_score=0.5,
                     recent_projects=[],
                     red_flags_found=[],
@@ -158,8 +232,10 @@ async def search_all_contractors(contractor_names: List[str]) -> List[Contractor
             else:
                 profiles.append(result)
         return profiles
+    except CassetteMiss:
+        raise
     except Exception as e:
-        logger.error(f"Error in parallel search: {str(e)}")
+        logger.error("Error in parallel search: %s", e)
         return [ContractorProfile(
             contractor_name=name,
             reputation_score=0.5,
@@ -168,3 +244,54 @@ async def search_all_contractors(contractor_names: List[str]) -> List[Contractor
             credibility_sources=[],
         ) for name in valid_names]
 
+
+async def search_contractors_batch(
+    contractor_names: List[str],
+    index: Optional["ContractorIndex"] = None,
+    batch_size: int = SERPER_BATCH_SIZE,
+) -> dict:
+    """
+    Search contractors with multi-query Serper requests of up to `batch_size` queries.
+    
+    Chunks are sent concurrently. Contractors whose chunk failed, or whose
+    entry in the response is missing or malformed, are retried with single
+    requests through search_contractor().
+    
+    Returns:
+        Profile (or exception from a failed single request) keyed by contractor name
+    """
+    names = list(dict.fromkeys(contractor_names))
+    chunks = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+    
+    async def search_chunk(chunk: List[str]) -> dict:
+        try:
+            data = await _fetch_search_results([contractor_query(name) for name in chunk])
+        except Exception as e:
+            logger.warning("Serper batch of %d queries failed (%s), falling back to single requests", len(chunk), e)
+            data = []
+        if not isinstance(data, list):
+            data = []
+        
+        profiles = {}
+        retry = []
+        for i, name in enumerate(chunk):
+            result = data[i] if i < len(data) else None
+            if not isinstance(result, dict) or not ("organic" in result or "news" in result):
+                retry.append(name)
+            elif index is not None:
+                profiles[name] = await asyncio.to_thread(index.record, name, result)
+            else:
+                profiles[name] = profile_from_results(name, result)
+        
+        if retry:
+            if len(retry) < len(chunk):
+                logger.warning("Serper batch returned no results for %d contractors, retrying individually", len(retry))
+            outcomes = await asyncio.gather(*(search_contractor(name, index) for name in retry), return_exceptions=True)
+            profiles.update(zip(retry, outcomes))
+        return profiles
+    
+    logger.info("Searching %d contractors in %d batched Serper requests", len(names), len(chunks))
+    results = {}
+    for profiles in await asyncio.gather(*(search_chunk(chunk) for chunk in chunks)):
+        results.update(profiles)
+    return results
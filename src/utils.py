@@ -1,11 +1,72 @@
 """Utility functions for bid evaluation."""
+import hashlib
+import json
 import logging
-from typing import Dict
+from typing import Dict, Optional, Union
+from src.bids import Bid
 from src.schemas import ProjectRequirements
 
 logger = logging.getLogger(__name__)
 
 
+def content_hash(value) -> str:
+    """Stable SHA-256 hex digest of a JSON-serializable value (key order independent)."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compact_json(value) -> str:
+    """
+    Canonical compact JSON for prompts: sorted keys, no whitespace, unescaped
+    unicode, and None/empty fields of objects dropped.
+    """
+    def prune(v):
+        if isinstance(v, dict):
+            return {k: prune(x) for k, x in v.items() if x is not None and x != "" and x != [] and x != {}}
+        if isinstance(v, list):
+            return [prune(x) for x in v]
+        return v
+    return json.dumps(prune(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def project_hash(project_description: str) -> str:
+    """Hash of a project description, insensitive to whitespace and case changes."""
+    normalized = " ".join((project_description or "").split()).lower()
+    return content_hash(normalized)
+
+
+def hash_requirements(requirements: Optional[ProjectRequirements]) -> str:
+    """Hash of extracted requirements (empty requirements hash to a fixed value)."""
+    return content_hash(requirements.model_dump(mode="json") if requirements else None)
+
+
+def scoring_context_hash(
+    requirements_hash: str,
+    local_scope: bool = False,
+    market_cost_benchmark: Optional[float] = None,
+) -> str:
+    """
+    Hash of what a bid's score depends on besides the bid itself: the
+    requirements, whether scope_score came from local coverage instead of the
+    LLM (LOCAL_SCOPE_SCORING_MIN_BIDS) and the history market benchmark.
+    """
+    return content_hash({
+        "requirements": requirements_hash,
+        "local_scope": local_scope,
+        "market_cost_benchmark": market_cost_benchmark,
+    })
+
+
+def bid_content_hash(bid: dict, context_hash: str) -> str:
+    """
+    Hash of every bid field plus the scoring context (see scoring_context_hash).
+    
+    Two bids with the same hash produce the same score and red flags, so a
+    stored result can be reused when a tender is re-evaluated.
+    """
+    return content_hash({"bid": bid, "context": context_hash})
+
+
 def calculate_dynamic_weights(requirements: ProjectRequirements) -> Dict[str, float]:
     """
     Calculate dynamic weights based on project priorities.
@@ -89,7 +150,7 @@ def calculate_dynamic_weights(requirements: ProjectRequirements) -> Dict[str, fl
 
 
 def detect_constraint_violations(
-    bid: dict,
+    bid: Union[Bid, dict],
     requirements: ProjectRequirements,
     scope_score: float
 ) -> list:
@@ -103,7 +164,7 @@ def detect_constraint_violations(
         return violations
     
     constraints_text = " ".join(requirements.constraints).lower()
-    scope_text = bid.get("scope", "").lower()
+    scope_text = bid.scope_lower if isinstance(bid, Bid) else bid.get("scope", "").lower()
     
     # Check for operational constraints
     if "occupied" in constraints_text or "operational" in constraints_text:
@@ -0,0 +1,197 @@
+"""Worker processes that evaluate tenders from the shared SQLite job queue.
+
+    # Queue tenders
+    python -m src.worker submit data/jobs.db bids/*.json
+    # Run 4 worker processes on this host (repeat on other hosts sharing the volume)
+    python -m src.worker work data/jobs.db --processes 4
+    # Check progress / fetch a result
+    python -m src.worker status data/jobs.db [job_id]
+    # Cancel a queued or running job
+    python -m src.worker cancel data/jobs.db <job_id>
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+from typing import Callable, Optional
+from src.cancellation import CancellationToken, run_cancellable
+from src.export import export_evaluation
+from src.history import record_evaluation
+from src.ingest import load_tender
+from src.job_queue import ClaimedJob, JobQueue
+from src.logging_config import configure_logging
+from src.metrics import metrics
+from src.state import build_initial_state, serialize_state
+from src.tools.contractor_index import start_background_refresh
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the heartbeat interval, so cancelled jobs free their worker quickly
+CANCEL_POLL_SECONDS = 5.0
+
+
+async def _heartbeat(queue: JobQueue, job: ClaimedJob, worker_id: str, token: CancellationToken) -> None:
+    """Renew the lease while the evaluation runs; cancel it if the job was cancelled or the lease lost."""
+    while True:
+        await asyncio.sleep(min(queue.lease_seconds / 3, CANCEL_POLL_SECONDS))
+        if not await asyncio.to_thread(queue.heartbeat, job.job_id, worker_id):
+            record = await asyncio.to_thread(queue.get, job.job_id)
+            if record and record["status"] == "cancelled":
+                logger.info("Job %s was cancelled, stopping its evaluation", job.job_id)
+                metrics.increment("jobs_cancelled")
+                token.cancel("cancelled via job queue")
+            else:
+                logger.warning("Lost lease on job %s, abandoning it", job.job_id)
+                token.cancel("lease lost")
+            return
+
+
+async def process_job(queue: JobQueue, job: ClaimedJob, worker_id: str, graph) -> bool:
+    """Evaluate one claimed job and write the result back. Returns True on success."""
+    logger.info("Worker %s evaluating job %s (attempt %d)", worker_id, job.job_id, job.attempts)
+    token = CancellationToken()
+    evaluation = run_cancellable(
+        graph.ainvoke(build_initial_state(job.project_description, job.bids, job.deadline_seconds)),
+        token,
+        evaluation_id=job.job_id,
+    )
+    heartbeat = asyncio.create_task(_heartbeat(queue, job, worker_id, token))
+    try:
+        result = await evaluation
+    except asyncio.CancelledError:
+        if token.cancelled:
+            return False  # Cancelled or lease lost - another worker may already own the job
+        raise
+    except Exception as e:
+        logger.error("Job %s failed: %s", job.job_id, e)
+        await asyncio.to_thread(queue.fail, job.job_id, worker_id, str(e))
+        return False
+    finally:
+        heartbeat.cancel()
+    completed = await asyncio.to_thread(queue.complete, job.job_id, worker_id, serialize_state(result))
+    if completed:
+        await asyncio.to_thread(record_evaluation, result)
+        await asyncio.to_thread(export_evaluation, result, job.job_id)
+    return completed
+
+
+def run_worker(
+    queue_path: str,
+    worker_id: Optional[str] = None,
+    poll_interval: float = 1.0,
+    stop_when_empty: bool = False,
+    graph_factory: Optional[Callable] = None,
+    **queue_kwargs,
+) -> int:
+    """
+    Claim and evaluate jobs until stopped (or until the queue is empty).
+
+    Returns:
+        Number of jobs completed successfully
+    """
+    if graph_factory is None:
+        from src.graph import create_graph
+        graph_factory = create_graph
+
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = JobQueue(queue_path, **queue_kwargs)
+    graph = graph_factory()  # Compiled once per process
+
+    async def loop() -> int:
+        completed = 0
+        while True:
+            job = await asyncio.to_thread(queue.claim, worker_id)
+            if job is None:
+                if stop_when_empty:
+                    return completed
+                await asyncio.sleep(poll_interval)
+                continue
+            completed += await process_job(queue, job, worker_id, graph)
+
+    return asyncio.run(loop())
+
+
+def _worker_process(queue_path: str, index: int, stop_when_empty: bool, wal: bool) -> None:
+    configure_logging()  # In the child process
+    logger.info("Starting worker process %d", index)
+    run_worker(
+        queue_path,
+        worker_id=f"{socket.gethostname()}-{os.getpid()}-{index}",
+        stop_when_empty=stop_when_empty,
+        wal=wal,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate tenders from a shared SQLite job queue")
+    parser.add_argument("--no-wal", dest="wal", action="store_false", help="Disable WAL (queue on a network file system)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Queue tender JSON files")
+    submit.add_argument("queue")
+    submit.add_argument("files", nargs="+")
+
+    work = commands.add_parser("work", help="Run worker processes")
+    work.add_argument("queue")
+    work.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    work.add_argument("--stop-when-empty", action="store_true", help="Exit once no job is available")
+
+    status = commands.add_parser("status", help="Show queue counts or one job")
+    status.add_argument("queue")
+    status.add_argument("job_id", nargs="?")
+
+    cancel = commands.add_parser("cancel", help="Cancel a queued or running job")
+    cancel.add_argument("queue")
+    cancel.add_argument("job_id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        queue = JobQueue(args.queue, wal=args.wal)
+        for path in args.files:
+            with open(path, "rb") as f:
+                tender = load_tender(f, jsonl=path.endswith(".jsonl"))
+            deadline_seconds = tender.fields.get("deadline_seconds")
+            if deadline_seconds is not None and (not isinstance(deadline_seconds, (int, float)) or deadline_seconds <= 0):
+                print(f"{path}: not queued, deadline_seconds must be a positive number", file=sys.stderr)
+                continue
+            for error in tender.errors:
+                print(f"{path}: skipped bid {error.index}: {error.message}", file=sys.stderr)
+            print(f"{queue.enqueue(tender.project_description, tender.bids, deadline_seconds)}\t{path}")
+    elif args.command == "work":
+        processes = [
+            multiprocessing.Process(target=_worker_process, args=(args.queue, i, args.stop_when_empty, args.wal))
+            for i in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        configure_logging()  # After forking: each child configures its own
+        # One refresher per host keeps the shared contractor index fresh for all workers
+        start_background_refresh()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+    elif args.command == "cancel":
+        if not JobQueue(args.queue, wal=args.wal).cancel(args.job_id):
+            print(f"Job not found or already finished: {args.job_id}", file=sys.stderr)
+            return 1
+        print(f"Cancelled {args.job_id}")
+    else:
+        queue = JobQueue(args.queue, wal=args.wal)
+        output = queue.get(args.job_id) if args.job_id else queue.counts()
+        if output is None:
+            print(f"Job not found: {args.job_id}", file=sys.stderr)
+            return 1
+        print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""Shared fixtures: every test gets its own data, export and log directories."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """
+    Point DATA_DIR, the default stores, EXPORT_DIR and the log directory at `tmp_path`.
+
+    The defaults live under the repo's data/ and logs/, where stores written by
+    one run (e.g. the evaluation history behind the market benchmark) would
+    change the next one.
+    """
+    from src import config, export, history, logging_config, requirements_store
+    from src.tools import contractor_index
+
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(config, "DATA_DIR", str(data_dir))
+    monkeypatch.setattr(requirements_store, "REQUIREMENTS_STORE_PATH", str(data_dir / "requirements.db"))
+    monkeypatch.setattr(requirements_store, "_default_store", None)
+    monkeypatch.setattr(contractor_index, "CONTRACTOR_INDEX_PATH", str(data_dir / "contractors.db"))
+    monkeypatch.setattr(contractor_index, "_default_index", None)
+    monkeypatch.setattr(history, "HISTORY_STORE_PATH", str(data_dir / "history.db"))
+    monkeypatch.setattr(history, "_default_history", None)
+    monkeypatch.setattr(export, "EXPORT_DIR", str(data_dir / "exports"))
+    monkeypatch.setattr(export, "_default_export", None)
+    # Only read when logging is first configured in the process
+    monkeypatch.setattr(logging_config, "LOG_DIR", tmp_path / "logs")
+    return data_dir
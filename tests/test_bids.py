@@ -0,0 +1,84 @@
+"""Tests for the typed bid model and the columnar bid table."""
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.bids import Bid, BidTable
+from src.prefilter import cost_and_timeline_benchmarks, heuristic_bid_score
+
+BIDS = [
+    {"id": "bid_a", "contractor_name": "Acme", "cost": "1,000", "timeline_months": 6, "scope": "Electrical Rewiring, HVAC upgrade"},
+    {"contractor_name": "Zenith", "cost": 900000, "timeline_months": 8, "warranty_years": 2, "scope": "HVAC work subcontracted"},
+    {"id": "bid_c", "contractor_name": "", "cost": 850000},
+    "not a bid",
+    {"id": "bid_d", "contractor_name": "Budget Co", "cost": 1100000, "scope": "Building construction"},
+]
+
+
+def test_bid_fields_are_parsed_once():
+    """Numbers are floats (None if missing or invalid) and the scope is pre-lowered and tokenized."""
+    bid = Bid.from_dict(BIDS[0])
+
+    assert bid.cost is None and bid.timeline_months == 6.0 and bid.warranty_years is None
+    assert bid.scope_lower == "electrical rewiring, hvac upgrade"
+    assert bid.scope_words == ("electrical", "rewiring,", "hvac", "upgrade") and bid.word_count == 4
+    assert bid.mentions("hvac") and not bid.mentions("subcontract")
+    with pytest.raises(AttributeError):
+        bid.cost = 1.0
+    with pytest.raises(ValueError, match="contractor_name"):
+        Bid.from_dict(BIDS[2])
+
+
+def test_scope_must_be_text():
+    """A null scope counts as empty; a number or other non-text scope skips the bid with a clear reason."""
+    assert Bid.from_dict({"id": "bid_a", "contractor_name": "Acme", "scope": None}).scope_words == ()
+    with pytest.raises(ValueError, match="non-text scope: bid_b"):
+        Bid.from_dict({"id": "bid_b", "contractor_name": "Zenith", "scope": 42})
+
+    table = BidTable.from_dicts([
+        {"id": "bid_a", "contractor_name": "Acme", "scope": None},
+        {"id": "bid_b", "contractor_name": "Zenith", "scope": ["HVAC"]},
+    ])
+    assert table.ids == ["bid_a"]
+
+
+def test_table_skips_invalid_bids_and_keeps_numeric_columns():
+    """Invalid bids are dropped, missing ids generated, and the medians read from the NumPy columns."""
+    table = BidTable.from_dicts(BIDS)
+
+    assert table.ids == ["bid_a", "bid_1", "bid_d"]
+    assert table.get("bid_1").data == {**BIDS[1], "id": "bid_1"}
+    assert math.isnan(table.cost[0]) and list(table.cost[1:]) == [900000.0, 1100000.0]
+    assert table.median_cost() == 1000000.0 and table.median_timeline() == 7.0
+    assert BidTable.of(table) is table
+
+
+def test_heuristics_accept_bids_and_dicts():
+    """The prefilter gives the same results for a table of Bids as for the raw dicts."""
+    table = BidTable.from_dicts(BIDS)
+    valid_dicts = [bid.data for bid in table]
+
+    assert cost_and_timeline_benchmarks(table, None) == cost_and_timeline_benchmarks(valid_dicts, None)
+    for bid in table:
+        assert heuristic_bid_score(bid, None, None, 1000000.0, 7.0) == heuristic_bid_score(bid.data, None, None, 1000000.0, 7.0)
+
+
+def test_generated_and_repeated_ids_do_not_collide():
+    """Generated ids skip ids other bids use; a repeated id is renamed, so every id maps to its own bid."""
+    bids = [
+        {"contractor_name": "Acme", "cost": 1000},
+        {"id": "bid_0", "contractor_name": "Zenith", "cost": 900},
+        {"id": "bid_0", "contractor_name": "Budget Co", "cost": 800},
+        {"id": "bid_0_2", "contractor_name": "Delta", "cost": 700},
+    ]
+    table = BidTable.from_dicts(bids)
+
+    assert table.ids == ["bid_1", "bid_0", "bid_0_3", "bid_0_2"]
+    assert [table.get(bid_id).contractor_name for bid_id in table.ids] == ["Acme", "Zenith", "Budget Co", "Delta"]
+    assert table.get("bid_0_3").data == {**bids[2], "id": "bid_0_3"}
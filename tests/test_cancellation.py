@@ -0,0 +1,71 @@
+"""Tests for cooperative cancellation of evaluations."""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cancellation import CancellationToken, EvaluationCancelled, check_cancelled, run_cancellable
+from src.metrics import metrics
+from src.tools import serper
+from src.tools.serper import search_all_contractors
+
+
+def test_cancel_from_another_thread_interrupts_awaits():
+    """Cancelling the token aborts a pending await at once and is counted in metrics."""
+    token = CancellationToken()
+    interrupted = threading.Event()
+    before = metrics.get("evaluations_cancelled")
+
+    async def slow_call():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            interrupted.set()
+            raise
+
+    threading.Timer(0.05, token.cancel, args=("new file uploaded",)).start()
+    started = time.monotonic()
+    with pytest.raises(EvaluationCancelled, match="new file uploaded"):
+        asyncio.run(run_cancellable(slow_call(), token))
+
+    assert interrupted.is_set() and time.monotonic() - started < 5
+    assert metrics.get("evaluations_cancelled") == before + 1
+
+
+def test_check_cancelled_sees_the_evaluation_token():
+    """Nodes stop at their next checkpoint; code outside an evaluation is unaffected."""
+    token = CancellationToken()
+    checkpoints = []
+
+    async def node():
+        for step in range(3):
+            check_cancelled()
+            checkpoints.append(step)
+            if step == 1:
+                token.cancel()  # No await follows, only the checkpoint can stop the loop
+
+    with pytest.raises(EvaluationCancelled):
+        asyncio.run(run_cancellable(node(), token))
+    assert checkpoints == [0, 1]
+    check_cancelled()  # No evaluation running in this context
+
+
+def test_contractor_search_propagates_cancellation(monkeypatch):
+    """Abandoned searches raise instead of being replaced by default profiles."""
+    async def hanging_fetch(payload):
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(serper, "SERPER_API_KEY", "test-key")
+    monkeypatch.setattr(serper, "_fetch_search_results", hanging_fetch)
+    token = CancellationToken()
+
+    threading.Timer(0.05, token.cancel).start()
+    with pytest.raises(EvaluationCancelled):
+        asyncio.run(run_cancellable(search_all_contractors(["Acme", "Budget Co"]), token))
@@ -0,0 +1,111 @@
+"""Tests for the GPT-4o-mini -> GPT-4o model cascade."""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.cascade import bids_to_escalate
+from src.metrics import metrics
+from src.nodes import critique, score
+from src.nodes.parse import rule_based_requirements
+from src.schemas import BidScore, FinalRecommendation, RecommendationType
+
+CLOSE_CALL = json.loads((project_root / "tests" / "cases" / "close_call.json").read_text())
+
+# Component scores each model gives, by bid id
+MINI_SCORES = {"bid_1": 0.75, "bid_2": 0.75, "bid_3": 0.60}
+GPT4O_SCORES = {"bid_1": 0.85, "bid_2": 0.70}
+
+
+def make_score(bid_id: str, overall: float, method: str = "llm") -> BidScore:
+    """Score with every component equal to `overall`."""
+    return BidScore(
+        bid_id=bid_id,
+        contractor_name=bid_id,
+        cost_score=overall,
+        timeline_score=overall,
+        scope_score=overall,
+        risk_score=overall,
+        reputation_score=overall,
+        overall_score=overall,
+        reasoning=f"Scored by {method}",
+        scoring_method=method,
+    )
+
+
+def test_only_uncertain_bids_are_escalated():
+    """Close rankings, scores near a threshold and conflicting heuristics escalate; clear cases do not."""
+    clear = [make_score("a", 0.85), make_score("b", 0.70), make_score("c", 0.40)]
+    assert bids_to_escalate(clear, {"a", "b", "c"}) == {}
+
+    close = [make_score("a", 0.78), make_score("b", 0.76), make_score("c", 0.40)]
+    assert set(bids_to_escalate(close, {"a", "b", "c"})) == {"a", "b"}
+    assert set(bids_to_escalate(close, {"b", "c"})) == {"b"}  # Only bids the mini model scored
+    assert bids_to_escalate(close, {"a", "b", "c"}, max_bids=0) == {}
+
+    near_threshold = [make_score("a", 0.66), make_score("b", 0.50)]
+    assert set(bids_to_escalate(near_threshold, {"a", "b"})) == {"a"}
+
+    heuristics = {"b": make_score("b", 0.30, "heuristic")}
+    assert set(bids_to_escalate(clear, {"a", "b", "c"}, heuristics)) == {"b"}
+
+
+def test_close_call_rescores_the_leading_bids_with_gpt4o(monkeypatch):
+    """In the close_call case only the two leading bids go to GPT-4o, and its scores replace mini's."""
+    calls = []
+
+    async def fake_model(prompt, schema, inputs, model="gpt-4o-mini"):
+        bid_id = json.loads(inputs["bid"])["id"]
+        calls.append((bid_id, model))
+        value = (MINI_SCORES if model == "gpt-4o-mini" else GPT4O_SCORES)[bid_id]
+        return make_score(bid_id, value)
+
+    monkeypatch.setattr(score, "ainvoke_structured", fake_model)
+    before = metrics.get("cascade_escalated_scores")
+    state = {
+        "project_description": CLOSE_CALL["project"]["description"],
+        "bids": CLOSE_CALL["bids"],
+        "requirements": rule_based_requirements(CLOSE_CALL["project"]["description"]),
+        "contractor_profiles": [],
+    }
+    result = asyncio.run(score.score_and_flag(state))
+
+    assert sorted(bid_id for bid_id, model in calls if model == "gpt-4o") == ["bid_1", "bid_2"]
+    assert len([c for c in calls if c[1] == "gpt-4o-mini"]) == 3
+    assert [s.bid_id for s in result["scores"]] == ["bid_1", "bid_2", "bid_3"]
+    assert result["scores"][0].overall_score == 0.85
+    assert metrics.get("cascade_escalated_scores") == before + 2
+
+
+def test_low_confidence_review_escalates_to_gpt4o(monkeypatch):
+    """A confident mini review is kept; a low-confidence one is redone by GPT-4o."""
+    scores = [make_score("bid_1", 0.80), make_score("bid_2", 0.60)]
+    models = []
+
+    def reviewer(mini_confidence: float):
+        async def fake_model(prompt, schema, inputs, model="gpt-4o-mini"):
+            models.append(model)
+            return FinalRecommendation(
+                recommendation_type=RecommendationType.ACCEPT,
+                ranked_bids=["bid_1", "bid_2"],
+                confidence=mini_confidence if model == "gpt-4o-mini" else 0.9,
+                rationale=f"Reviewed by {model}",
+                trade_offs=[],
+            )
+        return fake_model
+
+    state = {"scores": scores, "red_flags": [], "requirements": None}
+    monkeypatch.setattr(critique, "ainvoke_structured", reviewer(0.85))
+    result = asyncio.run(critique.critique_and_finalize(state))
+    assert models == ["gpt-4o-mini"]
+    assert result["final_recommendation"].rationale == "Reviewed by gpt-4o-mini"
+
+    models.clear()
+    monkeypatch.setattr(critique, "ainvoke_structured", reviewer(0.5))
+    result = asyncio.run(critique.critique_and_finalize(state))
+    assert models == ["gpt-4o-mini", "gpt-4o"]
+    assert result["final_recommendation"].rationale == "Reviewed by gpt-4o"
@@ -0,0 +1,76 @@
+"""Tests for the local contractor reputation index."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.tools import serper
+from src.tools.contractor_index import ContractorIndex
+from src.tools.serper import search_all_contractors
+
+RESULTS = {
+    "organic": [
+        {"title": "Acme Builders completed hospital project", "snippet": "Award-winning delivery", "link": "https://a.example"},
+        {"title": "Acme Builders lawsuit settled", "snippet": "Dispute over delays", "link": "https://b.example"},
+    ],
+    "news": [],
+}
+
+
+def test_record_and_read_profiles(tmp_path):
+    """Recorded results are scored once, then served by name (any spelling) with history and FTS."""
+    index = ContractorIndex(tmp_path / "contractors.db")
+    recorded = index.record("Acme Builders", RESULTS)
+    index.record("Acme Builders", RESULTS)
+
+    profile = index.get("  acme  BUILDERS ")
+    assert profile.reputation_score == recorded.reputation_score
+    assert profile.contractor_name == "  acme  BUILDERS "  # Caller's spelling, so bids still match
+    assert index.get("Unknown Co") is None
+    assert len(index.history("Acme Builders")) == 2
+
+    hits = index.search("lawsuit")
+    assert [hit["link"] for hit in hits] == ["https://b.example"]  # Hits replaced, not duplicated
+
+
+def test_only_unseen_contractors_are_searched_live(tmp_path, monkeypatch):
+    """Indexed contractors need no network; live results for new ones are added to the index."""
+    index = ContractorIndex(tmp_path / "contractors.db")
+    index.record("Acme Builders", RESULTS)
+    searched = []
+
+    async def fake_fetch(payload):
+        searched.append(payload["q"])
+        return RESULTS
+
+    monkeypatch.setattr(serper, "SERPER_API_KEY", "test-key")
+    monkeypatch.setattr(serper, "_fetch_search_results", fake_fetch)
+
+    profiles = asyncio.run(search_all_contractors(["Acme Builders", "Budget Co"], index=index))
+
+    assert [p.contractor_name for p in profiles] == ["Acme Builders", "Budget Co"]
+    assert searched == ["Budget Co construction company reviews projects"]
+    assert index.get("Budget Co") is not None
+
+
+def test_stale_entries_are_refreshed(tmp_path, monkeypatch):
+    """Entries older than the max age are listed as stale and updated by refresh()."""
+    index = ContractorIndex(tmp_path / "contractors.db", max_age_days=0.5 / 86400)
+    index.record("Acme Builders", RESULTS)
+    time.sleep(0.6)
+    assert index.stale() == ["Acme Builders"]
+
+    async def fake_fetch(payload):
+        return {"organic": [], "news": []}
+
+    monkeypatch.setattr(serper, "SERPER_API_KEY", "test-key")
+    monkeypatch.setattr(serper, "_fetch_search_results", fake_fetch)
+    asyncio.run(index.refresh(index.stale()))
+
+    assert index.stale() == []
+    assert len(index.history("Acme Builders")) == 2
+    assert index.search("lawsuit") == []
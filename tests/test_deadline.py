@@ -0,0 +1,63 @@
+"""Tests for evaluation deadlines and graceful degradation."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.deadline import stage_deadline
+from src.graph import create_graph
+from src.nodes import critique, parse, score
+from src.schemas import RecommendationType
+from src.state import build_initial_state
+
+PROJECT = (
+    "Office building renovation. Budget: $2M (max $2.2M). Timeline: 8 months. "
+    "Scope: HVAC replacement, electrical upgrades and interior finishes."
+)
+SCOPE = "Complete HVAC replacement, electrical upgrades, interior finishes, permits, cleanup and commissioning"
+BIDS = [
+    {"id": "bid_1", "contractor_name": "Acme Builders", "cost": 1950000, "timeline_months": 8, "scope": SCOPE, "warranty_years": 2},
+    {"id": "bid_2", "contractor_name": "Budget Co", "cost": 2150000, "timeline_months": 10, "scope": "HVAC and electrical work"},
+]
+
+
+def test_stage_budgets_split_the_time_left():
+    """Each stage gets its share of the remaining time; later stages keep theirs."""
+    now = time.time()
+    state = {"deadline": now + 100}
+    assert stage_deadline(state, "parse_and_enrich") - now == pytest.approx(30, abs=1)
+    assert stage_deadline(state, "score_and_flag") - now == pytest.approx(100 * 0.5 / 0.7, abs=1)
+    assert stage_deadline(state, "critique_and_finalize") - now == pytest.approx(100, abs=1)
+    assert stage_deadline({"deadline": None}, "score_and_flag") is None
+    assert build_initial_state("Office", BIDS, deadline_seconds=0)["deadline"] is None
+
+
+def test_slow_models_degrade_instead_of_missing_the_deadline(monkeypatch):
+    """With models that never answer, the evaluation still finishes in time using the fallbacks."""
+    async def hanging_model(*args, **kwargs):
+        await asyncio.sleep(30)
+
+    for node in (parse, score, critique):
+        monkeypatch.setattr(node, "ainvoke_structured", hanging_model)
+    monkeypatch.setattr(parse, "default_store", lambda: None)
+    monkeypatch.setattr(parse, "default_history", lambda: None)
+    monkeypatch.setattr(parse, "default_index", lambda: None)
+
+    started = time.monotonic()
+    result = asyncio.run(create_graph().ainvoke(build_initial_state(PROJECT, BIDS, deadline_seconds=0.5)))
+
+    assert time.monotonic() - started < 2
+    assert {part.split(":")[0] for part in result["degraded"]} == {
+        "parse_and_enrich", "score_and_flag", "critique_and_finalize",
+    }
+    assert result["requirements"].budget_target == 2_000_000
+    assert {s.scoring_method for s in result["scores"]} == {"heuristic"}
+    assert result["final_recommendation"].ranked_bids[0] == "bid_1"
+    assert result["final_recommendation"].recommendation_type != RecommendationType.REJECT_ALL
+    assert result["critique_cache"] == {}
@@ -0,0 +1,85 @@
+"""Tests for the columnar export of evaluation results."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.export import DIMENSIONS, EvaluationExport, evaluation_rows
+from src.schemas import BidScore, FinalRecommendation, RecommendationType, RedFlag, RedFlagType
+
+
+def make_state(category: str, winner: str = "bid_1") -> dict:
+    """Final state of an evaluated tender with two bids and one red flag."""
+    scores = [
+        BidScore(
+            bid_id=bid_id,
+            contractor_name=f"Contractor {bid_id}",
+            cost_score=0.8,
+            timeline_score=0.7,
+            scope_score=0.9,
+            risk_score=0.6,
+            reputation_score=0.65,
+            overall_score=overall,
+            reasoning="",
+        )
+        for bid_id, overall in ((winner, 0.80), ("bid_2", 0.62))
+    ]
+    return {
+        "project_hash": f"{category}-project",
+        "project_category": category,
+        "scores": scores,
+        "red_flags": [
+            RedFlag(type=RedFlagType.VAGUE_TIMELINE, severity="medium", evidence='Says "ASAP",\nno dates', affected_bid="bid_2"),
+        ],
+        "final_recommendation": FinalRecommendation(
+            recommendation_type=RecommendationType.ACCEPT,
+            ranked_bids=[winner, "bid_2"],
+            confidence=0.8,
+            rationale="Clear winner",
+            trade_offs=["Higher cost", "Shorter warranty"],
+        ),
+        "degraded": [],
+    }
+
+
+def test_rows_per_bid_dimension_flag_and_recommendation():
+    """Scores are exploded into one row per dimension; the winner is marked as selected."""
+    rows = evaluation_rows(make_state("office"), "eval-1", exported_at=1_700_000_000)
+
+    assert len(rows["scores"]) == 2 * len(DIMENSIONS)
+    overall = [row for row in rows["scores"] if row["dimension"] == "overall"]
+    assert [(row["bid_id"], row["rank"], row["selected"], row["score"]) for row in overall] == [
+        ("bid_1", 1, True, 0.80), ("bid_2", 2, False, 0.62),
+    ]
+    assert rows["red_flags"][0]["type"] == "VAGUE_TIMELINE" and rows["red_flags"][0]["bid_id"] == "bid_2"
+    assert rows["recommendations"][0]["selected_bid"] == "bid_1"
+    assert rows["recommendations"][0]["trade_offs"] == "Higher cost\nShorter warranty"
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow", "csv"])
+def test_appends_accumulate_and_scan_by_category(tmp_path, fmt):
+    """Each append adds rows without rewriting earlier ones; scans read columns and filter by category."""
+    export = EvaluationExport(tmp_path / "exports", fmt)
+    assert export.read("scores").num_rows == 0
+
+    written = export.append([("eval-1", make_state("office")), ("eval-2", make_state("school", winner="bid_3"))])
+    assert written == {"scores": 24, "red_flags": 2, "recommendations": 2}
+    export.append([("eval-3", make_state("office"))])
+
+    assert export.read("scores").num_rows == 36
+    office = export.read("recommendations", columns=["evaluation_id", "selected_bid"], category="office")
+    assert sorted(office.to_pylist(), key=lambda row: row["evaluation_id"]) == [
+        {"evaluation_id": "eval-1", "selected_bid": "bid_1"},
+        {"evaluation_id": "eval-3", "selected_bid": "bid_1"},
+    ]
+    assert export.read("red_flags", columns=["evidence"]).column("evidence").to_pylist() == ['Says "ASAP",\nno dates'] * 3
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    """Only Parquet, Arrow and CSV are supported."""
+    with pytest.raises(ValueError, match="Unknown export format"):
+        EvaluationExport(tmp_path, "xlsx")
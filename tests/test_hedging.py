@@ -0,0 +1,113 @@
+"""Tests for hedged LLM requests."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hedging import Hedger
+
+
+def make_request(delays: list, calls: list, cancelled: list):
+    """Request factory whose n-th call returns n after delays[n] seconds (negative: fails after -delay)."""
+    async def request():
+        n = len(calls)
+        calls.append(n)
+        try:
+            delay = delays[n] if n < len(delays) else 0.001
+            await asyncio.sleep(abs(delay))
+            if delay < 0:
+                raise ConnectionError("reset")
+            return n
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+    return request
+
+
+async def warm_up(hedger: Hedger, samples: int = 10) -> None:
+    for _ in range(samples):
+        await hedger.run(make_request([0.001], [], []), key="score")
+
+
+def test_slow_request_is_hedged_and_loser_cancelled():
+    """After the percentile delay a duplicate is sent; the faster one wins and the other is cancelled."""
+    hedger = Hedger(percentile=90, budget=0.5, min_samples=10, name="test_hedge")
+
+    async def scenario():
+        await warm_up(hedger)
+        calls, cancelled = [], []
+        result = await hedger.run(make_request([5.0, 0.01], calls, cancelled), key="score")
+        return result, calls, cancelled
+
+    result, calls, cancelled = asyncio.run(asyncio.wait_for(scenario(), timeout=2))
+    assert result == 1 and calls == [0, 1] and cancelled == [0]
+    assert hedger.stats()["win_rate"] > 0 and 0 < hedger.stats()["hedge_rate"] <= 0.5
+
+
+def test_hedges_respect_budget_and_warm_up():
+    """No hedges before enough latency samples, nor beyond the budget."""
+    hedger = Hedger(percentile=90, budget=0.0, min_samples=10, name="test_budget")
+    assert hedger.hedge_delay("score") is None
+
+    async def scenario():
+        await warm_up(hedger)
+        calls = []
+        await hedger.run(make_request([0.2], calls, []), key="score")
+        return calls
+
+    assert asyncio.run(scenario()) == [0]  # Budget of 0 - the slow request is not hedged
+    assert hedger.hedge_delay("score") is not None
+    assert hedger.stats()["hedge_rate"] == 0.0
+
+
+def test_failed_primary_falls_back_to_hedge():
+    """A primary that fails after the hedge was sent does not fail the call; both failing does."""
+    hedger = Hedger(percentile=50, budget=1.0, min_samples=10, name="test_failure")
+
+    async def scenario(delays):
+        await warm_up(hedger)
+        return await hedger.run(make_request(delays, [], []), key="score")
+
+    assert asyncio.run(scenario([-0.05, 0.1])) == 1
+    with pytest.raises(ConnectionError):
+        asyncio.run(scenario([-0.05, -0.1]))
+
+
+def test_cancelled_primary_falls_back_to_hedge():
+    """A primary that ends cancelled (not by the hedger) is treated as failed instead of aborting the call."""
+    hedger = Hedger(percentile=50, budget=1.0, min_samples=10, name="test_cancelled")
+    calls = []
+
+    async def request():
+        n = len(calls)
+        calls.append(n)
+        await asyncio.sleep(0.05 if n == 0 else 0.1)
+        if n == 0:
+            raise asyncio.CancelledError()  # The primary, cancelled inside the client
+        return n
+
+    async def scenario():
+        await warm_up(hedger)
+        return await hedger.run(request, key="score")
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=2)) == 1 and calls == [0, 1]
+
+
+def test_abandoned_primary_latency_is_recorded():
+    """When the hedge wins, the time the primary had run is recorded, not the hedge's shorter duration."""
+    hedger = Hedger(percentile=50, budget=1.0, min_samples=10, name="test_abandoned")
+
+    async def scenario():
+        for _ in range(10):
+            await hedger.run(make_request([0.1], [], []), key="score")
+        delay = hedger.hedge_delay("score")
+        await hedger.run(make_request([5.0, 0.01], [], []), key="score")
+        return delay
+
+    delay = asyncio.run(asyncio.wait_for(scenario(), timeout=2))
+    assert hedger._latencies["score"][-1] >= delay + 0.01
@@ -0,0 +1,109 @@
+"""Tests for the historical evaluation store."""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.history import EvaluationHistory, project_category
+from src.schemas import (
+    BidScore,
+    FinalRecommendation,
+    ProjectRequirements,
+    RecommendationType,
+    RedFlag,
+    RedFlagType,
+)
+
+
+def make_state(project: str, costs: dict[str, float], winner: str, flagged: str = "") -> dict:
+    """Final state of an evaluated office tender with a $1M budget."""
+    scores = [
+        BidScore(
+            bid_id=name,
+            contractor_name=name,
+            cost_score=0.8,
+            timeline_score=0.7,
+            scope_score=0.8,
+            risk_score=0.7,
+            reputation_score=0.7,
+            overall_score=0.80 if name == winner else 0.60,
+            reasoning="",
+        )
+        for name in costs
+    ]
+    flags = [RedFlag(type=RedFlagType.SUSPICIOUSLY_LOW_COST, severity="high", evidence="", affected_bid=flagged)] if flagged else []
+    return {
+        "project_hash": project,
+        "project_description": "Office building fit-out",
+        "bids": [{"id": name, "contractor_name": name, "cost": cost} for name, cost in costs.items()],
+        "requirements": ProjectRequirements(constraints=[], scope="Fit-out", priorities=[], budget_target=1_000_000),
+        "scores": scores,
+        "red_flags": flags,
+        "final_recommendation": FinalRecommendation(
+            recommendation_type=RecommendationType.ACCEPT,
+            ranked_bids=[winner],
+            confidence=0.8,
+            rationale="",
+        ),
+    }
+
+
+def test_project_category():
+    """Descriptions are bucketed by their dominant keywords."""
+    assert project_category("Healthcare facility renovation with patient operations") == "healthcare"
+    assert project_category("Industrial warehouse expansion, new loading docks") == "industrial"
+    assert project_category("Build a bridge") == "other"
+
+
+def test_market_cost_benchmark(tmp_path):
+    """Past bids' cost/budget ratios in the category scale the new project's budget."""
+    history = EvaluationHistory(tmp_path / "history.db")
+    history.record(make_state("p1", {"Acme": 1_100_000, "Budget Co": 900_000}, "Acme"))
+    history.record(make_state("p2", {"Acme": 1_200_000, "Zenith": 1_000_000}, "Zenith"))
+
+    assert history.cost_benchmark("commercial", 2_000_000, min_samples=4) == 2_100_000  # median ratio 1.05
+    assert history.cost_benchmark("commercial", 2_000_000, min_samples=5) is None  # Not enough samples
+    assert history.cost_benchmark("healthcare", 2_000_000, min_samples=1) is None
+
+    # Re-recording a project replaces it instead of counting it twice
+    history.record(make_state("p2", {"Acme": 1_200_000, "Zenith": 1_000_000}, "Zenith"))
+    assert history.cost_benchmark("commercial", 2_000_000, min_samples=5) is None
+
+
+def test_contractor_track_records(tmp_path):
+    """Track records aggregate scores, selections and serious flags across tenders."""
+    history = EvaluationHistory(tmp_path / "history.db")
+    history.record(make_state("p1", {"Acme": 1_100_000, "Budget Co": 600_000}, "Acme", flagged="Budget Co"))
+    history.record(make_state("p2", {"Acme": 1_200_000, "Budget Co": 650_000}, "Acme", flagged="Budget Co"))
+
+    records = history.track_records(["ACME", "Budget Co", "Newcomer"])
+    assert set(records) == {"ACME", "Budget Co"}
+    assert records["ACME"].evaluations == 2 and records["ACME"].times_selected == 2
+    assert records["ACME"].reputation_score > records["Budget Co"].reputation_score
+
+    profile = records["Budget Co"].to_profile()
+    assert profile.red_flags_found == ["SUSPICIOUSLY_LOW_COST flagged in 2 of 2 past tenders"]
+    assert history.track_records(["Acme"], exclude_project_hash="p1")["Acme"].evaluations == 1
+
+
+def test_track_records_count_tenders_and_leave_out_reputation(tmp_path):
+    """Two bids in one tender count once; bids without ids keep their cost; reputation does not feed back."""
+    history = EvaluationHistory(tmp_path / "history.db")
+    state = make_state("p1", {"Acme": 1_100_000, "Acme Ltd": 1_000_000}, "Acme")
+    state["bids"] = [{"contractor_name": "Acme", "cost": 1_100_000}, {"contractor_name": "Acme", "cost": 1_000_000}]
+    for score, bid_id in zip(state["scores"], ("bid_0", "bid_1")):
+        score.bid_id, score.contractor_name = bid_id, "Acme"
+    state["final_recommendation"].ranked_bids = ["bid_0"]
+    history.record(state)
+
+    record = history.track_records(["Acme"])["Acme"]
+    assert record.evaluations == 1 and record.times_selected == 1
+    assert record.mean_score == 0.759  # Cost, timeline, scope and risk only
+    assert history.cost_benchmark("commercial", 2_000_000, min_samples=2) == 2_100_000
+
+    for score in state["scores"]:  # A higher reputation raises the overall score, not the track record
+        score.reputation_score, score.overall_score = 1.0, score.overall_score + 0.045
+    history.record(state)
+    assert history.track_records(["Acme"])["Acme"].mean_score == 0.759
@@ -0,0 +1,139 @@
+"""Tests for incremental re-evaluation (content hashing and result reuse)."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nodes import score
+from src.nodes.score import score_and_flag
+from src.schemas import BidResult, BidScore, ProjectRequirements, RedFlag, RedFlagType
+from src.utils import bid_content_hash, hash_requirements, project_hash, scoring_context_hash
+
+
+REQUIREMENTS = ProjectRequirements(
+    constraints=["Budget: $1M"],
+    scope="Office fit-out",
+    priorities=["cost"],
+)
+
+BID = {
+    "id": "bid_1",
+    "contractor_name": "Acme Builders",
+    "cost": 950000,
+    "timeline_months": 6,
+    "scope": "Full office fit-out including electrical, HVAC and finishes",
+    "warranty_years": 2,
+}
+
+
+def make_result(bid: dict, context_hash: str) -> BidResult:
+    """Build a stored result as a previous evaluation would have produced it."""
+    score = BidScore(
+        bid_id=bid["id"],
+        contractor_name=bid["contractor_name"],
+        cost_score=0.8,
+        timeline_score=0.7,
+        scope_score=0.9,
+        risk_score=0.7,
+        reputation_score=0.65,
+        overall_score=0.77,
+        reasoning="Stored reasoning",
+    )
+    flag = RedFlag(
+        type=RedFlagType.VAGUE_TIMELINE,
+        severity="medium",
+        evidence="Stored flag",
+        affected_bid=bid["id"],
+    )
+    return BidResult(bid_hash=bid_content_hash(bid, context_hash), score=score, red_flags=[flag])
+
+
+def test_bid_hash_is_stable_and_content_sensitive():
+    """Field order does not matter, but any amended field, new requirements or scoring context do."""
+    requirements_hash = hash_requirements(REQUIREMENTS)
+    context_hash = scoring_context_hash(requirements_hash)
+    reordered = dict(reversed(list(BID.items())))
+    assert bid_content_hash(BID, context_hash) == bid_content_hash(reordered, context_hash)
+
+    amended = {**BID, "cost": 900000}
+    assert bid_content_hash(BID, context_hash) != bid_content_hash(amended, context_hash)
+
+    other_requirements = REQUIREMENTS.model_copy(update={"scope": "Office fit-out and roof"})
+    assert context_hash != scoring_context_hash(hash_requirements(other_requirements))
+    assert context_hash != scoring_context_hash(requirements_hash, local_scope=True)
+    assert context_hash != scoring_context_hash(requirements_hash, market_cost_benchmark=1_000_000)
+
+
+def test_project_hash_ignores_whitespace_and_case():
+    """Re-uploading the same description with different formatting keeps its hash."""
+    assert project_hash("Office  fit-out.\nBudget $1M") == project_hash("office fit-out. budget $1m")
+
+
+def test_unchanged_bids_reuse_stored_results():
+    """Bids with a stored result are not re-scored (no model is needed)."""
+    stored = make_result(BID, scoring_context_hash(hash_requirements(REQUIREMENTS)))
+    state = {
+        "project_description": "Office fit-out",
+        "bids": [BID],
+        "requirements": REQUIREMENTS,
+        "contractor_profiles": [],
+        "scores": [],
+        "red_flags": [],
+        "final_recommendation": None,
+        "bid_results": {stored.bid_hash: stored},
+    }
+
+    result = asyncio.run(score_and_flag(state))
+
+    assert [s.overall_score for s in result["scores"]] == [0.77]
+    assert [f.evidence for f in result["red_flags"]] == ["Stored flag"]
+    assert list(result["bid_results"]) == [stored.bid_hash]
+
+
+def test_bids_sharing_an_id_keep_their_own_results():
+    """Two different bids submitted with the same id are both scored, in bid order; the second is renamed."""
+    context_hash = scoring_context_hash(hash_requirements(REQUIREMENTS))
+    other = {**BID, "contractor_name": "Other Builders", "cost": 900000}
+    stored = [make_result(bid, context_hash) for bid in (BID, {**other, "id": "bid_1_2"})]
+    stored[1].score.overall_score = 0.6
+    state = {
+        "project_description": "Office fit-out",
+        "bids": [BID, other],
+        "requirements": REQUIREMENTS,
+        "contractor_profiles": [],
+        "bid_results": {r.bid_hash: r for r in stored},
+    }
+
+    result = asyncio.run(score_and_flag(state))
+
+    assert [(s.bid_id, s.contractor_name) for s in result["scores"]] == [("bid_1", "Acme Builders"), ("bid_1_2", "Other Builders")]
+    assert list(result["bid_results"]) == [r.bid_hash for r in stored]
+
+
+def test_new_market_benchmark_rescores_stored_bids(monkeypatch):
+    """A stored result is not reused once the history market benchmark it was scored against changes."""
+    stored = make_result(BID, scoring_context_hash(hash_requirements(REQUIREMENTS)))
+
+    async def fake_model(prompt, schema, inputs, model=None):
+        return BidScore(
+            bid_id="bid_1", contractor_name="Acme Builders", cost_score=0.6, timeline_score=0.7, scope_score=0.9,
+            risk_score=0.7, reputation_score=0.65, overall_score=0.0, reasoning="Re-scored",
+        )
+
+    monkeypatch.setattr(score, "ainvoke_structured", fake_model)
+    state = {
+        "project_description": "Office fit-out",
+        "bids": [BID],
+        "requirements": REQUIREMENTS,
+        "contractor_profiles": [],
+        "market_cost_benchmark": 1_000_000,
+        "bid_results": {stored.bid_hash: stored},
+    }
+
+    result = asyncio.run(score_and_flag(state))
+
+    assert [s.reasoning for s in result["scores"]] == ["Re-scored"]
+    assert list(result["bid_results"]) != [stored.bid_hash]
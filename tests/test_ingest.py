@@ -0,0 +1,62 @@
+"""Tests for streaming tender ingestion."""
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ingest import TenderReader, load_tender
+
+TENDER = json.loads((project_root / "bids" / "bids_project_1_commercial.json").read_text())
+
+
+def test_chunked_json_matches_json_load():
+    """Any chunking yields the same tender, including when a chunk ends mid-bid."""
+    raw = json.dumps({**TENDER, "deadline_seconds": 60}).encode()
+    for chunk_size in (1, 7, 1 << 16):
+        tender = load_tender(io.BytesIO(raw), chunk_size=chunk_size)
+        assert tender.project_description == TENDER["project"]["description"]
+        assert tender.bids == TENDER["bids"] and tender.errors == []
+        assert tender.fields == {"deadline_seconds": 60}
+
+    reader = TenderReader()
+    mid_bid = raw.index(b"},", raw.index(b'"bids"')) - 5
+    reader.feed(raw[:mid_bid])
+    reader.feed(raw[mid_bid:])
+    assert reader.finish().bids == TENDER["bids"]
+
+
+def test_invalid_bids_are_reported_and_skipped():
+    """Each bid is validated as it arrives; one bad bid (or JSONL line) does not reject the tender."""
+    lines = [
+        json.dumps({"project": {"description": "Office fit-out"}}),
+        json.dumps({"id": "bid_1", "contractor_name": "Acme", "cost": 950000, "scope": "Fit-out"}),
+        json.dumps({"id": "bid_2", "contractor_name": "", "cost": 900000}),
+        '{"id": "bid_3", "contractor_name": ',
+        json.dumps({"id": "bid_4", "contractor_name": "Zenith", "cost": -5}),
+        json.dumps({"id": "bid_5", "contractor_name": "Budget Co", "timeline_months": 6}),
+    ]
+    tender = load_tender(io.StringIO("\n".join(lines)), jsonl=True, chunk_size=16)
+
+    assert [bid["id"] for bid in tender.bids] == ["bid_1", "bid_5"]
+    assert [error.index for error in tender.errors] == [1, 2, 3]
+    assert "contractor_name" in tender.errors[0].message and "invalid JSON" in tender.errors[1].message
+    assert "cost" in tender.errors[2].message
+
+
+def test_malformed_tenders_are_rejected():
+    """Truncated files, a missing description and tenders without valid bids raise ValueError."""
+    raw = json.dumps(TENDER)
+    with pytest.raises(ValueError, match="Invalid JSON format"):
+        load_tender(io.StringIO(raw[:-10]))
+    with pytest.raises(ValueError, match="ends before"):
+        load_tender(io.StringIO(raw[:-1]))
+    with pytest.raises(ValueError, match="project.description"):
+        load_tender(io.StringIO(json.dumps({"bids": TENDER["bids"]})))
+    with pytest.raises(ValueError, match="1 invalid bids"):
+        load_tender(io.StringIO(json.dumps({"project": TENDER["project"], "bids": [{"cost": 1}]})))
@@ -0,0 +1,135 @@
+"""Tests for the SQLite job queue and queue workers."""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import worker
+from src.job_queue import JobQueue
+from src.worker import run_worker
+from tests.test_service import create_rank_only_graph, create_slow_graph
+
+BIDS = [
+    {"id": "bid_1", "contractor_name": "Acme Builders", "cost": 950000},
+    {"id": "bid_2", "contractor_name": "Budget Co", "cost": 900000},
+]
+
+
+def test_claim_complete_round_trip(tmp_path):
+    """A claimed job is leased to one worker and its result is written back."""
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_id = queue.enqueue("Office fit-out", BIDS)
+
+    job = queue.claim("worker-a")
+    assert job.job_id == job_id and job.bids == BIDS and job.attempts == 1
+    assert queue.claim("worker-b") is None
+
+    assert not queue.complete(job_id, "worker-b", {"ok": False})  # Not the lease owner
+    assert queue.complete(job_id, "worker-a", {"ok": True})
+    assert queue.get(job_id)["status"] == "succeeded"
+    assert queue.get(job_id)["result"] == {"ok": True}
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    """A job whose worker stopped heartbeating is claimed by another worker."""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+    job_id = queue.enqueue("Office fit-out", BIDS)
+    queue.claim("worker-a")
+
+    time.sleep(0.1)
+    reclaimed = queue.claim("worker-b")
+
+    assert reclaimed.job_id == job_id and reclaimed.attempts == 2
+    assert not queue.heartbeat(job_id, "worker-a")
+    assert queue.heartbeat(job_id, "worker-b")
+
+
+def test_failed_jobs_retry_until_max_attempts(tmp_path):
+    """Failures are requeued with backoff, then marked failed on the last attempt."""
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2, retry_backoff=0.0)
+    job_id = queue.enqueue("Office fit-out", BIDS)
+
+    queue.claim("worker-a")
+    queue.fail(job_id, "worker-a", "timeout")
+    assert queue.get(job_id)["status"] == "queued"
+
+    queue.claim("worker-a")
+    queue.fail(job_id, "worker-a", "timeout")
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.claim("worker-a") is None
+
+
+def test_concurrent_claims_never_share_a_job(tmp_path):
+    """Workers racing on the same queue each get distinct jobs."""
+    queue = JobQueue(tmp_path / "jobs.db")
+    job_ids = {queue.enqueue("Office fit-out", BIDS) for _ in range(20)}
+    claimed = []
+
+    def claim_all(worker_id):
+        while (job := queue.claim(worker_id)) is not None:
+            claimed.append(job.job_id)
+
+    threads = [threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(job_ids)
+
+
+def test_worker_drains_queue(tmp_path):
+    """run_worker evaluates every queued tender and stores serialized results."""
+    path = tmp_path / "jobs.db"
+    queue = JobQueue(path)
+    job_id = queue.enqueue("Office fit-out", BIDS)
+
+    completed = run_worker(str(path), worker_id="test", stop_when_empty=True, graph_factory=create_rank_only_graph)
+
+    assert completed == 1
+    result = queue.get(job_id)["result"]
+    assert result["final_recommendation"]["ranked_bids"] == ["bid_2", "bid_1"]
+
+
+def test_worker_uses_the_tender_deadline(tmp_path):
+    """A tender's deadline_seconds is carried through the queue into the evaluation state."""
+    class RecordingGraph:
+        def __init__(self):
+            self.states = []
+
+        async def ainvoke(self, state):
+            self.states.append(state)
+            return state
+
+    queue = JobQueue(tmp_path / "jobs.db")
+    queue.enqueue("Office fit-out", BIDS, deadline_seconds=60)
+    job = queue.claim("worker-a")
+    assert job.deadline_seconds == 60
+
+    graph = RecordingGraph()
+    started = time.time()
+    assert asyncio.run(worker.process_job(queue, job, "worker-a", graph))
+    assert started + 59 < graph.states[0]["deadline"] <= time.time() + 60
+
+
+def test_cancelled_job_is_abandoned(tmp_path, monkeypatch):
+    """A cancelled queued job is never claimed; a running one is stopped at the next heartbeat."""
+    monkeypatch.setattr(worker, "CANCEL_POLL_SECONDS", 0.01)
+    queue = JobQueue(tmp_path / "jobs.db")
+    assert queue.cancel(queue.enqueue("Office fit-out", BIDS))
+    job_id = queue.enqueue("Office fit-out", BIDS)
+    job = queue.claim("worker-a")
+    assert job.job_id == job_id
+
+    threading.Timer(0.05, queue.cancel, args=(job_id,)).start()
+    started = time.monotonic()
+    completed = asyncio.run(worker.process_job(queue, job, "worker-a", create_slow_graph()))
+
+    assert not completed and time.monotonic() - started < 5
+    assert queue.get(job_id)["status"] == "cancelled"
+    assert not queue.cancel(job_id) and queue.claim("worker-a") is None
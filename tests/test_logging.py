@@ -0,0 +1,96 @@
+"""Tests for the queued, structured logging pipeline."""
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueListener
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.log_context import SAMPLED, ContextFilter, SamplingFilter, log_context
+from src.logging_config import DeferredQueueHandler, JsonFormatter
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps formatted records and the thread that handled them."""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(self.format(record))
+
+
+def make_logger(name: str, *filters: logging.Filter):
+    """Logger routed through a DeferredQueueHandler to a listener thread, as configure_logging() sets up."""
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    for log_filter in (ContextFilter(), *filters):
+        queue_handler.addFilter(log_filter)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [queue_handler]
+    logger.setLevel(logging.INFO)
+    recorder = RecordingHandler()
+    return logger, QueueListener(log_queue, recorder), recorder
+
+
+def test_records_are_json_with_context_and_written_off_thread():
+    """Ids bound in the logging thread end up in the JSON written by the listener thread."""
+    logger, listener, recorder = make_logger("test_logging.context")
+    listener.start()
+    with log_context(evaluation_id="job-1"):
+        with log_context(bid_id="bid_2"):
+            logger.info("Scored %s at %.2f", "Acme", 0.812)
+        logger.info("Between bids")
+    logger.info("Outside the evaluation")
+    listener.stop()
+
+    records = [json.loads(line) for line in recorder.lines]
+    assert records[0]["message"] == "Scored Acme at 0.81"
+    assert (records[0]["evaluation_id"], records[0]["bid_id"]) == ("job-1", "bid_2")
+    assert records[1]["evaluation_id"] == "job-1" and "bid_id" not in records[1]
+    assert "evaluation_id" not in records[2]
+    assert threading.current_thread().name not in recorder.threads
+
+
+def test_disabled_messages_are_never_formatted():
+    """Arguments of messages below the level are not rendered."""
+    rendered = []
+
+    class Expensive:
+        def __str__(self):
+            rendered.append(True)
+            return "expensive"
+
+    logger, listener, recorder = make_logger("test_logging.lazy")
+    listener.start()
+    logger.debug("Details: %s", Expensive())
+    logger.info("Summary: %s", Expensive())
+    listener.stop()
+
+    assert len(rendered) == 1 and json.loads(recorder.lines[0])["message"] == "Summary: expensive"
+
+
+def test_hot_loop_messages_are_sampled_per_call_site():
+    """One in N sampled messages is kept; unsampled messages and warnings always are."""
+    logger, listener, recorder = make_logger("test_logging.sampling", SamplingFilter(every=5))
+    listener.start()
+    for i in range(20):
+        logger.info("Adjusted bid %d", i, extra=SAMPLED)
+    logger.info("Scored 20 bids")
+    logger.warning("Sampled warning", extra=SAMPLED)
+    listener.stop()
+
+    messages = [json.loads(line)["message"] for line in recorder.lines]
+    assert messages == [
+        "Adjusted bid 0", "Adjusted bid 5", "Adjusted bid 10", "Adjusted bid 15", "Scored 20 bids", "Sampled warning",
+    ]
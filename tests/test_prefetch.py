@@ -0,0 +1,100 @@
+"""Tests for speculative prefetch on upload."""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.prefetch import Prefetcher, file_hash, seed_state
+from src.schemas import ProjectRequirements
+from src.state import build_initial_state
+
+REQUIREMENTS = ProjectRequirements(constraints=[], scope="Office fit-out", priorities=["cost"])
+BIDS = [{"id": "bid_1", "contractor_name": "Acme Builders", "cost": 950000}]
+
+
+class RecordingPrefetcher(Prefetcher):
+    """Prefetcher whose enrichment step is controlled by the test instead of calling parse_and_enrich."""
+
+    def __init__(self, block: bool = False):
+        super().__init__()
+        self.calls = 0
+        self.cancelled = threading.Event()
+        self.release_prefetch = threading.Event()
+        if not block:
+            self.release_prefetch.set()
+
+    async def _prefetch(self, project_description, bids):
+        self.calls += 1
+        try:
+            while not self.release_prefetch.is_set():
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return {**build_initial_state(project_description, bids), "project_hash": "abc", "requirements": REQUIREMENTS}
+
+
+def test_prefetch_is_memoized_by_file_hash():
+    """The same upload is prefetched once and its result is seeded into the evaluation state."""
+    prefetcher = RecordingPrefetcher()
+    key = file_hash(b'{"project": {}}')
+
+    prefetcher.start(key, "Office fit-out", BIDS, owner="session-a")
+    prefetcher.start(key, "Office fit-out", BIDS, owner="session-b")
+    state = seed_state(build_initial_state("Office fit-out", BIDS), asyncio.run(prefetcher.result(key, timeout=5)))
+
+    assert prefetcher.calls == 1
+    assert state["requirements"] == REQUIREMENTS and state["project_hash"] == "abc"
+    assert asyncio.run(prefetcher.result("unknown")) is None
+
+
+def test_abandoned_prefetch_is_cancelled():
+    """Releasing the last interested session cancels an unfinished prefetch."""
+    prefetcher = RecordingPrefetcher(block=True)
+    prefetcher.start("upload-1", "Office fit-out", BIDS, owner="session-a")
+    prefetcher.start("upload-1", "Office fit-out", BIDS, owner="session-b")
+
+    prefetcher.release("upload-1", owner="session-a")
+    assert not prefetcher.cancelled.wait(0.1)  # session-b still wants it
+
+    prefetcher.release("upload-1", owner="session-b")
+    assert prefetcher.cancelled.wait(5)
+    assert asyncio.run(prefetcher.result("upload-1")) is None
+
+
+def test_waiting_for_a_slow_prefetch_times_out():
+    """A prefetch still running at the timeout is skipped, not cancelled, and is used once it finishes."""
+    prefetcher = RecordingPrefetcher(block=True)
+    prefetcher.start("upload-1", "Office fit-out", BIDS, owner="session-a")
+
+    assert asyncio.run(prefetcher.result("upload-1", timeout=0.05)) is None
+    assert not prefetcher.cancelled.is_set()
+
+    prefetcher.release_prefetch.set()
+    assert asyncio.run(prefetcher.result("upload-1", timeout=5))["requirements"] == REQUIREMENTS
+
+
+def test_cancelling_the_wait_leaves_the_prefetch_running():
+    """An evaluation cancelled while it waits for a prefetch stops waiting; the prefetch carries on."""
+    prefetcher = RecordingPrefetcher(block=True)
+    prefetcher.start("upload-1", "Office fit-out", BIDS, owner="session-a")
+
+    async def cancel_while_waiting():
+        waiter = asyncio.ensure_future(prefetcher.result("upload-1"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(cancel_while_waiting())
+    assert not prefetcher.cancelled.is_set()
+
+    prefetcher.release_prefetch.set()
+    assert asyncio.run(prefetcher.result("upload-1", timeout=5))["requirements"] == REQUIREMENTS
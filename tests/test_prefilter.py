@@ -0,0 +1,67 @@
+"""Tests for the heuristic pre-screen that runs before LLM scoring."""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.prefilter import heuristic_bid_score, prefilter_bids
+
+DETAILED_SCOPE = (
+    "Complete electrical rewiring, full HVAC system upgrade, interior redesign of lobby "
+    "and common areas, fire suppression upgrade, all permits and phased scheduling"
+)
+
+
+def make_bids(count: int) -> list[dict]:
+    """Generate a tender where later bids are progressively more expensive."""
+    return [
+        {
+            "id": f"bid_{i}",
+            "contractor_name": f"Contractor {i}",
+            "cost": 1_000_000 + i * 2_000,
+            "timeline_months": 6,
+            "scope": DETAILED_SCOPE,
+            "warranty_years": 2,
+        }
+        for i in range(count)
+    ]
+
+
+def test_out_of_contention_bids_score_low():
+    """Cost at 2x the benchmark and a 2-word scope are ranked far below a solid bid."""
+    solid = make_bids(1)[0]
+    overpriced = {**solid, "id": "expensive", "cost": 2_000_000}
+    vague = {**solid, "id": "vague", "scope": "Building construction"}
+
+    solid_score = heuristic_bid_score(solid, None, None, 1_000_000, 6)
+    overpriced_score = heuristic_bid_score(overpriced, None, None, 1_000_000, 6)
+    vague_score = heuristic_bid_score(vague, None, None, 1_000_000, 6)
+
+    assert overpriced_score.cost_score == 0.0
+    assert vague_score.scope_score <= 0.50
+    assert solid_score.overall_score > max(overpriced_score.overall_score, vague_score.overall_score)
+    assert solid_score.scoring_method == "heuristic"
+
+
+def test_only_top_k_and_borderline_bids_go_to_llm():
+    """LLM work is bounded by top-K (plus near ties), however many bids are submitted."""
+    bids = make_bids(200)
+
+    selected, heuristic_scores = prefilter_bids(bids, None, {}, top_k=5, borderline_margin=0.0)
+
+    assert len(heuristic_scores) == 200
+    assert 5 <= len(selected) <= 10
+    assert "bid_0" in selected
+    assert "bid_199" not in selected
+
+
+def test_small_tenders_are_fully_llm_scored():
+    """With fewer bids than K, every bid goes to the LLM and no heuristic scores are computed."""
+    bids = make_bids(3)
+
+    selected, heuristic_scores = prefilter_bids(bids, None, {}, top_k=5, borderline_margin=0.05)
+
+    assert selected == {"bid_0", "bid_1", "bid_2"}
+    assert heuristic_scores == {}
@@ -0,0 +1,69 @@
+"""Tests for the prompt-cache-friendly scoring prompt and token usage reporting."""
+import asyncio
+import sys
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import llm
+from src.nodes.score import SCORING_PROMPT, _format_profile
+from src.schemas import ContractorProfile
+from src.utils import compact_json
+
+BID_A = {"id": "bid_1", "contractor_name": "Acme", "cost": 950000, "notes": None, "scope": "Full fit-out"}
+BID_B = {"scope": "HVAC only", "cost": 700000, "contractor_name": "Budget Co", "id": "bid_2"}
+
+
+def format_scoring_prompt(bid: dict, profile) -> list:
+    return SCORING_PROMPT.format_messages(
+        requirements='{"scope":"Office fit-out"}',
+        market_cost_benchmark="Not available - use the project budget",
+        bid=compact_json(bid),
+        profile=_format_profile(profile),
+    )
+
+
+def test_bids_share_the_prompt_prefix():
+    """Static instructions and project context come first and are identical for every bid."""
+    found = ContractorProfile(contractor_name="Acme", reputation_score=0.8, credibility_sources=["https://a.example"])
+    first = format_scoring_prompt(BID_A, found)
+    second = format_scoring_prompt(BID_B, None)
+
+    assert [m.content for m in first[:-1]] == [m.content for m in second[:-1]]
+    assert "{" not in first[0].content  # No per-project or per-bid data in the static part
+    assert first[-1].content.startswith('Bid: {"contractor_name":"Acme","cost":950000,"id":"bid_1","scope":"Full fit-out"}')
+    assert '"web_research":"found"' in first[-1].content
+    assert '{"web_research":"unavailable"}' in second[-1].content
+
+
+def test_compact_json_is_canonical():
+    """Key order and empty fields do not change the rendering."""
+    assert compact_json(BID_B) == compact_json(dict(reversed(list(BID_B.items()))))
+    assert compact_json({"a": None, "b": [], "c": "é"}) == '{"c":"é"}'
+
+
+def test_usage_tracking_reports_cached_token_ratio():
+    """Usage from model responses accumulates per run, starting from earlier nodes' totals."""
+    response = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 100,
+            "total_tokens": 1300,
+            "input_token_details": {"cache_read": 1024},
+        },
+    )
+
+    async def node(state):
+        llm._record_usage(response)
+        return state
+
+    result = asyncio.run(llm.tracks_llm_usage(node)({"llm_usage": {"calls": 1, "prompt_tokens": 800, "cached_prompt_tokens": 0}}))
+
+    assert result["llm_usage"]["calls"] == 2 and result["llm_usage"]["prompt_tokens"] == 2000
+    assert llm.cached_token_ratio(result["llm_usage"]) == 1024 / 2000
+    assert llm.cached_token_ratio(None) == 0.0
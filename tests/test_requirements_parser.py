@@ -0,0 +1,71 @@
+"""Tests for the rule-based requirements parser."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.requirements_parser import extract_requirements, fill_schema, parse_budget, parse_timeline, unresolved_fields
+from src.schemas import ProjectRequirements
+from src.utils import detect_constraint_violations
+
+
+def test_budget_and_timeline_bounds():
+    """Targets, caps, percentage overruns, extensions and per-unit amounts are resolved."""
+    assert parse_budget("$1.2M (acceptable up to $1.35M)") == (1_200_000, 1_350_000)
+    assert parse_budget("$800K per location ($4M total, hard cap $4.5M)") == (4_000_000, 4_500_000)
+    assert parse_budget("Target $2M, acceptable overrun up to 10%") == (2_000_000, pytest.approx(2_200_000))
+    assert parse_timeline("6 months (acceptable extension 2 weeks)") == (6.0, 6.46)
+    assert parse_timeline("3 months per location, all complete within 6 months") == (6.0, 6.0)
+    assert parse_timeline("to be agreed") == (None, None)
+
+
+def test_sectioned_project_file_needs_no_llm():
+    """projects/*.txt descriptions resolve every required field without the LLM."""
+    description = (project_root / "projects" / "project_1_commercial_renovation.txt").read_text()
+    extracted = extract_requirements(description)
+
+    assert unresolved_fields(extracted) == []
+    requirements = ProjectRequirements(**extracted)
+    assert requirements.budget_target == 1_200_000 and requirements.budget_max == 1_350_000
+    assert requirements.timeline_target_months == 6.0
+    assert "Electrical rewiring (legacy copper, partial aluminum)" in requirements.scope
+    assert "Smart building sensors" not in requirements.scope  # Conditional items are not mandatory scope
+    assert "Must comply with California Title 24" in requirements.constraints
+    assert requirements.priorities[0].startswith("We are willing to accept slightly higher cost")
+
+
+def test_only_unresolved_fields_go_to_llm():
+    """A short description leaves scope and priorities to the LLM, with a schema limited to them."""
+    extracted = extract_requirements(
+        "Build a 5-story office building in downtown area. Budget: $5M. Timeline: 18 months. "
+        "Must comply with local building codes and include parking garage."
+    )
+
+    assert extracted["budget_target"] == 5_000_000 and extracted["timeline_target_months"] == 18.0
+    assert "Must comply with local building codes and include parking garage" in extracted["constraints"]
+    missing = unresolved_fields(extracted)
+    assert missing == ["scope", "priorities", "budget_max", "timeline_max_months"]
+    assert set(fill_schema(tuple(missing)).model_fields) == set(missing)
+
+
+def test_operating_conditions_raise_the_same_violations_as_the_llm_path():
+    """Occupied, live and phased-site sentences are kept, so rule-parsed constraints flag what the full description does."""
+    for number, project_file in enumerate(sorted((project_root / "projects").glob("*.txt")), start=1):
+        tender = json.loads(next((project_root / "bids").glob(f"bids_project_{number}_*.json")).read_text())
+        for description in (project_file.read_text(), tender["project"]["description"]):
+            extracted = extract_requirements(description)
+            parsed = ProjectRequirements(**{"scope": "", "priorities": [], "constraints": [], **extracted})
+            # The LLM path reads the whole description, so every stated condition is in its constraints
+            llm = parsed.model_copy(update={"constraints": [description]})
+            for bid in tender["bids"]:
+                assert detect_constraint_violations(bid, parsed, 0.5) == detect_constraint_violations(bid, llm, 0.5)
+
+    description = (project_root / "projects" / "project_1_commercial_renovation.txt").read_text()
+    parsed = ProjectRequirements(**extract_requirements(description))
+    bid = {"scope": "Full electrical rewiring and HVAC upgrade"}
+    assert "OPERATIONAL_DISRUPTION_RISK" in [v["type"] for v in detect_constraint_violations(bid, parsed, 0.9)]
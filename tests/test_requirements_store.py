@@ -0,0 +1,58 @@
+"""Tests for the persistent requirements store."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nodes import parse
+from src.requirements_store import RequirementsStore, precompute
+from src.schemas import ProjectRequirements
+from src.state import build_initial_state
+from src.utils import project_hash
+
+DESCRIPTION = "Build a 5-story office building in downtown area. Budget: $5M. Timeline: 18 months."
+
+REQUIREMENTS = ProjectRequirements(
+    constraints=["Budget: $5M", "Timeline: 18 months"],
+    scope="5-story office building",
+    priorities=["cost"],
+    budget_target=5_000_000,
+    timeline_target_months=18,
+)
+
+
+def test_store_round_trip_uses_normalized_hash(tmp_path):
+    """Whitespace and case changes to the description hit the same stored entry."""
+    store = RequirementsStore(tmp_path / "requirements.db")
+    store.put(project_hash(DESCRIPTION), REQUIREMENTS)
+
+    assert store.get(project_hash("  " + DESCRIPTION.upper() + "\n")) == REQUIREMENTS
+    assert store.get(project_hash("Another project")) is None
+    assert len(RequirementsStore(tmp_path / "requirements.db")) == 1  # Persisted across instances
+
+
+def test_parse_reads_stored_requirements(tmp_path, monkeypatch):
+    """A stored project is not extracted again (this description would otherwise need the LLM)."""
+    store = RequirementsStore(tmp_path / "requirements.db")
+    store.put(project_hash(DESCRIPTION), REQUIREMENTS)
+    monkeypatch.setattr(parse, "default_store", lambda: store)
+
+    state = build_initial_state(DESCRIPTION, [{"id": "bid_1", "cost": 4_900_000}])
+    result = asyncio.run(parse.parse_and_enrich(state))
+
+    assert result["requirements"] == REQUIREMENTS
+    assert result["project_hash"] == project_hash(DESCRIPTION)
+
+
+def test_precompute_projects_directory(tmp_path):
+    """Bulk precompute stores every sample project once and skips them on the next run."""
+    store = RequirementsStore(tmp_path / "requirements.db")
+    projects = sorted((project_root / "projects").glob("*.txt"))
+
+    assert precompute(store, [str(project_root / "projects")]) == len(projects)
+    assert precompute(store, [str(project_root / "projects")]) == 0
+    stored = store.get(project_hash(projects[0].read_text()))
+    assert stored.budget_target == 1_200_000
@@ -0,0 +1,54 @@
+"""Tests for local requirement-coverage scoring."""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.schemas import ProjectRequirements
+from src.scope_coverage import compute_scope_coverage, requirement_items
+
+REQUIREMENTS = ProjectRequirements(
+    scope="Electrical rewiring (legacy copper/aluminum), HVAC system upgrade, interior redesign (lobby, common areas, 3 office floors)",
+    constraints=["No full-day power shutdowns on weekdays", "Must comply with California Title 24"],
+    priorities=["Delivery risk over cost"],
+)
+
+BIDS = [
+    {"id": "full", "scope": "Complete electrical rewiring of copper and aluminum systems, full HVAC system upgrade, interior redesign of lobby, common areas and 3 office floors. Title 24 compliant."},
+    {"id": "partial", "scope": "HVAC system upgrade and interior redesign of lobby and common areas. Electrical by others."},
+    {"id": "vague", "scope": "Building construction"},
+]
+
+
+def test_requirement_items_keep_parenthesized_details():
+    """Scope is split into deliverables without breaking up parenthesized lists."""
+    items, kinds = requirement_items(REQUIREMENTS)
+
+    assert items[:3] == [
+        "Electrical rewiring (legacy copper/aluminum)",
+        "HVAC system upgrade",
+        "interior redesign (lobby, common areas, 3 office floors)",
+    ]
+    assert kinds == ["scope", "scope", "scope", "constraint", "constraint"]
+
+
+def test_coverage_matrix_scores_and_gaps():
+    """The matrix ranks complete scopes above partial and vague ones and names the gaps."""
+    coverage = compute_scope_coverage(REQUIREMENTS, BIDS)
+    scores = coverage.scores()
+
+    assert coverage.matrix.shape == (5, 3)
+    assert scores["full"] > scores["partial"] > scores["vague"]
+    assert "HVAC system upgrade" not in coverage.missing("partial")
+    assert "Electrical rewiring (legacy copper/aluminum)" in coverage.missing("partial")
+    assert len(coverage.missing("vague")) == 5
+
+
+def test_bid_coverage_independent_of_other_bids():
+    """Adding bids does not change an existing bid's coverage (stored results stay valid)."""
+    alone = compute_scope_coverage(REQUIREMENTS, BIDS[:1]).scores()["full"]
+    together = compute_scope_coverage(REQUIREMENTS, BIDS).scores()["full"]
+
+    assert alone == together
@@ -0,0 +1,63 @@
+"""Tests for condensed scopes in LLM prompts."""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.metrics import metrics
+from src.nodes import score
+from src.schemas import BidScore, ProjectRequirements
+from src.scope_summary import condense_scope, prompt_scope
+from src.utils import bid_content_hash, hash_requirements, scoring_context_hash
+
+REQUIREMENTS = ProjectRequirements(
+    scope="Electrical rewiring, HVAC system upgrade, interior redesign of lobby",
+    constraints=["No weekday power shutdowns"],
+    priorities=["Delivery risk over cost"],
+)
+
+KEY_SENTENCES = [
+    "We will fully rewire the electrical system with new copper wiring.",
+    "The HVAC system upgrade includes two new chillers.",
+    "Roofing repairs are excluded from this bid.",
+    "Lobby interior redesign with new finishes and lighting.",
+]
+FILLER = " ".join(f"Our company has served the region with pride for {i} years." for i in range(150))
+LONG_SCOPE = f"{FILLER} {KEY_SENTENCES[0]} {KEY_SENTENCES[1]}\n{KEY_SENTENCES[2]} {FILLER} {KEY_SENTENCES[3]}"
+
+
+def test_long_scopes_are_condensed_to_requirement_sentences():
+    """The extract fits the limit and keeps exclusions and requirement-covering sentences in order."""
+    extract = condense_scope(LONG_SCOPE, REQUIREMENTS, max_chars=400)
+
+    assert len(extract) <= 400 and extract.startswith(f"[Extract of a {len(LONG_SCOPE):,}-character scope]")
+    positions = [extract.index(sentence) for sentence in KEY_SENTENCES]
+    assert positions == sorted(positions)
+    assert prompt_scope("Complete HVAC upgrade.", REQUIREMENTS) == "Complete HVAC upgrade."
+
+
+def test_scoring_prompt_uses_cached_extract_and_keeps_original_for_evidence(monkeypatch):
+    """Each long scope is condensed once across GPT-4o-mini and GPT-4o calls; hashes use the full bid."""
+    bid = {"id": "bid_1", "contractor_name": "Verbose Builders", "cost": 950000, "timeline_months": 6, "scope": LONG_SCOPE}
+    prompt_scopes = []
+
+    async def fake_model(prompt, schema, inputs, model="gpt-4o-mini"):
+        prompt_scopes.append(json.loads(inputs["bid"])["scope"])
+        return BidScore(
+            bid_id="bid_1", contractor_name="Verbose Builders", cost_score=0.66, timeline_score=0.66, scope_score=0.66,
+            risk_score=0.66, reputation_score=0.66, overall_score=0.66, reasoning="Near a decision threshold",
+        )
+
+    monkeypatch.setattr(score, "ainvoke_structured", fake_model)
+    before = metrics.get("scope_summaries")
+    state = {"project_description": "Office renovation", "bids": [bid], "requirements": REQUIREMENTS, "contractor_profiles": []}
+    result = asyncio.run(score.score_and_flag(state))
+
+    assert len(prompt_scopes) == 2 and prompt_scopes[0] == prompt_scopes[1]  # Mini, then the GPT-4o escalation
+    assert len(prompt_scopes[0]) < len(LONG_SCOPE) / 10
+    assert metrics.get("scope_summaries") == before + 1
+    assert list(result["bid_results"]) == [bid_content_hash(bid, scoring_context_hash(hash_requirements(REQUIREMENTS)))]
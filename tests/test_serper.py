@@ -0,0 +1,81 @@
+"""Tests for batched Serper contractor searches."""
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.tools import serper
+from src.tools.serper import search_all_contractors
+
+RESULTS = {"organic": [{"title": "Completed hospital project", "snippet": "Award", "link": "https://a.example"}]}
+
+
+def install_fake_serper(monkeypatch, batch_response=None, fail_batch=False) -> list:
+    """Replace the HTTP call; returns the list of payloads sent (one entry per request)."""
+    requests = []
+
+    async def fake_fetch(payload):
+        requests.append(payload)
+        if isinstance(payload, list):
+            if fail_batch:
+                raise httpx.ConnectError("connection reset")
+            return batch_response(payload) if batch_response else [RESULTS for _ in payload]
+        return RESULTS
+
+    monkeypatch.setattr(serper, "SERPER_API_KEY", "test-key")
+    monkeypatch.setattr(serper, "_fetch_search_results", fake_fetch)
+    return requests
+
+
+def test_unique_contractors_searched_in_one_request(monkeypatch):
+    """Repeated names are searched once and all names go out in a single multi-query POST."""
+    requests = install_fake_serper(monkeypatch)
+    names = ["Acme", "Budget Co", "Acme", "Zenith"]
+
+    profiles = asyncio.run(search_all_contractors(names))
+
+    assert len(requests) == 1 and [q["q"].split(" construction")[0] for q in requests[0]] == ["Acme", "Budget Co", "Zenith"]
+    assert [p.contractor_name for p in profiles] == names
+    assert all(p.credibility_sources == ["https://a.example"] for p in profiles)
+
+
+def test_batches_are_chunked(monkeypatch):
+    """Large tenders are split into requests of at most the batch size."""
+    requests = install_fake_serper(monkeypatch)
+    names = [f"Contractor {i}" for i in range(5)]
+
+    results = asyncio.run(serper.search_contractors_batch(names, batch_size=2))
+
+    assert [len(r) for r in requests] == [2, 2, 1]
+    assert set(results) == set(names)
+
+
+def test_partial_and_failed_batches_fall_back_to_single_requests(monkeypatch):
+    """Malformed entries are retried alone; a failed batch retries every name alone."""
+    requests = install_fake_serper(monkeypatch, batch_response=lambda payload: [RESULTS, {"error": "quota"}])
+    profiles = asyncio.run(search_all_contractors(["Acme", "Budget Co"]))
+    assert [type(r).__name__ for r in requests] == ["list", "dict"] and requests[1]["q"].startswith("Budget Co")
+    assert profiles[1].credibility_sources == ["https://a.example"]
+
+    requests = install_fake_serper(monkeypatch, fail_batch=True)
+    profiles = asyncio.run(search_all_contractors(["Acme", "Budget Co"]))
+    assert [type(r).__name__ for r in requests] == ["list", "dict", "dict"]
+    assert len(profiles) == 2
+
+
+def test_api_key_is_read_from_the_environment_on_first_use(monkeypatch):
+    """The key set in the environment after import is used (it used to be frozen as None at import)."""
+    from src import config
+
+    monkeypatch.setenv("SERPER_API_KEY", "env-key")
+    monkeypatch.setenv("LANGCHAIN_TRACING_V2", "false")  # Restored after _init_langsmith sets it
+    for name in ("_secrets_loaded", "OPENAI_API_KEY", "SERPER_API_KEY", "LANGSMITH_API_KEY", "LANGSMITH_PROJECT"):
+        monkeypatch.setattr(config, name, getattr(config, name))
+    monkeypatch.setattr(config, "_secrets_loaded", False)
+
+    assert serper._api_key() == "env-key"
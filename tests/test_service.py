@@ -0,0 +1,153 @@
+"""Tests for the HTTP job service."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langgraph.graph import StateGraph, END
+from starlette.testclient import TestClient
+from src.schemas import FinalRecommendation, RecommendationType
+from src import service
+from src.service import create_app
+from src.state import BidEvalState
+
+TENDER = {
+    "project": {"description": "Office fit-out. Budget: $1M. Timeline: 6 months."},
+    "bids": [{"id": "bid_1", "contractor_name": "Acme Builders", "cost": 950000, "timeline_months": 6, "scope": "Full fit-out"}],
+}
+
+
+def create_rank_only_graph():
+    """Single-node graph that ranks bids by cost, standing in for the LLM pipeline."""
+    def rank(state: BidEvalState) -> BidEvalState:
+        ranked = sorted(state["bids"], key=lambda b: b["cost"])
+        return {**state, "final_recommendation": FinalRecommendation(
+            recommendation_type=RecommendationType.ACCEPT,
+            ranked_bids=[b["id"] for b in ranked],
+            confidence=0.9,
+            rationale="Lowest cost",
+        )}
+
+    workflow = StateGraph(BidEvalState)
+    workflow.add_node("rank", rank)
+    workflow.set_entry_point("rank")
+    workflow.add_edge("rank", END)
+    return workflow.compile()
+
+
+def wait_for_job(client: TestClient, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in ("succeeded", "failed", "cancelled"):
+            return status
+        time.sleep(0.01)
+    raise TimeoutError(f"Job {job_id} did not finish")
+
+
+def test_job_lifecycle():
+    """A submitted tender is evaluated by the worker pool and its result and progress are exposed."""
+    with TestClient(create_app(max_workers=2, graph_factory=create_rank_only_graph)) as client:
+        response = client.post("/jobs", json=TENDER)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        status = wait_for_job(client, job_id)
+        assert status["status"] == "succeeded"
+        assert any(event.get("node") == "rank" for event in status["progress"])
+
+        result = client.get(f"/jobs/{job_id}/result").json()["result"]
+        assert result["final_recommendation"]["ranked_bids"] == ["bid_1"]
+
+        events = client.get(f"/jobs/{job_id}/events").text
+        assert '"status": "succeeded"' in events
+
+
+def test_job_succeeds_only_after_it_is_persisted(monkeypatch):
+    """The job is still running while its evaluation is recorded in the history."""
+    app = create_app(max_workers=1, graph_factory=create_rank_only_graph)
+    statuses_while_recording = []
+    monkeypatch.setattr(service, "record_evaluation", lambda state: statuses_while_recording.extend(
+        job.status for job in app.state.manager.jobs.values()
+    ))
+
+    with TestClient(app) as client:
+        job_id = client.post("/jobs", json=TENDER).json()["job_id"]
+        assert wait_for_job(client, job_id)["status"] == "succeeded"
+
+    assert statuses_while_recording == ["running"]
+
+
+def test_invalid_tender_rejected():
+    """Tenders without a description or bids are rejected before queueing."""
+    with TestClient(create_app(max_workers=1, graph_factory=create_rank_only_graph)) as client:
+        response = client.post("/jobs", json={"project": {"description": "Office fit-out"}, "bids": []})
+        assert response.status_code == 400
+        assert "bids" in response.json()["error"]
+
+        assert client.get("/jobs/unknown").status_code == 404
+
+
+def create_slow_graph():
+    """Graph whose only node waits on a slow call until it is cancelled."""
+    async def wait(state: BidEvalState) -> BidEvalState:
+        await asyncio.sleep(30)
+        return state
+
+    workflow = StateGraph(BidEvalState)
+    workflow.add_node("wait", wait)
+    workflow.set_entry_point("wait")
+    workflow.add_edge("wait", END)
+    return workflow.compile()
+
+
+def test_cancelled_job_frees_its_worker():
+    """Cancelling a running job stops it at once, so a single worker can take the next job."""
+    with TestClient(create_app(max_workers=1, graph_factory=create_slow_graph)) as client:
+        running = client.post("/jobs", json=TENDER).json()["job_id"]
+        queued = client.post("/jobs", json=TENDER).json()["job_id"]
+        while client.get(f"/jobs/{running}").json()["status"] != "running":
+            time.sleep(0.01)
+
+        assert client.post(f"/jobs/{queued}/cancel").json()["status"] == "cancelled"
+        assert client.post(f"/jobs/{running}/cancel").status_code == 202
+        assert wait_for_job(client, running, timeout=2.0)["status"] == "cancelled"
+
+        assert client.get(f"/jobs/{running}/result").status_code == 410
+        assert client.get("/health").json()["running"] == 0
+        assert client.get("/metrics").json()["jobs_cancelled"] >= 2
+        assert client.post("/jobs/unknown/cancel").status_code == 404
+
+
+def test_cancel_during_persistence_is_reported(monkeypatch):
+    """A job cancelled while its evaluation is being recorded ends as cancelled, not succeeded."""
+    app = create_app(max_workers=1, graph_factory=create_rank_only_graph)
+    monkeypatch.setattr(service, "record_evaluation", lambda state: [
+        job.token.cancel("cancelled via API") for job in app.state.manager.jobs.values()
+    ])
+
+    with TestClient(app) as client:
+        job_id = client.post("/jobs", json=TENDER).json()["job_id"]
+        assert wait_for_job(client, job_id)["status"] == "cancelled"
+        assert client.get(f"/jobs/{job_id}/result").status_code == 410
+
+
+def test_cancelled_queued_job_frees_its_queue_slot():
+    """Cancelling a queued job gives its slot back at once, before a worker reaches it."""
+    with TestClient(create_app(max_workers=1, max_queued=1, graph_factory=create_slow_graph)) as client:
+        running = client.post("/jobs", json=TENDER).json()["job_id"]
+        while client.get(f"/jobs/{running}").json()["status"] != "running":
+            time.sleep(0.01)
+        queued = client.post("/jobs", json=TENDER).json()["job_id"]
+        assert client.post("/jobs", json=TENDER).status_code == 503
+
+        client.post(f"/jobs/{queued}/cancel")
+        assert client.get("/health").json()["queued"] == 0
+        replacement = client.post("/jobs", json=TENDER)
+        assert replacement.status_code == 202
+        client.post(f"/jobs/{replacement.json()['job_id']}/cancel")
+        client.post(f"/jobs/{running}/cancel")